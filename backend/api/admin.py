@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     UserProfile, Flight, Hotel, Event, Booking, 
-    Payment, Refund, Deal, SupportTicket
+    Payment, Refund, Deal, SupportTicket, PlaceName, ExchangeRate,
+    ArchivedBooking, ArchivedPayment, ArchivedRefund
 )
 
 @admin.register(UserProfile)
@@ -50,10 +51,41 @@ class RefundAdmin(admin.ModelAdmin):
 class DealAdmin(admin.ModelAdmin):
     list_display = ['title', 'deal_type', 'discount_percentage', 'discounted_price_sar', 'valid_from', 'valid_until', 'is_active']
     list_filter = ['deal_type', 'is_active']
-    search_fields = ['title', 'description']
+    search_fields = ['title', 'description', 'city', 'origin', 'destination']
+    raw_id_fields = ['flight', 'hotel', 'event']
 
 @admin.register(SupportTicket)
 class SupportTicketAdmin(admin.ModelAdmin):
     list_display = ['ticket_number', 'user', 'subject', 'priority', 'status', 'assigned_to', 'created_at']
     list_filter = ['priority', 'status']
     search_fields = ['ticket_number', 'subject', 'user__username']
+
+@admin.register(PlaceName)
+class PlaceNameAdmin(admin.ModelAdmin):
+    list_display = ['alias', 'place', 'normalized']
+    search_fields = ['alias', 'place']
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ['currency', 'sar_per_unit', 'updated_at']
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    list_display = ['booking_reference', 'user', 'booking_type', 'status', 'total_price_sar', 'created_at', 'archived_at']
+    list_filter = ['booking_type', 'status']
+    search_fields = ['booking_reference', 'user__username', 'customer_email']
+    raw_id_fields = ['user', 'flight', 'hotel', 'event', 'deal']
+
+@admin.register(ArchivedPayment)
+class ArchivedPaymentAdmin(admin.ModelAdmin):
+    list_display = ['transaction_id', 'booking', 'amount_sar', 'status', 'created_at', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['transaction_id', 'booking__booking_reference']
+    raw_id_fields = ['booking']
+
+@admin.register(ArchivedRefund)
+class ArchivedRefundAdmin(admin.ModelAdmin):
+    list_display = ['booking', 'refund_amount_sar', 'status', 'created_at', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['booking__booking_reference']
+    raw_id_fields = ['booking', 'payment', 'processed_by']
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class JWTProfileAuthentication(JWTAuthentication):
+    """JWTAuthentication that loads the user together with their profile,
+    so role checks (request.user.profile.role) need no further query, and
+    keeps the pair in the cache for AUTH_USER_CACHE_TIMEOUT seconds.
+
+    Saving or deleting a User or UserProfile drops the cached copy (see
+    api.signals), so role changes and deactivations apply on the next
+    request; the timeout bounds updates that bypass signals.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = User.objects.select_related('profile').get(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
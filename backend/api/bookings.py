@@ -0,0 +1,131 @@
+from django.db import transaction
+
+from . import ids, inventory, pricing
+from .models import Booking, Payment
+from .serializers import BookingSerializer, BOOKING_RELATED
+from .stats import invalidate_staff_stats
+
+REQUIRED_FIELDS = ['customer_name', 'customer_email', 'customer_phone', 'quantity', 'payment_method']
+
+# State of a booking once its payment has gone through.
+CONFIRMED_STATE = {
+    'payment_status': 'completed',
+    'status': 'confirmed',
+    'confirmation_sent': True,
+    'ticket_issued': True,
+    # inventory.reserve() runs in the same transaction, or nothing is saved
+    'holds_inventory': True,
+}
+
+BULK_MAX_ITEMS = 100
+
+
+def booking_errors(data, validated_data):
+    """Business-rule checks on top of BookingSerializer validation.
+
+    Returns the error body for a 400 response, or None if the booking is ok.
+    """
+    booking_type = data.get('booking_type')
+
+    # Validate that at least one of flight, hotel, or event is provided
+    if booking_type == 'flight' and not data.get('flight'):
+        return {'error': 'Flight ID is required for flight bookings'}
+    if booking_type == 'hotel' and not data.get('hotel'):
+        return {'error': 'Hotel ID is required for hotel bookings'}
+    if booking_type == 'event' and not data.get('event'):
+        return {'error': 'Event ID is required for event bookings'}
+
+    missing_fields = [field for field in REQUIRED_FIELDS if not data.get(field)]
+    if missing_fields:
+        return {'error': 'Missing required fields', 'missing_fields': missing_fields}
+
+    if booking_type == 'hotel':
+        check_in = validated_data.get('check_in_date')
+        check_out = validated_data.get('check_out_date')
+        if not check_in or not check_out:
+            return {'error': 'Check-in and check-out dates are required for hotel bookings'}
+        if not 0 < (check_out - check_in).days <= inventory.MAX_STAY_NIGHTS:
+            return {'error': f'Check-out must be 1 to {inventory.MAX_STAY_NIGHTS} nights after check-in'}
+    return None
+
+
+def new_payment(booking):
+    return Payment(
+        booking=booking,
+        transaction_id=ids.transaction_id(),
+        amount_sar=booking.total_price_sar,
+        amount_usd=booking.total_price_usd,
+        currency=booking.currency,
+        payment_method=booking.payment_method,
+        status='completed'
+    )
+
+
+def priced(quote):
+    return {'total_price_sar': quote['total_price_sar'], 'total_price_usd': quote['total_price_usd']}
+
+
+def create_one(serializer, user):
+    """Insert a validated booking, priced server-side and in its final
+    confirmed state, together with its inventory hold and payment, all or
+    nothing. Raises pricing.PricingError if the booking can't be priced."""
+    totals = priced(pricing.quote(serializer.validated_data))
+    with transaction.atomic():
+        booking = serializer.save(user=user, **totals, **CONFIRMED_STATE)
+        inventory.reserve(booking)
+        new_payment(booking).save()
+    return booking
+
+
+def create_many(user, items):
+    """Validate and create a batch of confirmed bookings with their payments.
+
+    Referenced items and deals are loaded with one query per model and
+    reserved with one UPDATE per item; valid items that still have inventory
+    are written with one bulk INSERT for bookings and one for payments,
+    inside a single transaction. The rest are reported back. Returns one
+    result dict per item, in order.
+    """
+    results = [None] * len(items)
+    valid = []
+    related = pricing.related_objects(items)
+    for index, data in enumerate(items):
+        serializer = BookingSerializer(data=data, context={'related': related})
+        if not serializer.is_valid():
+            results[index] = {'index': index, 'status': 'failed', 'error': 'Validation failed', 'details': serializer.errors}
+            continue
+        error = booking_errors(data, serializer.validated_data)
+        if error:
+            results[index] = {'index': index, 'status': 'failed', **error}
+            continue
+        valid.append((index, serializer.validated_data))
+
+    pending = []
+    quotes = pricing.quote_many([validated_data for _, validated_data in valid], related)
+    for (index, validated_data), quote in zip(valid, quotes):
+        if 'error' in quote:
+            results[index] = {'index': index, 'status': 'failed', **quote}
+            continue
+        # One dict, so the server's totals and state win over client values
+        booking = Booking(user=user, booking_reference=ids.booking_reference(),
+                          **{**validated_data, **priced(quote), **CONFIRMED_STATE})
+        pending.append((index, booking))
+
+    created = []
+    with transaction.atomic():
+        errors = inventory.reserve_many([booking for _, booking in pending])
+        for (index, booking), error in zip(pending, errors):
+            if error:
+                results[index] = {'index': index, 'status': 'failed', 'error': str(error)}
+                continue
+            created.append((index, booking))
+        if created:
+            bookings = Booking.objects.bulk_create([booking for _, booking in created])
+            Payment.objects.bulk_create([new_payment(booking) for booking in bookings])
+            # bulk_create skips post_save, so drop the dashboard cache ourselves
+            transaction.on_commit(invalidate_staff_stats)
+
+    saved = Booking.objects.select_related(*BOOKING_RELATED).in_bulk([booking.pk for _, booking in created])
+    for index, booking in created:
+        results[index] = {'index': index, 'status': 'created', 'booking': BookingSerializer(saved[booking.pk]).data}
+    return results
@@ -0,0 +1,92 @@
+"""Read-through response cache for the public catalog endpoints.
+
+Each catalog model has a version stamp in the cache (the time it last
+changed). Response keys include the stamp, so bumping it on a write makes
+every cached page of that model unreachable at once, on any shared cache
+backend. The stamp is sent as Last-Modified too, but only an ETag match
+earns a 304: HTTP dates have one-second granularity, so If-Modified-Since
+can't tell apart two writes within the same second.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from bookme import routers
+
+
+def _version_key(model):
+    return f'catalog:version:{model._meta.model_name}'
+
+
+def version(model):
+    key = _version_key(model)
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, time.time(), None)
+        # The dummy backend stores nothing; fall back to a fresh stamp.
+        stamp = cache.get(key) or time.time()
+    return stamp
+
+
+def invalidate(model):
+    """Drop every cached response for model once the current transaction
+    commits, and refill them from the primary until the replicas catch up."""
+    transaction.on_commit(lambda: cache.set(_version_key(model), time.time(), None))
+    routers.pin(model._meta.label)
+
+
+def _response_key(model, request, stamp):
+    params = sorted((k, v) for k, values in request.GET.lists() for v in values if v != '')
+    raw = f'{request.path}?{urlencode(params)}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'catalog:response:{model._meta.model_name}:{stamp}:{digest}'
+
+
+def _cacheable(request):
+    # The browsable API renders HTML; only JSON clients share cache entries.
+    return request.method in ('GET', 'HEAD') and 'text/html' not in request.META.get('HTTP_ACCEPT', '')
+
+
+class CachedCatalogMixin:
+    """Serve list/retrieve GETs of a catalog viewset from the cache, with
+    ETag/Last-Modified headers and 304 responses to If-None-Match."""
+
+    def catalog_version(self):
+        """Stamp of the data behind the responses: when it last changed."""
+        return version(self.queryset.model)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not _cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        model = self.queryset.model
+        stamp = self.catalog_version()
+        key = _response_key(model, request, stamp)
+        entry = cache.get(key)
+        if entry is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            if hasattr(response, 'render'):
+                response.render()
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': f'"{hashlib.md5(response.content).hexdigest()}"',
+            }
+            cache.set(key, entry, settings.CATALOG_CACHE_TIMEOUT)
+
+        conditional = get_conditional_response(request, etag=entry['etag'])
+        response = conditional or HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(stamp)
+        response['Cache-Control'] = 'no-cache'
+        response['Vary'] = 'Accept'
+        return response
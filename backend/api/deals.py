@@ -0,0 +1,204 @@
+"""Which deals apply to which catalog items, and the best one right now.
+
+A deal targets one flight, hotel or event; flights on a route (origin
+and/or destination); or hotels, events and flights into a city. Each target
+is a key, and an item matches the handful of keys that could target it, so
+finding an item's deals is a few dict lookups. Deals with none of these set
+(those from before targets existed) target nothing: they stay out of the
+index, and a booking can only use one by quoting it for an item of its
+deal_type (package deals: all three).
+
+The deals under one key overlap in time, so each key keeps a timeline: the
+sorted boundaries of their validity windows and the best deal between each
+boundary and the next. The best deal at any instant is one bisect away and
+expired or not yet valid deals drop out without a query. The index holds
+the active, unexpired deals; each process builds it once and rebuilds it
+when a deal changes (catalog_cache.version(Deal)).
+"""
+import heapq
+from bisect import bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import catalog_cache
+from .models import Deal
+
+CENT = Decimal('0.01')
+BOOKING_TYPES = ('flight', 'hotel', 'event')
+
+# Windows include valid_until; timelines end them one tick later.
+TICK = timedelta(microseconds=1)
+
+# Columns of a catalog row that item_keys() and best_deal() read, price last.
+ROW_COLUMNS = {
+    'flight': ('id', 'origin', 'destination', 'price_sar'),
+    'hotel': ('id', 'city', 'price_per_night_sar'),
+    'event': ('id', 'city', 'price_sar'),
+}
+
+# Deal columns the index reads.
+INDEX_COLUMNS = ('id', 'title', 'deal_type', 'discount_percentage', 'valid_from', 'valid_until',
+                 'flight', 'hotel', 'event', 'origin', 'destination', 'city')
+
+_valid_until = serializers.DateTimeField()
+_index = None
+_snapshot = ContextVar('deal_snapshot', default=None)
+
+
+def discount(amount, percentage):
+    return (amount * percentage / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@lru_cache(maxsize=4096)
+def _place(name):
+    return name.strip().casefold()
+
+
+def _types(deal):
+    return BOOKING_TYPES if deal.deal_type == 'package' else (deal.deal_type,)
+
+
+def target_keys(deal):
+    """Index keys of the items deal targets; none for an untargeted deal."""
+    types = _types(deal)
+    for booking_type in BOOKING_TYPES:
+        item_id = getattr(deal, f'{booking_type}_id')
+        if item_id is not None:
+            return [(booking_type, item_id)]
+    if deal.origin or deal.destination:
+        return [('route', _place(deal.origin), _place(deal.destination))]
+    if deal.city:
+        return [('city', booking_type, _place(deal.city)) for booking_type in types]
+    return []
+
+
+def item_keys(booking_type, row):
+    keys = [(booking_type, row['id'])]
+    if booking_type == 'flight':
+        origin, destination = _place(row['origin']), _place(row['destination'])
+        keys += [('route', origin, destination), ('route', origin, ''), ('route', '', destination),
+                 ('city', 'flight', destination)]
+    else:
+        keys.append(('city', booking_type, _place(row['city'])))
+    return keys
+
+
+def item_row(booking_type, item):
+    return {column: getattr(item, column) for column in ROW_COLUMNS[booking_type]}
+
+
+def applies(deal, booking_type, row):
+    """Whether a booking for the item in row may use deal, whatever its
+    validity window: the deal targets the item or, untargeted, its type."""
+    keys = target_keys(deal)
+    if not keys:
+        return booking_type in _types(deal)
+    return not set(keys).isdisjoint(item_keys(booking_type, row))
+
+
+def _rank(deal):
+    # Highest discount first, then the oldest deal
+    return (-deal.discount_percentage, deal.id)
+
+
+class Timeline:
+    """Best deal at any instant among deals with overlapping windows."""
+
+    def __init__(self, deals):
+        self.points = sorted({deal.valid_from for deal in deals} | {deal.valid_until + TICK for deal in deals})
+        self.best = []
+        starting = sorted(deals, key=lambda deal: deal.valid_from)
+        valid = []
+        i = 0
+        for point in self.points:
+            while i < len(starting) and starting[i].valid_from <= point:
+                deal = starting[i]
+                heapq.heappush(valid, (_rank(deal), deal.valid_until + TICK, deal))
+                i += 1
+            while valid and valid[0][1] <= point:
+                heapq.heappop(valid)
+            self.best.append(valid[0][2] if valid else None)
+
+    def at(self, when):
+        i = bisect_right(self.points, when)
+        return self.best[i - 1] if i else None
+
+
+class DealIndex:
+    def __init__(self, deals, version):
+        self.version = version
+        grouped = {}
+        for deal in deals:
+            for key in target_keys(deal):
+                grouped.setdefault(key, []).append(deal)
+        self.timelines = {key: Timeline(group) for key, group in grouped.items()}
+        self.boundaries = sorted({point for timeline in self.timelines.values() for point in timeline.points})
+        self.summaries = {}
+
+    def best(self, booking_type, row, when):
+        best = None
+        for key in item_keys(booking_type, row):
+            timeline = self.timelines.get(key)
+            deal = timeline.at(when) if timeline is not None else None
+            if deal is not None and (best is None or _rank(deal) < _rank(best)):
+                best = deal
+        return best
+
+    def summary(self, deal):
+        summary = self.summaries.get(deal.id)
+        if summary is None:
+            summary = self.summaries[deal.id] = {
+                'id': deal.id,
+                'title': deal.title,
+                'discount_percentage': str(deal.discount_percentage.quantize(CENT)),
+                'valid_until': _valid_until.to_representation(deal.valid_until),
+            }
+        return summary
+
+    def last_change(self, when):
+        """Timestamp of the last window boundary at or before when."""
+        i = bisect_right(self.boundaries, when)
+        return self.boundaries[i - 1].timestamp() if i else 0.0
+
+
+def current_index():
+    global _index
+    version = catalog_cache.version(Deal)
+    if _index is None or _index.version != version:
+        deals = Deal.objects.filter(is_active=True, valid_until__gte=timezone.now()).only(*INDEX_COLUMNS).order_by('id')
+        _index = DealIndex(list(deals), version)
+    return _index
+
+
+def stamp(index=None):
+    """When the deals on offer last changed: a deal was saved, or a window
+    opened or closed. Cached responses that show deals key on it."""
+    index = index or current_index()
+    return max(index.version, index.last_change(timezone.now()))
+
+
+@contextmanager
+def annotating(index=None):
+    """Match every row rendered in this block against one index, at one instant."""
+    token = _snapshot.set((index or current_index(), timezone.now()))
+    try:
+        yield
+    finally:
+        _snapshot.reset(token)
+
+
+def best_deal(booking_type, row):
+    """The best current deal for a catalog row (a dict of ROW_COLUMNS) with
+    the item's price after it, or None."""
+    index, when = _snapshot.get() or (current_index(), timezone.now())
+    deal = index.best(booking_type, row, when)
+    if deal is None:
+        return None
+    price = row[ROW_COLUMNS[booking_type][-1]]
+    return dict(index.summary(deal), discounted_price_sar=str(price - discount(price, deal.discount_percentage)))
@@ -0,0 +1,173 @@
+"""Streaming CSV/NDJSON exports of bookings, payments and refunds for finance.
+
+Rows are read with values_list().iterator(chunk_size=...) and written out as
+they arrive through a StreamingHttpResponse, so a worker holds at most one
+chunk of rows per table in memory however many rows the export matches.
+
+Rows moved to the Archived* tables by api.maintenance are exported too,
+merged in created_at order and marked by the trailing `archived` column.
+"""
+import csv
+import heapq
+from operator import itemgetter
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Value
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .maintenance import ARCHIVES
+from .models import Booking, Payment, Refund
+
+EXPORT_COLUMNS = {
+    Booking: (
+        'id', 'booking_reference', 'user_id', 'user__username', 'booking_type', 'flight_id', 'hotel_id',
+        'event_id', 'deal_id', 'quantity', 'check_in_date', 'check_out_date', 'total_price_sar',
+        'total_price_usd', 'currency', 'payment_method', 'payment_status', 'status', 'customer_name',
+        'customer_email', 'customer_phone', 'created_at', 'updated_at',
+    ),
+    Payment: (
+        'id', 'transaction_id', 'booking_id', 'booking__booking_reference', 'amount_sar', 'amount_usd',
+        'currency', 'payment_method', 'status', 'created_at', 'updated_at',
+    ),
+    Refund: (
+        'id', 'booking_id', 'booking__booking_reference', 'payment_id', 'payment__transaction_id',
+        'refund_amount_sar', 'refund_amount_usd', 'currency', 'status', 'reason', 'processed_by_id',
+        'processed_by__username', 'admin_notes', 'created_at', 'updated_at',
+    ),
+}
+
+# Live model -> the archive table holding its older rows.
+ARCHIVE_OF = dict(ARCHIVES)
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Leading characters that make spreadsheet apps treat a CSV cell as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Rows joined into one write to the client.
+LINES_PER_WRITE = 500
+
+
+class ExportError(Exception):
+    """Bad export parameters; the message is safe to show to the caller."""
+
+
+def _day(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ExportError(f'{name} must be a date (YYYY-MM-DD)')
+    return day
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def export_queryset(model, params):
+    """model's rows filtered by ?from= and ?to= (inclusive local dates of
+    created_at) and ?status= (comma separated), oldest first."""
+    queryset = model.objects.order_by('created_at', 'id')
+
+    start, end = _day(params, 'from'), _day(params, 'to')
+    if start and end and start > end:
+        raise ExportError('from must not be after to')
+    if start:
+        queryset = queryset.filter(created_at__gte=_start_of(start))
+    if end:
+        queryset = queryset.filter(created_at__lt=_start_of(end + timedelta(days=1)))
+
+    statuses = {value.strip() for value in params.get('status', '').split(',') if value.strip()}
+    if statuses:
+        unknown = statuses - {value for value, label in model._meta.get_field('status').choices}
+        if unknown:
+            raise ExportError(f'Unknown status: {", ".join(sorted(unknown))}')
+        queryset = queryset.filter(status__in=statuses)
+    return queryset
+
+
+def export_rows(model, params):
+    """values_list() rows of model and its archive table matching params,
+    oldest first, each followed by whether it comes from the archive."""
+    columns = EXPORT_COLUMNS[model]
+    sources = [
+        export_queryset(source, params).annotate(archived=Value(source is not model))
+        .values_list(*columns, 'archived').iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        for source in (model, ARCHIVE_OF[model])
+    ]
+    return heapq.merge(*sources, key=itemgetter(columns.index('created_at'), columns.index('id')))
+
+
+def _ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+class _Echo:
+    """File-like object for csv.writer that hands back each line instead of
+    buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_text(value):
+    # Customer-entered text starting like a formula is prefixed with ' so
+    # spreadsheets show it instead of evaluating it.
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+def _csv_lines(columns, rows):
+    # Dates and decimals come out exactly as in the NDJSON export.
+    encoder = DjangoJSONEncoder()
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([
+            _csv_text(value) if isinstance(value, str)
+            else value if value is None or isinstance(value, (int, float)) else encoder.default(value)
+            for value in row
+        ])
+
+
+def _batched(lines):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == LINES_PER_WRITE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def export_response(model, params):
+    """Stream model's rows matching params as ?output=ndjson (default) or csv.
+
+    Raises ExportError for bad parameters before anything is streamed.
+    """
+    output = params.get('output', 'ndjson')
+    if output not in EXPORT_FORMATS:
+        raise ExportError(f'output must be one of: {", ".join(EXPORT_FORMATS)}')
+
+    columns = (*EXPORT_COLUMNS[model], 'archived')
+    rows = export_rows(model, params)
+    lines = _csv_lines(columns, rows) if output == 'csv' else _ndjson_lines(columns, rows)
+
+    response = StreamingHttpResponse(_batched(lines), content_type=EXPORT_FORMATS[output])
+    filename = f'{model._meta.model_name}s-{timezone.localdate():%Y%m%d}.{output}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,180 @@
+"""Fast path for large catalog list responses.
+
+Serializer.to_representation does per-field, per-row work (get_attribute,
+None checks, DecimalField rebuilding its quantize context, DateTimeField
+looking up the current timezone) and then JSONRenderer walks the result
+again. For list actions whose fields are all plain columns we instead fetch
+rows with .values() and run them through a plan compiled once per serializer
+class and field set: a (name, column, converter) tuple per field, where the
+converters reproduce the DRF field output exactly. The response body is
+byte-identical to the serializer path.
+"""
+import decimal
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.compat import SHORT_SEPARATORS, LONG_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from bookme import metrics
+
+from .serializers import _query_list
+
+# Mirrors JSONRenderer.render() for an un-indented response.
+_encoder = JSONEncoder(
+    ensure_ascii=JSONRenderer.ensure_ascii,
+    allow_nan=not JSONRenderer.strict,
+    separators=SHORT_SEPARATORS if JSONRenderer.compact else LONG_SEPARATORS,
+)
+
+# Fields whose to_representation returns database values unchanged.
+_PASSTHROUGH = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+# (serializer class, ?fields=, ?expand=, timezone) -> plan. ?fields= is
+# client-controlled, so the table is cleared rather than left to grow.
+_plans = {}
+MAX_PLANS = 256
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or field.normalize_output or field.localize or not coerce_to_string:
+        return field.to_representation
+    quantum = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return f'{value.quantize(quantum, rounding=rounding, context=context):f}'
+    return convert
+
+
+def _datetime_converter(field, tz):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, 'timezone') else tz
+    if tz is None or output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _converter(field, tz):
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field, tz)
+    if isinstance(field, _PASSTHROUGH) and not isinstance(field, serializers.ChoiceField):
+        return None
+    if isinstance(field, serializers.JSONField) and not field.binary:
+        return None
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    return field.to_representation
+
+
+def compile_plan(serializer, tz):
+    """Return [(name, column, converter)] for serializer's readable fields, or
+    None if some field is not a plain column of the model.
+
+    Fields with a row_representation(row) (BestDealField) are computed from
+    the row dict instead; their column is the tuple of row_columns they read.
+    They must come after the plain columns, where encode_rows() adds them.
+    """
+    columns = {field.name: field.attname for field in serializer.Meta.model._meta.concrete_fields}
+    plan = []
+    computed = False
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if hasattr(field, 'row_representation'):
+            computed = True
+            plan.append((name, field.row_columns, field.row_representation))
+            continue
+        if computed or isinstance(field, serializers.BaseSerializer) or field.source not in columns:
+            return None
+        plan.append((name, columns[field.source], _converter(field, tz)))
+    return plan
+
+
+def encode_rows(rows, plan):
+    columns = [entry for entry in plan if isinstance(entry[1], str)]
+    encoded = [
+        {name: value if convert is None or value is None else convert(value)
+         for name, column, convert in columns for value in (row[column],)}
+        for row in rows
+    ]
+    for name, column, convert in plan:
+        if not isinstance(column, str):
+            for item, row in zip(encoded, rows):
+                item[name] = convert(row)
+    return encoded
+
+
+def render(data):
+    content = _encoder.encode(data)
+    return content.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class FastListMixin:
+    """Serve JSON list requests from .values() rows through a compiled plan
+    (see module docstring). Anything the plan can't express — computed or
+    nested fields, the browsable API, indented JSON — falls back to the
+    regular serializer path. Toggle with settings.FAST_LIST_RENDERING."""
+
+    # Read by SparseListMixin: .values() below already picks the columns.
+    renders_values = False
+
+    def list(self, request, *args, **kwargs):
+        plan = self._fast_list_plan(request)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        self.renders_values = True
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = []
+        for name, column, convert in plan:
+            columns.extend([column] if isinstance(column, str) else column)
+        columns += [name.lstrip('-') for name in getattr(self.paginator, 'ordering', ())]
+        rows = queryset.values(*dict.fromkeys(columns))
+
+        page = self.paginate_queryset(rows)
+        with metrics.serializing():
+            if page is None:
+                data = encode_rows(rows, plan)
+            else:
+                data = self.get_paginated_response(encode_rows(page, plan)).data
+            content = render(data)
+        return HttpResponse(content, content_type=JSONRenderer.media_type)
+
+    def _fast_list_plan(self, request):
+        if not settings.FAST_LIST_RENDERING:
+            return None
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return None
+        if request.accepted_media_type != JSONRenderer.media_type:
+            return None
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        key = (self.get_serializer_class(), frozenset(_query_list(request, 'fields')),
+               frozenset(_query_list(request, 'expand')), tz)
+        # One lookup, and the new plan returned from a local: another thread
+        # may clear _plans at any point. None plans are cached too.
+        try:
+            return _plans[key]
+        except KeyError:
+            pass
+        plan = compile_plan(self.get_serializer(), tz)
+        if len(_plans) >= MAX_PLANS:
+            _plans.clear()
+        _plans[key] = plan
+        return plan
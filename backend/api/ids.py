@@ -0,0 +1,93 @@
+"""Time-ordered unique identifiers for booking references, payment
+transaction ids and support ticket numbers.
+
+Each id packs milliseconds since EPOCH_MS, a per-process node number and a
+per-process sequence into 66 bits, rendered at a fixed width so ids sort (and
+land in B-tree indexes) in creation order. Within a process ids never repeat.
+
+Each process takes its node from a counter in the cache on first use (and
+again after a fork), so processes sharing the cache (REDIS_URL) get distinct
+nodes and never issue the same id; a node comes round again only after
+2**NODE_BITS further allocations.
+"""
+import os
+import random
+import threading
+import time
+
+from django.core.cache import cache
+
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+NODE_BITS = 12
+SEQUENCE_BITS = 12
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+NODE_MASK = (1 << NODE_BITS) - 1
+NODE_COUNTER_KEY = 'ids:node'
+
+BASE36_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+BASE36_WIDTH = 13   # 36**13 > 2**66
+DECIMAL_WIDTH = 20  # 10**20 > 2**66
+
+
+def allocate_node():
+    """The next node number from the shared counter. The counter starts at a
+    random value so a fresh cache doesn't hand every host node 1 first."""
+    cache.add(NODE_COUNTER_KEY, random.getrandbits(NODE_BITS), None)
+    return cache.incr(NODE_COUNTER_KEY) & NODE_MASK
+
+
+class IdGenerator:
+    def __init__(self, node=None):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+        # None: allocate_node() on first use, when settings are loaded
+        self.node = node
+
+    def reseed(self):
+        """Drop the node; called in forked children so that pre-forked
+        workers allocate their own instead of sharing their parent's."""
+        self._lock = threading.Lock()
+        self.node = None
+
+    def next_int(self):
+        with self._lock:
+            if self.node is None:
+                self.node = allocate_node()
+            now = int(time.time() * 1000) - EPOCH_MS
+            if now <= self._last_ms:
+                # Same millisecond, or the clock stepped back: keep counting
+                # from the last issued id so ids stay unique and increasing.
+                now = self._last_ms
+                self._sequence = (self._sequence + 1) & SEQUENCE_MASK
+                if self._sequence == 0:
+                    now += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (now << (NODE_BITS + SEQUENCE_BITS)) | (self.node << SEQUENCE_BITS) | self._sequence
+
+
+def to_base36(value, width=BASE36_WIDTH):
+    digits = []
+    while value:
+        value, remainder = divmod(value, 36)
+        digits.append(BASE36_ALPHABET[remainder])
+    return ''.join(reversed(digits)).rjust(width, '0')
+
+
+generator = IdGenerator()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=generator.reseed)
+
+
+def booking_reference():
+    return 'BKM' + to_base36(generator.next_int())
+
+
+def transaction_id():
+    return 'TXN' + to_base36(generator.next_int())
+
+
+def ticket_number():
+    return 'SUP' + str(generator.next_int()).zfill(DECIMAL_WIDTH)
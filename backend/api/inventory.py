@@ -0,0 +1,247 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Least
+
+from . import catalog_cache
+from .models import Flight, Hotel, HotelNight, Event, Booking
+
+# booking_type -> (booking FK field, catalog model, counter column). Hotels are
+# booked per night against HotelNight instead of a single counter.
+INVENTORY = {
+    'flight': ('flight', Flight, 'available_seats'),
+    'event': ('event', Event, 'available_tickets'),
+}
+
+# Counter column -> the item's capacity, which releases never push it past.
+CAPACITY = {'available_seats': 'total_seats', 'available_tickets': 'total_tickets'}
+
+# Bookings in these states no longer hold inventory.
+RELEASED_STATUSES = ('cancelled', 'refunded', 'expired')
+
+MAX_STAY_NIGHTS = 90
+
+
+class InsufficientInventory(Exception):
+    pass
+
+
+def _item(booking):
+    if booking.booking_type not in INVENTORY:
+        return None, None, None
+    field, model, counter = INVENTORY[booking.booking_type]
+    return getattr(booking, f'{field}_id'), model, counter
+
+
+def stay_nights(check_in, check_out):
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+def reserve(booking):
+    """Take booking.quantity units from the booked item.
+
+    Uses conditional UPDATEs so concurrent reservations for the last units
+    cannot both succeed. Must run inside the transaction that saves the
+    booking, so a failure later on puts the units back.
+    """
+    if booking.booking_type == 'hotel':
+        _reserve_nights(booking)
+        return
+    item_id, model, counter = _item(booking)
+    if item_id is None:
+        return
+    if not _take(model, counter, item_id, booking.quantity):
+        raise InsufficientInventory(f'Not enough availability for this {booking.booking_type}')
+    catalog_cache.invalidate(model)
+
+
+def _take(model, counter, item_id, quantity):
+    return model.objects.filter(
+        pk=item_id, is_active=True, **{f'{counter}__gte': quantity}
+    ).update(**{counter: F(counter) - quantity})
+
+
+def _reserve_nights(booking):
+    if booking.hotel_id is None:
+        return
+    nights = stay_nights(booking.check_in_date, booking.check_out_date)
+    capacity = Hotel.objects.filter(pk=booking.hotel_id, is_active=True).values_list('available_rooms', flat=True).first()
+    if capacity is None or capacity < booking.quantity:
+        raise InsufficientInventory('Not enough rooms available for these dates')
+    # Savepoint, so a full night undoes only this booking's other nights even
+    # when several bookings are reserved in one transaction.
+    with transaction.atomic():
+        HotelNight.objects.bulk_create(
+            [HotelNight(hotel_id=booking.hotel_id, date=night) for night in nights], ignore_conflicts=True
+        )
+        _take_nights(booking.hotel_id, capacity, dict.fromkeys(nights, booking.quantity))
+    catalog_cache.invalidate(Hotel)
+
+
+def _take_nights(hotel_id, capacity, rooms_per_night):
+    # One UPDATE per distinct room count rather than per booking.
+    nights_by_rooms = {}
+    for night, rooms in rooms_per_night.items():
+        nights_by_rooms.setdefault(rooms, []).append(night)
+    for rooms, nights in nights_by_rooms.items():
+        updated = HotelNight.objects.filter(
+            hotel_id=hotel_id, date__in=nights, rooms_booked__lte=capacity - rooms
+        ).update(rooms_booked=F('rooms_booked') + rooms)
+        if updated != len(nights):
+            raise InsufficientInventory('Not enough rooms available for these dates')
+
+
+def reserve_many(bookings):
+    """reserve() each of bookings, in order, with one conditional UPDATE per
+    booked item (per hotel and room count for hotels) instead of one per
+    booking.
+
+    When an item can't cover all of its bookings at once they fall back to
+    reserve() one by one, so the earlier ones still get the last units.
+    Returns one InsufficientInventory or None per booking, in order.
+    """
+    errors = [None] * len(bookings)
+    items = {}
+    hotels = {}
+    for index, booking in enumerate(bookings):
+        if booking.booking_type == 'hotel':
+            if booking.hotel_id is not None:
+                hotels.setdefault(booking.hotel_id, []).append(index)
+            continue
+        item_id, model, counter = _item(booking)
+        if item_id is not None:
+            items.setdefault((model, counter, item_id), []).append(index)
+
+    def one_by_one(indexes):
+        for index in indexes:
+            try:
+                reserve(bookings[index])
+            except InsufficientInventory as e:
+                errors[index] = e
+
+    for (model, counter, item_id), indexes in items.items():
+        if _take(model, counter, item_id, sum(bookings[index].quantity for index in indexes)):
+            catalog_cache.invalidate(model)
+        else:
+            one_by_one(indexes)
+
+    if hotels:
+        capacities = dict(Hotel.objects.filter(pk__in=hotels, is_active=True).values_list('id', 'available_rooms'))
+        rooms_per_night = {}
+        for hotel_id, indexes in hotels.items():
+            nights = rooms_per_night[hotel_id] = {}
+            for index in indexes:
+                booking = bookings[index]
+                for night in stay_nights(booking.check_in_date, booking.check_out_date):
+                    nights[night] = nights.get(night, 0) + booking.quantity
+        HotelNight.objects.bulk_create([
+            HotelNight(hotel_id=hotel_id, date=night) for hotel_id, nights in rooms_per_night.items() for night in nights
+        ], ignore_conflicts=True)
+        for hotel_id, indexes in hotels.items():
+            try:
+                if hotel_id not in capacities:
+                    raise InsufficientInventory('Not enough rooms available for these dates')
+                # Savepoint, so a full night undoes this hotel's other nights
+                with transaction.atomic():
+                    _take_nights(hotel_id, capacities[hotel_id], rooms_per_night[hotel_id])
+            except InsufficientInventory:
+                one_by_one(indexes)
+        catalog_cache.invalidate(Hotel)
+    return errors
+
+
+def _release_nights(booking):
+    HotelNight.objects.filter(
+        hotel_id=booking.hotel_id, date__in=stay_nights(booking.check_in_date, booking.check_out_date)
+    ).update(rooms_booked=Greatest(F('rooms_booked') - booking.quantity, 0))
+    catalog_cache.invalidate(Hotel)
+
+
+def _restock(model, counter, item_ids, quantity):
+    model.objects.filter(pk__in=item_ids).update(**{counter: Least(F(counter) + quantity, F(CAPACITY[counter]))})
+
+
+def _release_units(booking):
+    if booking.booking_type == 'hotel':
+        if booking.hotel_id and booking.check_in_date and booking.check_out_date:
+            _release_nights(booking)
+        return
+    item_id, model, counter = _item(booking)
+    if item_id is not None:
+        _restock(model, counter, [item_id], booking.quantity)
+        catalog_cache.invalidate(model)
+
+
+def release(booking, new_status):
+    """Move booking to new_status, returning its units to the booked item if
+    it holds any (booking.holds_inventory).
+
+    The booking row is locked first so two concurrent cancellations/refunds
+    return the units only once. Returns False, leaving the booking untouched,
+    if it had already released its inventory.
+
+    Counters stop at the item's capacity and nights at zero rooms, as a
+    second guard against handing back more than was taken.
+    """
+    with transaction.atomic():
+        locked = Booking.objects.select_for_update().get(pk=booking.pk)
+        if locked.status in RELEASED_STATUSES:
+            booking.status = locked.status
+            booking.holds_inventory = locked.holds_inventory
+            return False
+        if locked.holds_inventory:
+            _release_units(locked)
+        booking.status = new_status
+        booking.holds_inventory = False
+        booking.save()
+    return True
+
+
+def release_many(bookings):
+    """Return the units held by bookings, already locked by the caller, with
+    one UPDATE per item model, hotel and quantity instead of one per booking.
+    Bookings without holds_inventory are skipped; the caller clears the flag
+    on the rest. Bounded like release()."""
+    counters = {}
+    nights = {}
+    for booking in bookings:
+        if not booking.holds_inventory:
+            continue
+        if booking.booking_type == 'hotel':
+            if booking.hotel_id and booking.check_in_date and booking.check_out_date:
+                for night in stay_nights(booking.check_in_date, booking.check_out_date):
+                    key = (booking.hotel_id, night)
+                    nights[key] = nights.get(key, 0) + booking.quantity
+            continue
+        item_id, model, counter = _item(booking)
+        if item_id is not None:
+            key = (model, counter, item_id)
+            counters[key] = counters.get(key, 0) + booking.quantity
+
+    updates = {}
+    for (model, counter, item_id), quantity in counters.items():
+        updates.setdefault((model, counter, quantity), []).append(item_id)
+    for (model, counter, quantity), item_ids in updates.items():
+        _restock(model, counter, item_ids, quantity)
+    for model in {model for model, _, _ in updates}:
+        catalog_cache.invalidate(model)
+
+    dates = {}
+    for (hotel_id, night), quantity in nights.items():
+        dates.setdefault((hotel_id, quantity), []).append(night)
+    for (hotel_id, quantity), nights_booked in dates.items():
+        HotelNight.objects.filter(hotel_id=hotel_id, date__in=nights_booked).update(
+            rooms_booked=Greatest(F('rooms_booked') - quantity, 0))
+    if dates:
+        catalog_cache.invalidate(Hotel)
+
+
+def available_hotels(queryset, check_in, check_out, rooms=1):
+    """Hotels in queryset with at least `rooms` free rooms on every night of
+    the stay, answered from a range scan over the booked nights only."""
+    full = HotelNight.objects.filter(
+        date__gte=check_in, date__lt=check_out,
+        rooms_booked__gt=F('hotel__available_rooms') - rooms,
+    ).values('hotel_id')
+    return queryset.filter(available_rooms__gte=rooms).exclude(id__in=full)
@@ -0,0 +1,165 @@
+"""Scheduled upkeep that keeps the hot tables small.
+
+- deactivate_past() switches off flights and events that have departed or
+  started, and deals that have ended, so catalog queries and the partial
+  is_active indexes only cover sellable rows.
+- expire_pending() moves pending bookings older than
+  BOOKING_PENDING_TIMEOUT to 'expired', returning the inventory of any that
+  hold some (Booking.holds_inventory).
+- archive() moves finished bookings older than BOOKING_ARCHIVE_AFTER_DAYS,
+  with their payments and refunds, to the Archived* tables.
+
+Each step works in batches of MAINTENANCE_BATCH_SIZE rows, one transaction
+per batch, so it never holds locks for long and an interrupted run loses at
+most one batch of progress. Run them with `manage.py maintenance`, from cron
+or with --every.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import catalog_cache, inventory
+from .models import (
+    Flight, Event, Deal, Booking, Payment, Refund, ArchivedBooking, ArchivedPayment, ArchivedRefund,
+)
+from .stats import invalidate_staff_stats
+
+# Catalog model -> the column after which a row can no longer be sold.
+PAST_INVENTORY = ((Flight, 'departure_time'), (Event, 'event_date'), (Deal, 'valid_until'))
+
+# Booking columns expire_pending() reads to release a hold.
+HOLD_COLUMNS = ('id', 'holds_inventory', 'booking_type', 'flight', 'hotel', 'event', 'quantity', 'check_in_date', 'check_out_date')
+
+# Refunds in these states are still being worked on; their bookings stay put.
+OPEN_REFUND_STATUSES = ('requested', 'processing')
+
+# Live model -> archive model; rows are copied column for column.
+ARCHIVES = ((Booking, ArchivedBooking), (Payment, ArchivedPayment), (Refund, ArchivedRefund))
+
+
+def _batch_size(batch_size):
+    return batch_size or settings.MAINTENANCE_BATCH_SIZE
+
+
+def deactivate_past(now=None, batch_size=None):
+    """Set is_active=False on catalog rows whose date has passed. Returns
+    {model: rows deactivated}."""
+    now = now or timezone.now()
+    batch_size = _batch_size(batch_size)
+    counts = {}
+    for model, column in PAST_INVENTORY:
+        past = model.objects.filter(is_active=True, **{f'{column}__lt': now}).order_by(column, 'id')
+        count = 0
+        while ids := list(past.values_list('id', flat=True)[:batch_size]):
+            # update() skips auto_now, and the post_save signals
+            count += model.objects.filter(pk__in=ids).update(is_active=False, updated_at=now)
+        if count:
+            catalog_cache.invalidate(model)
+            invalidate_staff_stats()
+        counts[model] = count
+    return counts
+
+
+def expire_pending(cutoff=None, batch_size=None):
+    """Expire pending bookings created before cutoff, releasing the
+    inventory of those that hold some. Returns the number of bookings
+    expired."""
+    now = timezone.now()
+    cutoff = cutoff or now - timedelta(seconds=settings.BOOKING_PENDING_TIMEOUT)
+    batch_size = _batch_size(batch_size)
+    count = 0
+    while True:
+        with transaction.atomic():
+            # Locked like inventory.release(), so a concurrent cancellation
+            # can't hand the same units back twice.
+            bookings = list(
+                Booking.objects.select_for_update().filter(status='pending', created_at__lt=cutoff)
+                .order_by('id').only(*HOLD_COLUMNS)[:batch_size]
+            )
+            if not bookings:
+                break
+            inventory.release_many(bookings)
+            ids = [booking.pk for booking in bookings]
+            Booking.objects.filter(pk__in=ids).update(
+                status='expired', payment_status='failed', holds_inventory=False, updated_at=now)
+            Payment.objects.filter(booking_id__in=ids, status='pending').update(status='failed', updated_at=now)
+            transaction.on_commit(invalidate_staff_stats)
+        count += len(bookings)
+        if len(bookings) < batch_size:
+            break
+    return count
+
+
+def archivable(cutoff, now=None):
+    """Bookings created before cutoff that are over: cancelled, refunded or
+    expired, or confirmed for a trip that has ended. Bookings with an open
+    refund or a support ticket stay in the live tables."""
+    now = now or timezone.now()
+    ended = (
+        Q(status='confirmed')
+        & ~Q(flight__departure_time__gte=now)
+        & ~Q(event__event_date__gte=now)
+        & ~Q(check_out_date__gt=timezone.localdate(now))
+    )
+    return (
+        Booking.objects.filter(created_at__lt=cutoff)
+        .filter(Q(status__in=inventory.RELEASED_STATUSES) | ended)
+        .exclude(refunds__status__in=OPEN_REFUND_STATUSES)
+        .exclude(support_tickets__isnull=False)
+    )
+
+
+def _copy(model, archive, rows, now, using):
+    # INSERT ... SELECT: the rows never pass through Python, which would
+    # otherwise dominate the run time.
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    fields = model._meta.concrete_fields
+    select, params = rows.values_list(*[field.attname for field in fields]).query.get_compiler(using).as_sql()
+    columns = [quote(archive._meta.get_field(field.name).column) for field in fields]
+    columns.append(quote(archive._meta.get_field('archived_at').column))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(archive._meta.db_table)} ({", ".join(columns)}) SELECT live.*, %s FROM ({select}) live',
+            (connection.ops.adapt_datetimefield_value(now), *params),
+        )
+
+
+def _delete(rows, using):
+    # A plain DELETE: the rows were copied, and per-row post_delete signals
+    # would drop the dashboard cache once per booking.
+    rows._raw_delete(using)
+
+
+def archive(cutoff=None, batch_size=None):
+    """Move archivable() bookings with their payments and refunds to the
+    archive tables. Returns the number of bookings moved."""
+    now = timezone.now()
+    cutoff = cutoff or now - timedelta(days=settings.BOOKING_ARCHIVE_AFTER_DAYS)
+    batch_size = _batch_size(batch_size)
+    candidates = archivable(cutoff, now).order_by('id').values_list('id', flat=True)
+    using = router.db_for_write(Booking)
+    count = 0
+    while True:
+        with transaction.atomic(using=using):
+            ids = list(candidates[:batch_size])
+            if not ids:
+                break
+            selected = {
+                Booking: Booking.objects.filter(pk__in=ids),
+                Payment: Payment.objects.filter(booking_id__in=ids),
+                Refund: Refund.objects.filter(booking_id__in=ids),
+            }
+            # Parents first when copying, children first when deleting.
+            for model, archive_model in ARCHIVES:
+                _copy(model, archive_model, selected[model], now, using)
+            for model, _ in reversed(ARCHIVES):
+                _delete(selected[model], using)
+            transaction.on_commit(invalidate_staff_stats)
+        count += len(ids)
+        if len(ids) < batch_size:
+            break
+    return count
@@ -0,0 +1,68 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from api import maintenance
+
+TASKS = ('deactivate', 'expire', 'archive')
+
+
+class Command(BaseCommand):
+    help = (
+        'Deactivate past flights, events and deals, expire stale pending bookings and archive old '
+        'bookings with their payments and refunds. Run it from cron, or keep it running with --every.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', default=','.join(TASKS),
+                            help=f'Comma separated subset of {", ".join(TASKS)} (default: all)')
+        parser.add_argument('--pending-timeout', type=int, default=None,
+                            help='Seconds before a pending booking expires (default: BOOKING_PENDING_TIMEOUT)')
+        parser.add_argument('--archive-after', type=int, default=None,
+                            help='Age in days of the bookings to archive (default: BOOKING_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows per transaction (default: MAINTENANCE_BATCH_SIZE)')
+        parser.add_argument('--every', type=int, default=None,
+                            help='Repeat every this many seconds instead of running once')
+
+    def handle(self, *args, **options):
+        tasks = [task.strip() for task in options['tasks'].split(',') if task.strip()]
+        unknown = set(tasks) - set(TASKS)
+        if unknown:
+            raise CommandError(f'Unknown tasks: {", ".join(sorted(unknown))}')
+        if settings.CACHES['default']['BACKEND'].endswith('LocMemCache'):
+            self.stderr.write('Warning: no shared cache (REDIS_URL); running servers keep serving cached '
+                              'catalog pages and dashboard stats until they expire')
+        while True:
+            self._run(tasks, options)
+            if not options['every']:
+                break
+            # Reconnect on the next run rather than hold connections while idle
+            connections.close_all()
+            time.sleep(options['every'])
+
+    def _run(self, tasks, options):
+        now = timezone.now()
+        batch_size = options['batch_size']
+        if 'deactivate' in tasks:
+            counts = self._timed('deactivate', lambda: maintenance.deactivate_past(now, batch_size))
+            for model, count in counts.items():
+                self.stdout.write(f'  {model._meta.verbose_name_plural}: {count} deactivated')
+        if 'expire' in tasks:
+            timeout = options['pending_timeout'] or settings.BOOKING_PENDING_TIMEOUT
+            count = self._timed('expire', lambda: maintenance.expire_pending(now - timedelta(seconds=timeout), batch_size))
+            self.stdout.write(f'  bookings: {count} expired')
+        if 'archive' in tasks:
+            days = options['archive_after'] or settings.BOOKING_ARCHIVE_AFTER_DAYS
+            count = self._timed('archive', lambda: maintenance.archive(now - timedelta(days=days), batch_size))
+            self.stdout.write(f'  bookings: {count} archived')
+
+    def _timed(self, task, run):
+        started = time.perf_counter()
+        result = run()
+        self.stdout.write(f'{task}: done in {time.perf_counter() - started:.1f}s')
+        return result
@@ -0,0 +1,91 @@
+import time
+from datetime import date, datetime, time as clock_time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api import seeding
+from api.models import Flight, Hotel, Event, Deal, Booking, Payment, UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate synthetic catalog, user, booking and payment rows with bulk inserts, '
+        'deterministically from --seed. Use a fresh database for reproducible data; '
+        'a seed whose users or bookings are already loaded is skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--flights', type=int, default=1000)
+        parser.add_argument('--hotels', type=int, default=200)
+        parser.add_argument('--events', type=int, default=200)
+        parser.add_argument('--deals', type=int, default=50)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--bookings', type=int, default=1000,
+                            help='Bookings; every non-pending one also gets a payment')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--anchor', type=date.fromisoformat, default=None,
+                            help='YYYY-MM-DD the generated dates are relative to (default: today)')
+        parser.add_argument('--batch-size', type=int, default=seeding.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        batch_size = options['batch_size']
+        anchor = timezone.make_aware(datetime.combine(options['anchor'] or timezone.localdate(), clock_time()))
+        if seeding.already_loaded(seed):
+            self.stdout.write(f'Rows for --seed {seed} are already loaded; nothing to do')
+            return
+
+        with seeding.explicit_timestamps(Flight, Hotel, Event, Deal, Booking, Payment, UserProfile):
+            for model, generate in ((Flight, seeding.flights), (Hotel, seeding.hotels),
+                                    (Event, seeding.events), (Deal, seeding.deals)):
+                count = options[f'{model._meta.model_name}s']
+                self._timed(model, lambda: seeding.load(model, generate(count, seed, anchor), batch_size))
+
+            def load_users():
+                count = 0
+                for batch in seeding.batches(seeding.users(options['users'], seed, anchor), batch_size):
+                    User.objects.bulk_create(batch)
+                    names = [user.username for user in batch]
+                    user_ids = User.objects.filter(username__in=names).order_by('id').values_list('id', flat=True)
+                    UserProfile.objects.bulk_create(seeding.profiles(user_ids, seed, anchor))
+                    count += len(batch)
+                return count
+            self._timed(User, load_users)
+
+            if options['bookings']:
+                self._timed(Booking, lambda: self._load_bookings(options['bookings'], seed, anchor, batch_size))
+
+        seeding.after_bulk_load()
+
+    def _load_bookings(self, count, seed, anchor, batch_size):
+        user_ids = list(User.objects.filter(profile__role='customer').order_by('id').values_list('id', flat=True))
+        item_ids = {}
+        for booking_type, model, price in (('flight', Flight, 'price_sar'), ('hotel', Hotel, 'price_per_night_sar'),
+                                           ('event', Event, 'price_sar')):
+            rows = list(model.objects.order_by('id').values_list('id', price))
+            if rows:
+                item_ids[booking_type] = rows
+        if not user_ids or not item_ids:
+            raise CommandError('Bookings need at least one customer and one flight, hotel or event')
+
+        payments = 0
+        for batch in seeding.batches(seeding.bookings(count, seed, anchor, user_ids, item_ids), batch_size):
+            Booking.objects.bulk_create(batch)
+            if batch[0].pk is None:
+                # Backends that can't return ids from a bulk insert
+                ids = dict(Booking.objects.filter(booking_reference__in=[b.booking_reference for b in batch])
+                           .values_list('booking_reference', 'id'))
+                for booking in batch:
+                    booking.pk = ids[booking.booking_reference]
+            payments += seeding.load(Payment, seeding.payments(batch), batch_size)
+        self.stdout.write(f'  ... and {payments} payments')
+        return count
+
+    def _timed(self, model, load):
+        started = time.perf_counter()
+        count = load()
+        seconds = time.perf_counter() - started
+        rate = count / seconds if seconds else 0
+        self.stdout.write(f'{model._meta.verbose_name_plural}: {count} rows in {seconds:.1f}s ({rate:.0f} rows/s)')
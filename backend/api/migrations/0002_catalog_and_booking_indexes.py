@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-created_at', 'id'], name='booking_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='booking_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status'], name='booking_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-discount_percentage', 'id'], name='deal_active_discount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['event_date', 'id'], name='event_active_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['departure_time', 'id'], name='flight_active_departure_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-star_rating', 'id'], name='hotel_active_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-created_at', 'id'], name='payment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='refund',
+            index=models.Index(fields=['-created_at', 'id'], name='refund_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['-created_at', 'id'], name='ticket_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='ticket_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['status'], name='ticket_status_idx'),
+        ),
+    ]
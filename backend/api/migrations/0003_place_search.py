@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+def register_existing_places(apps, schema_editor):
+    from api.search import place_name_rows
+
+    Flight = apps.get_model('api', 'Flight')
+    Hotel = apps.get_model('api', 'Hotel')
+    Event = apps.get_model('api', 'Event')
+    PlaceName = apps.get_model('api', 'PlaceName')
+    places = set(Flight.objects.values_list('origin', flat=True))
+    places |= set(Flight.objects.values_list('destination', flat=True))
+    places |= set(Hotel.objects.values_list('city', flat=True))
+    places |= set(Event.objects.values_list('city', flat=True))
+    PlaceName.objects.bulk_create(
+        [PlaceName(**row) for row in place_name_rows(places)], ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_catalog_and_booking_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceName',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('place', models.CharField(help_text='City value as stored on Flight/Hotel/Event rows', max_length=100)),
+                ('alias', models.CharField(max_length=100)),
+                ('normalized', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['city', 'event_date'], name='event_active_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['origin', 'departure_time'], name='flight_active_origin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['destination', 'departure_time'], name='flight_active_destination_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['city', '-star_rating'], name='hotel_active_city_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='placename',
+            constraint=models.UniqueConstraint(fields=('normalized', 'place'), name='placename_normalized_place_uniq'),
+        ),
+        migrations.RunPython(register_existing_places, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:14
+
+import django.core.validators
+import django.db.models.deletion
+from collections import Counter
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_hotel_nights(apps, schema_editor):
+    Booking = apps.get_model('api', 'Booking')
+    HotelNight = apps.get_model('api', 'HotelNight')
+    nights = Counter()
+    bookings = (Booking.objects
+                .filter(booking_type='hotel', hotel__isnull=False,
+                        check_in_date__isnull=False, check_out_date__isnull=False)
+                .exclude(status__in=['cancelled', 'refunded'])
+                .values_list('hotel_id', 'check_in_date', 'check_out_date', 'quantity'))
+    for hotel_id, check_in, check_out, quantity in bookings.iterator():
+        night = check_in
+        while night < check_out:
+            nights[hotel_id, night] += quantity
+            night += timedelta(days=1)
+    HotelNight.objects.bulk_create(
+        [HotelNight(hotel_id=hotel_id, date=date, rooms_booked=booked)
+         for (hotel_id, date), booked in nights.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_place_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hotel',
+            name='available_rooms',
+            field=models.IntegerField(help_text='Rooms sellable per night; nightly bookings are tracked in HotelNight', validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.CreateModel(
+            name='HotelNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('rooms_booked', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='api.hotel')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'hotel', 'rooms_booked'], name='hotelnight_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('hotel', 'date'), name='hotelnight_hotel_date_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_hotel_nights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_hotel_nights'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='supportticket',
+            name='ticket_number',
+            field=models.CharField(max_length=24, unique=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:17
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def seed_usd_rate(apps, schema_editor):
+    ExchangeRate = apps.get_model('api', 'ExchangeRate')
+    # The riyal is pegged at 3.75 per US dollar.
+    ExchangeRate.objects.get_or_create(currency='USD', defaults={'sar_per_unit': Decimal('3.75')})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_longer_ticket_numbers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, unique=True)),
+                ('sar_per_unit', models.DecimalField(decimal_places=6, max_digits=12, validators=[django.core.validators.MinValueValidator(0)])),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='deal',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings', to='api.deal'),
+        ),
+        migrations.RunPython(seed_usd_rate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_pricing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deal',
+            name='city',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='deal',
+            name='destination',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='deal',
+            name='event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deals', to='api.event'),
+        ),
+        migrations.AddField(
+            model_name='deal',
+            name='flight',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deals', to='api.flight'),
+        ),
+        migrations.AddField(
+            model_name='deal',
+            name='hotel',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deals', to='api.hotel'),
+        ),
+        migrations.AddField(
+            model_name='deal',
+            name='origin',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
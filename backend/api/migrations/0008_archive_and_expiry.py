@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_deal_targets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled'), ('refunded', 'Refunded'), ('expired', 'Expired')], default='pending', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_reference', models.CharField(max_length=20, unique=True)),
+                ('booking_type', models.CharField(choices=[('flight', 'Flight'), ('hotel', 'Hotel'), ('event', 'Event')], max_length=20)),
+                ('quantity', models.IntegerField()),
+                ('total_price_sar', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_price_usd', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(max_length=3)),
+                ('payment_method', models.CharField(choices=[('card', 'Credit/Debit Card'), ('bank_transfer', 'Bank Transfer'), ('amex', 'American Express')], max_length=20)),
+                ('payment_status', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled'), ('refunded', 'Refunded'), ('expired', 'Expired')], max_length=20)),
+                ('customer_name', models.CharField(max_length=200)),
+                ('customer_email', models.EmailField(max_length=254)),
+                ('customer_phone', models.CharField(max_length=20)),
+                ('special_requests', models.TextField(blank=True)),
+                ('check_in_date', models.DateField(blank=True, null=True)),
+                ('check_out_date', models.DateField(blank=True, null=True)),
+                ('confirmation_sent', models.BooleanField(default=False)),
+                ('ticket_issued', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('deal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.deal')),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.event')),
+                ('flight', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.flight')),
+                ('hotel', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.hotel')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bookings', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_id', models.CharField(max_length=100, unique=True)),
+                ('amount_sar', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('amount_usd', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(max_length=3)),
+                ('payment_method', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed'), ('refunded', 'Refunded')], max_length=20)),
+                ('payment_gateway_response', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='api.archivedbooking')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedRefund',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('refund_amount_sar', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('refund_amount_usd', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(max_length=3)),
+                ('reason', models.TextField()),
+                ('status', models.CharField(choices=[('requested', 'Requested'), ('processing', 'Processing'), ('completed', 'Completed'), ('rejected', 'Rejected')], max_length=20)),
+                ('admin_notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='refunds', to='api.archivedbooking')),
+                ('payment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='refunds', to='api.archivedpayment')),
+                ('processed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedbooking',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='archived_booking_user_idx'),
+        ),
+    ]
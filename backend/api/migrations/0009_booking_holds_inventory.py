@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:41
+
+from django.db import migrations, models
+
+
+def mark_hotel_holds(apps, schema_editor):
+    Booking = apps.get_model('api', 'Booking')
+    # Before this field, only hotel bookings held anything: 0004 counted every
+    # hotel booking that wasn't cancelled or refunded into HotelNight, pending
+    # ones included. Flight seats and event tickets were never decremented, so
+    # legacy flight and event bookings keep the default of False.
+    (Booking.objects
+     .filter(booking_type='hotel', hotel__isnull=False,
+             check_in_date__isnull=False, check_out_date__isnull=False)
+     .exclude(status__in=['cancelled', 'refunded'])
+     .update(holds_inventory=True))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_archive_and_expiry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='holds_inventory',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='holds_inventory',
+            field=models.BooleanField(default=False, help_text='Seats, rooms or tickets were reserved for this booking and not yet released'),
+        ),
+        migrations.RunPython(mark_hotel_holds, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from . import ids
+
 class UserProfile(models.Model):
     ROLE_CHOICES = [
         ('admin', 'Admin'),
@@ -36,6 +38,13 @@ class Flight(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['departure_time', 'id'], condition=models.Q(is_active=True), name='flight_active_departure_idx'),
+            models.Index(fields=['origin', 'departure_time'], condition=models.Q(is_active=True), name='flight_active_origin_idx'),
+            models.Index(fields=['destination', 'departure_time'], condition=models.Q(is_active=True), name='flight_active_destination_idx'),
+        ]
+
     def __str__(self):
         return f"{self.airline} {self.flight_number} - {self.origin} to {self.destination}"
 
@@ -48,7 +57,7 @@ class Hotel(models.Model):
     amenities = models.TextField(help_text='Comma-separated amenities')
     price_per_night_sar = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     price_per_night_usd = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
-    available_rooms = models.IntegerField(validators=[MinValueValidator(0)])
+    available_rooms = models.IntegerField(validators=[MinValueValidator(0)], help_text='Rooms sellable per night; nightly bookings are tracked in HotelNight')
     total_rooms = models.IntegerField(validators=[MinValueValidator(1)])
     check_in_time = models.TimeField()
     check_out_time = models.TimeField()
@@ -57,9 +66,36 @@ class Hotel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-star_rating', 'id'], condition=models.Q(is_active=True), name='hotel_active_rating_idx'),
+            models.Index(fields=['city', '-star_rating'], condition=models.Q(is_active=True), name='hotel_active_city_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.city}"
 
+class HotelNight(models.Model):
+    """Rooms booked at a hotel for one night.
+
+    Rows exist only for nights with at least one booking; a missing row means
+    all of the hotel's available_rooms are free that night.
+    """
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='nights')
+    date = models.DateField()
+    rooms_booked = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hotel', 'date'], name='hotelnight_hotel_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'hotel', 'rooms_booked'], name='hotelnight_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hotel.name} - {self.date}: {self.rooms_booked} booked"
+
 class Event(models.Model):
     name = models.CharField(max_length=200)
     category = models.CharField(max_length=100)
@@ -77,6 +113,12 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['event_date', 'id'], condition=models.Q(is_active=True), name='event_active_date_idx'),
+            models.Index(fields=['city', 'event_date'], condition=models.Q(is_active=True), name='event_active_city_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.city}"
 
@@ -92,6 +134,7 @@ class Booking(models.Model):
         ('confirmed', 'Confirmed'),
         ('cancelled', 'Cancelled'),
         ('refunded', 'Refunded'),
+        ('expired', 'Expired'),
     ]
     
     PAYMENT_METHOD_CHOICES = [
@@ -117,21 +160,28 @@ class Booking(models.Model):
     customer_email = models.EmailField()
     customer_phone = models.CharField(max_length=20)
     special_requests = models.TextField(blank=True)
+    deal = models.ForeignKey('Deal', on_delete=models.SET_NULL, null=True, blank=True, related_name='bookings')
     check_in_date = models.DateField(null=True, blank=True)
     check_out_date = models.DateField(null=True, blank=True)
     confirmation_sent = models.BooleanField(default=False)
     ticket_issued = models.BooleanField(default=False)
+    holds_inventory = models.BooleanField(default=False, help_text='Seats, rooms or tickets were reserved for this booking and not yet released')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='booking_created_idx'),
+            models.Index(fields=['user', '-created_at', 'id'], name='booking_user_created_idx'),
+            models.Index(fields=['status'], name='booking_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.booking_reference} - {self.user.username} - {self.booking_type}"
 
     def save(self, *args, **kwargs):
         if not self.booking_reference:
-            import random
-            import string
-            self.booking_reference = 'BKM' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
+            self.booking_reference = ids.booking_reference()
         super().save(*args, **kwargs)
 
 class Payment(models.Model):
@@ -153,14 +203,17 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='payment_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.transaction_id} - {self.booking.booking_reference} - {self.status}"
 
     def save(self, *args, **kwargs):
         if not self.transaction_id:
-            import random
-            import string
-            self.transaction_id = 'TXN' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
+            self.transaction_id = ids.transaction_id()
         super().save(*args, **kwargs)
 
 class Refund(models.Model):
@@ -183,6 +236,11 @@ class Refund(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='refund_created_idx'),
+        ]
+
     def __str__(self):
         return f"Refund for {self.booking.booking_reference} - {self.status}"
 
@@ -197,6 +255,16 @@ class Deal(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     deal_type = models.CharField(max_length=20, choices=DEAL_TYPE_CHOICES)
+    # What the deal applies to (see api.deals): one flight, hotel or event;
+    # flights on a route; or hotels, events and flights into a city. A deal
+    # with none of these set stays out of the best-deal index, but a booking
+    # of its deal_type can still be quoted with it.
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, null=True, blank=True, related_name='deals')
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, null=True, blank=True, related_name='deals')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, null=True, blank=True, related_name='deals')
+    origin = models.CharField(max_length=100, blank=True)
+    destination = models.CharField(max_length=100, blank=True)
+    city = models.CharField(max_length=100, blank=True)
     discount_percentage = models.DecimalField(max_digits=5, decimal_places=2, validators=[MinValueValidator(0), MaxValueValidator(100)])
     original_price_sar = models.DecimalField(max_digits=10, decimal_places=2)
     discounted_price_sar = models.DecimalField(max_digits=10, decimal_places=2)
@@ -209,6 +277,11 @@ class Deal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-discount_percentage', 'id'], condition=models.Q(is_active=True), name='deal_active_discount_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.discount_percentage}% off"
 
@@ -227,7 +300,7 @@ class SupportTicket(models.Model):
         ('closed', 'Closed'),
     ]
     
-    ticket_number = models.CharField(max_length=20, unique=True)
+    ticket_number = models.CharField(max_length=24, unique=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='support_tickets')
     booking = models.ForeignKey(Booking, on_delete=models.SET_NULL, null=True, blank=True, related_name='support_tickets')
     subject = models.CharField(max_length=200)
@@ -239,12 +312,119 @@ class SupportTicket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='ticket_created_idx'),
+            models.Index(fields=['user', '-created_at', 'id'], name='ticket_user_created_idx'),
+            models.Index(fields=['status'], name='ticket_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.ticket_number} - {self.subject}"
 
     def save(self, *args, **kwargs):
         if not self.ticket_number:
-            import random
-            import string
-            self.ticket_number = 'SUP' + ''.join(random.choices(string.digits, k=8))
+            self.ticket_number = ids.ticket_number()
         super().save(*args, **kwargs)
+
+class ExchangeRate(models.Model):
+    """How many SAR one unit of currency is worth. Prices are stored in SAR
+    and converted with these rates (see api.pricing)."""
+    currency = models.CharField(max_length=3, unique=True)
+    sar_per_unit = models.DecimalField(max_digits=12, decimal_places=6, validators=[MinValueValidator(0)])
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"1 {self.currency} = {self.sar_per_unit} SAR"
+
+class PlaceName(models.Model):
+    """Search key for a city or airport name as stored on catalog rows.
+
+    Each catalog city is registered under its own name plus any English or
+    Arabic aliases, normalized by api.search.normalize_place, so that searches
+    become an indexed prefix range scan instead of a LIKE '%...%' table scan.
+    """
+    place = models.CharField(max_length=100, help_text='City value as stored on Flight/Hotel/Event rows')
+    alias = models.CharField(max_length=100)
+    normalized = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['normalized', 'place'], name='placename_normalized_place_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.alias} -> {self.place}"
+
+# Archive tables. api.maintenance moves finished bookings, with their payments
+# and refunds, out of the tables above once they are old. The columns match
+# the live models' so rows copy across unchanged; archived_at records the move.
+
+class ArchivedBooking(models.Model):
+    booking_reference = models.CharField(max_length=20, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_bookings')
+    booking_type = models.CharField(max_length=20, choices=Booking.BOOKING_TYPE_CHOICES)
+    flight = models.ForeignKey(Flight, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    hotel = models.ForeignKey(Hotel, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    event = models.ForeignKey(Event, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    quantity = models.IntegerField()
+    total_price_sar = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price_usd = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    payment_method = models.CharField(max_length=20, choices=Booking.PAYMENT_METHOD_CHOICES)
+    payment_status = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    customer_name = models.CharField(max_length=200)
+    customer_email = models.EmailField()
+    customer_phone = models.CharField(max_length=20)
+    special_requests = models.TextField(blank=True)
+    deal = models.ForeignKey(Deal, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    check_in_date = models.DateField(null=True, blank=True)
+    check_out_date = models.DateField(null=True, blank=True)
+    confirmation_sent = models.BooleanField(default=False)
+    ticket_issued = models.BooleanField(default=False)
+    holds_inventory = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at', 'id'], name='archived_booking_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.booking_reference} - {self.booking_type} (archived)"
+
+class ArchivedPayment(models.Model):
+    booking = models.ForeignKey(ArchivedBooking, on_delete=models.CASCADE, related_name='payments')
+    transaction_id = models.CharField(max_length=100, unique=True)
+    amount_sar = models.DecimalField(max_digits=10, decimal_places=2)
+    amount_usd = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    payment_method = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=Payment.STATUS_CHOICES)
+    payment_gateway_response = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.transaction_id} - {self.status} (archived)"
+
+class ArchivedRefund(models.Model):
+    booking = models.ForeignKey(ArchivedBooking, on_delete=models.CASCADE, related_name='refunds')
+    payment = models.ForeignKey(ArchivedPayment, on_delete=models.CASCADE, related_name='refunds')
+    refund_amount_sar = models.DecimalField(max_digits=10, decimal_places=2)
+    refund_amount_usd = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    reason = models.TextField()
+    status = models.CharField(max_length=20, choices=Refund.STATUS_CHOICES)
+    processed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    admin_notes = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Refund for booking {self.booking_id} - {self.status} (archived)"
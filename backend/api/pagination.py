@@ -0,0 +1,143 @@
+import json
+import operator
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """Opaque-cursor pagination keyed on the viewset's ordering plus id.
+
+    DRF's CursorPagination only stores the first ordering field in the cursor
+    and steps over rows that tie on it with an OFFSET capped at 1000, so a
+    run of more than 1000 ties (hotels sharing a star rating) pages forever.
+    Here the cursor holds every ordering field of the last row and the next
+    page starts strictly after that tuple; with id last, rows never tie.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self._after(current_position, reverse, queryset.model))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+        following_position = self._get_position_from_instance(results[-1], self.ordering) if has_following_position else None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _after(self, position, reverse, model):
+        """Rows strictly past position in the direction of travel:
+        (a > x) OR (a = x AND b > y) OR ... with > flipped per descending field."""
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(position)
+            # Cursors come from clients: check every value against its field
+            # here rather than let the ORM fail on it with a 500.
+            values = [
+                model._meta.get_field(order.lstrip('-')).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+            if None in values:
+                raise ValueError(position)
+        except (ValueError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        clauses = []
+        equal = Q()
+        for order, value in zip(self.ordering, values):
+            field = order.lstrip('-')
+            lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+            clauses.append(equal & Q(**{f'{field}__{lookup}': value}))
+            equal &= Q(**{field: value})
+        # Redundant bound on the leading field so the database can seek the
+        # index instead of testing the OR against every row before the cursor.
+        first = self.ordering[0]
+        bound = Q(**{f'{first.lstrip("-")}__{"lte" if first.startswith("-") != reverse else "gte"}': values[0]})
+        return bound & reduce(operator.or_, clauses)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = [
+            instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            for name in (order.lstrip('-') for order in ordering)
+        ]
+        return json.dumps([str(value) for value in values])
+
+
+class FlightPagination(KeysetPagination):
+    ordering = ('departure_time', 'id')
+    max_page_size = 100
+
+
+class HotelPagination(KeysetPagination):
+    ordering = ('-star_rating', 'id')
+    max_page_size = 50
+
+
+class EventPagination(KeysetPagination):
+    ordering = ('event_date', 'id')
+    max_page_size = 100
+
+
+class DealPagination(KeysetPagination):
+    ordering = ('-discount_percentage', 'id')
+    max_page_size = 50
+
+
+class BookingPagination(KeysetPagination):
+    ordering = ('-created_at', 'id')
+    max_page_size = 200
+
+
+class PaymentPagination(KeysetPagination):
+    ordering = ('-created_at', 'id')
+    max_page_size = 200
+
+
+class RefundPagination(KeysetPagination):
+    ordering = ('-created_at', 'id')
+    max_page_size = 100
+
+
+class SupportTicketPagination(KeysetPagination):
+    ordering = ('-created_at', 'id')
+    max_page_size = 100
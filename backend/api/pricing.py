@@ -0,0 +1,184 @@
+"""Server-side prices for bookings and quotes.
+
+Catalog prices are authoritative in SAR; other currencies are converted with
+the ExchangeRate table, which is read once per EXCHANGE_RATE_CACHE_TIMEOUT
+rather than from the per-row USD columns.
+"""
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import deals as deal_targets
+from .models import Flight, Hotel, Event, Deal, ExchangeRate
+
+EXCHANGE_RATES_CACHE_KEY = 'pricing:exchange_rates'
+CENT = Decimal('0.01')
+
+# Used until the ExchangeRate table has a row for the currency.
+DEFAULT_RATES = {'SAR': Decimal('1'), 'USD': Decimal('3.75')}
+
+# booking_type -> (item field, catalog model, SAR unit price field)
+PRICED_ITEMS = {
+    'flight': ('flight', Flight, 'price_sar'),
+    'hotel': ('hotel', Hotel, 'price_per_night_sar'),
+    'event': ('event', Event, 'price_sar'),
+}
+
+QUOTE_MAX_ITEMS = 50
+
+
+class PricingError(Exception):
+    pass
+
+
+def exchange_rates():
+    rates = cache.get(EXCHANGE_RATES_CACHE_KEY)
+    if rates is None:
+        rates = dict(DEFAULT_RATES)
+        rates.update(ExchangeRate.objects.values_list('currency', 'sar_per_unit'))
+        cache.set(EXCHANGE_RATES_CACHE_KEY, rates, settings.EXCHANGE_RATE_CACHE_TIMEOUT)
+    return rates
+
+
+def invalidate_exchange_rates():
+    cache.delete(EXCHANGE_RATES_CACHE_KEY)
+
+
+def convert(amount_sar, currency, rates=None):
+    rates = rates or exchange_rates()
+    if currency not in rates:
+        raise PricingError(f'No exchange rate for {currency}')
+    return (amount_sar / rates[currency]).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _as_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise PricingError('check_in_date and check_out_date must be YYYY-MM-DD dates')
+
+
+def _as_id(value):
+    if hasattr(value, 'pk'):
+        return value.pk
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        raise PricingError('Item ids must be numbers')
+
+
+def _price(item, catalog, deals, rates, now):
+    booking_type = item.get('booking_type')
+    if booking_type not in PRICED_ITEMS:
+        raise PricingError('booking_type must be flight, hotel or event')
+    field, model, price_field = PRICED_ITEMS[booking_type]
+    item_id = _as_id(item.get(field))
+    product = catalog[booking_type].get(item_id)
+    if product is None:
+        raise PricingError(f'{booking_type.capitalize()} not found')
+
+    try:
+        quantity = int(item.get('quantity') or 1)
+    except (TypeError, ValueError):
+        raise PricingError('quantity must be a number')
+    if quantity < 1:
+        raise PricingError('quantity must be at least 1')
+
+    nights = 1
+    if booking_type == 'hotel':
+        check_in = _as_date(item.get('check_in_date'))
+        check_out = _as_date(item.get('check_out_date'))
+        if not check_in or not check_out or check_out <= check_in:
+            raise PricingError('Hotel prices need a check-out date after the check-in date')
+        nights = (check_out - check_in).days
+
+    unit_price = getattr(product, price_field)
+    subtotal = unit_price * quantity * nights
+    discount_percentage = Decimal('0.00')
+    deal_id = _as_id(item.get('deal'))
+    if deal_id is not None:
+        deal = deals.get(deal_id)
+        if (deal is None or not deal.is_active
+                or not deal_targets.applies(deal, booking_type, deal_targets.item_row(booking_type, product))
+                or not deal.valid_from <= now <= deal.valid_until):
+            raise PricingError('Deal is not valid for this booking')
+        discount_percentage = deal.discount_percentage
+    discount = deal_targets.discount(subtotal, discount_percentage)
+    total_sar = (subtotal - discount).quantize(CENT, rounding=ROUND_HALF_UP)
+
+    return {
+        'booking_type': booking_type,
+        field: item_id,
+        'quantity': quantity,
+        'nights': nights,
+        'unit_price_sar': unit_price,
+        'subtotal_sar': subtotal.quantize(CENT),
+        'deal': deal_id,
+        'discount_percentage': discount_percentage,
+        'discount_sar': discount,
+        'total_price_sar': total_sar,
+        'total_price_usd': convert(total_sar, 'USD', rates),
+    }
+
+
+# Item fields holding catalog or deal ids, and the model each refers to.
+RELATED_MODELS = {'flight': Flight, 'hotel': Hotel, 'event': Event, 'deal': Deal}
+
+
+def related_objects(items):
+    """{model: {pk: row}} for every flight, hotel, event and deal the
+    booking-shaped dicts refer to, with one in_bulk() per model."""
+    wanted = {model: set() for model in RELATED_MODELS.values()}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        for field, model in RELATED_MODELS.items():
+            try:
+                item_id = _as_id(item.get(field))
+            except PricingError:
+                continue  # reported per item
+            if item_id is not None:
+                wanted[model].add(item_id)
+    return {model: model.objects.in_bulk(item_ids) for model, item_ids in wanted.items()}
+
+
+def quote_many(items, related=None):
+    """Price a list of booking-shaped dicts.
+
+    Loads every referenced flight, hotel, event and deal with one query per
+    model (or takes them from related, see related_objects()) and the
+    exchange rates once, however many items there are. Returns one result
+    per item, in order; invalid items get {'error': ...}.
+    """
+    if related is None:
+        related = related_objects(items)
+    catalog = {
+        booking_type: {pk: row for pk, row in related[model].items() if row.is_active}
+        for booking_type, (_, model, _) in PRICED_ITEMS.items()
+    }
+    deals = related[Deal]
+    rates = exchange_rates()
+    now = timezone.now()
+
+    results = []
+    for item in items:
+        try:
+            if not isinstance(item, dict):
+                raise PricingError('Each item must be an object')
+            results.append(_price(item, catalog, deals, rates, now))
+        except PricingError as e:
+            results.append({'error': str(e)})
+    return results
+
+
+def quote(item):
+    """Price one booking-shaped dict; raises PricingError if it can't be priced."""
+    result = quote_many([item])[0]
+    if 'error' in result:
+        raise PricingError(result['error'])
+    return result
@@ -0,0 +1,102 @@
+import re
+import unicodedata
+
+from .models import PlaceName
+
+# Upper bound for a prefix range scan: every string starting with the prefix
+# sorts between prefix and prefix + this character.
+_PREFIX_END = '\U0010ffff'
+
+_ARABIC_FOLD = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ة': 'ه', 'ى': 'ي', 'ؤ': 'و', 'ئ': 'ي',
+    'ـ': None,
+})
+_SEPARATORS = re.compile(r"[\s\-_'’.,]+")
+_ARTICLES = ('al ', 'el ', 'ال')
+
+# English and Arabic names (and IATA codes) of the cities we sell, keyed by the
+# spelling init_db.py stores. A catalog row using any of these names is made
+# findable by all of them.
+KNOWN_PLACES = {
+    'Riyadh': ['Riyadh', 'Riyad', 'Ar Riyadh', 'الرياض', 'RUH'],
+    'Jeddah': ['Jeddah', 'Jedda', 'Jiddah', 'جدة', 'JED'],
+    'Dammam': ['Dammam', 'Ad Dammam', 'الدمام', 'DMM'],
+    'Makkah': ['Makkah', 'Mecca', 'Mekkah', 'مكة', 'مكة المكرمة'],
+    'Madinah': ['Madinah', 'Medina', 'Al Madinah', 'المدينة', 'المدينة المنورة', 'MED'],
+    'Khobar': ['Khobar', 'Al Khobar', 'الخبر'],
+    'Abha': ['Abha', 'أبها', 'AHB'],
+    'Taif': ['Taif', 'Ta\'if', 'الطائف', 'TIF'],
+    'Tabuk': ['Tabuk', 'تبوك', 'TUU'],
+    'AlUla': ['AlUla', 'Al Ula', 'العلا', 'ULH'],
+    'Dubai': ['Dubai', 'دبي', 'DXB'],
+    'Abu Dhabi': ['Abu Dhabi', 'أبوظبي', 'أبو ظبي', 'AUH'],
+    'Doha': ['Doha', 'الدوحة', 'DOH'],
+    'Bahrain': ['Bahrain', 'Manama', 'البحرين', 'المنامة', 'BAH'],
+    'Kuwait': ['Kuwait', 'الكويت', 'KWI'],
+    'Muscat': ['Muscat', 'مسقط', 'MCT'],
+    'Cairo': ['Cairo', 'القاهرة', 'CAI'],
+    'Amman': ['Amman', 'عمان', 'AMM'],
+    'Istanbul': ['Istanbul', 'إسطنبول', 'اسطنبول', 'IST'],
+    'London': ['London', 'لندن', 'LHR'],
+    'Paris': ['Paris', 'باريس', 'CDG'],
+}
+
+
+def normalize_place(value):
+    """Fold case, diacritics, Arabic letter variants and a leading article so
+    that e.g. 'Al-Khobar', 'al khobar' and 'khobar' all compare equal."""
+    value = unicodedata.normalize('NFKD', value.casefold())
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    value = _SEPARATORS.sub(' ', value.translate(_ARABIC_FOLD)).strip()
+    for article in _ARTICLES:
+        if value.startswith(article) and len(value) > len(article):
+            value = value[len(article):]
+            break
+    return value
+
+
+def _keys(alias):
+    """Search keys for an alias: the whole name and each later word, so
+    'Abu Dhabi' is also found by 'dhabi'."""
+    normalized = normalize_place(alias)
+    words = normalized.split(' ')
+    return {' '.join(words[i:]) for i in range(len(words))} - {''}
+
+
+def known_aliases(place):
+    key = normalize_place(place)
+    for aliases in KNOWN_PLACES.values():
+        if any(normalize_place(alias) == key for alias in aliases):
+            return aliases
+    return ()
+
+
+def place_name_rows(places):
+    """PlaceName field values making each place findable by its own name and
+    by its known aliases."""
+    rows = {}
+    for place in sorted(set(places)):
+        if not place:
+            continue
+        for alias in (place, *known_aliases(place)):
+            for key in sorted(_keys(alias)):
+                rows.setdefault((key, place), {'place': place, 'alias': alias, 'normalized': key})
+    return list(rows.values())
+
+
+def register_places(places):
+    """Add the search keys for places. Idempotent."""
+    PlaceName.objects.bulk_create(
+        [PlaceName(**row) for row in place_name_rows(places)], ignore_conflicts=True
+    )
+
+
+def matching_places(query):
+    """City values on catalog rows whose name or alias starts with query."""
+    key = normalize_place(query)
+    if not key:
+        return PlaceName.objects.none().values('place')
+    return (PlaceName.objects
+            .filter(normalized__gte=key, normalized__lt=key + _PREFIX_END)
+            .values('place'))
@@ -0,0 +1,247 @@
+"""Bulk loading of catalog, user and booking rows.
+
+load() inserts model instances with bulk_create in batches, and
+after_bulk_load() does the work post_save signals would have done per row
+(search keys for new cities, cache invalidation).
+
+The generators below produce synthetic data at load-test scale for the
+populate_data command. Each model draws from its own random.Random seeded
+with (seed, model), so a seed and a set of counts give the same rows on
+every run against a fresh database, and changing one count leaves the other
+models' rows unchanged. Synthetic bookings do not reserve seats, rooms or
+tickets. Users and bookings carry the seed in their username and reference,
+which already_loaded() uses to make a repeated run a no-op.
+"""
+import random
+from contextlib import contextmanager
+from datetime import time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from . import catalog_cache, pricing
+from .models import Flight, Hotel, Event, Deal, Booking, Payment, UserProfile
+from .search import KNOWN_PLACES, register_places
+from .stats import invalidate_staff_stats
+
+BATCH_SIZE = 5000
+
+# Password of every synthetic user, hashed once for all of them.
+SEED_PASSWORD = 'password123'
+
+CITIES = list(KNOWN_PLACES)
+AIRLINES = ['Saudia', 'Flynas', 'Flyadeal', 'Emirates', 'Qatar Airways', 'Gulf Air', 'EgyptAir']
+AIRCRAFT = ['Airbus A320', 'Airbus A321neo', 'Airbus A330', 'Boeing 777-300ER', 'Boeing 787 Dreamliner']
+HOTEL_BRANDS = ['Hilton', 'Marriott', 'Movenpick', 'Radisson Blu', 'Novotel', 'Crowne Plaza', 'Rotana', 'Hyatt']
+AMENITIES = ['Free WiFi', 'Pool', 'Gym', 'Spa', 'Restaurant', 'Parking', 'Room Service', 'Business Center']
+EVENT_CATEGORIES = ['Entertainment', 'Sports', 'Food & Culinary', 'Music', 'Culture', 'Exhibition']
+BOOKING_STATUSES = ['confirmed'] * 14 + ['pending'] * 2 + ['cancelled'] * 3 + ['refunded']
+PAYMENT_STATUS = {'confirmed': 'completed', 'cancelled': 'completed', 'refunded': 'refunded', 'pending': 'pending'}
+PAYMENT_METHODS = [choice for choice, _ in Booking.PAYMENT_METHOD_CHOICES]
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values set on the
+    instances instead of stamping every row with the current time."""
+    fields = [field for model in models for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def load(model, objects, batch_size=BATCH_SIZE):
+    """bulk_create objects batch by batch; returns the number of rows."""
+    count = 0
+    for batch in batches(objects, batch_size):
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        count += len(batch)
+    return count
+
+
+def after_bulk_load():
+    """Catch up on the per-row post_save work bulk_create skipped."""
+    places = set()
+    for model, fields in ((Flight, ('origin', 'destination')), (Hotel, ('city',)), (Event, ('city',))):
+        for field in fields:
+            places.update(model.objects.values_list(field, flat=True).distinct())
+        catalog_cache.invalidate(model)
+    register_places(places)
+    catalog_cache.invalidate(Deal)
+    invalidate_staff_stats()
+
+
+def _rng(seed, name):
+    return random.Random(f'{seed}:{name}')
+
+
+def _money(rng, low, high):
+    return Decimal(rng.randrange(low * 100, high * 100)) / 100
+
+
+def _usd(sar):
+    # The fixed default rate, so the rows don't depend on the ExchangeRate table
+    return pricing.convert(sar, 'USD', pricing.DEFAULT_RATES)
+
+
+def flights(count, seed, anchor):
+    rng = _rng(seed, 'flight')
+    for n in range(count):
+        origin, destination = rng.sample(CITIES, 2)
+        departure = anchor + timedelta(minutes=rng.randrange(-30 * 1440, 365 * 1440))
+        total = rng.choice((120, 150, 180, 250, 300))
+        price = _money(rng, 250, 4000)
+        yield Flight(
+            airline=rng.choice(AIRLINES), flight_number=f'{rng.choice("SXFEQG")}{rng.choice("VYDKRF")}{n % 10000:04d}',
+            origin=origin, destination=destination, departure_time=departure,
+            arrival_time=departure + timedelta(minutes=rng.randrange(60, 600)),
+            price_sar=price, price_usd=_usd(price), available_seats=rng.randrange(total + 1), total_seats=total,
+            aircraft_type=rng.choice(AIRCRAFT), baggage_allowance=rng.choice(('1 piece, 23kg', '2 pieces, 23kg each')),
+            created_at=anchor, updated_at=anchor,
+        )
+
+
+def hotels(count, seed, anchor):
+    rng = _rng(seed, 'hotel')
+    for n in range(count):
+        city = rng.choice(CITIES)
+        total = rng.randrange(40, 400)
+        price = _money(rng, 200, 3000)
+        yield Hotel(
+            name=f'{rng.choice(HOTEL_BRANDS)} {city} {n}', city=city, address=f'{rng.randrange(1, 9999)} King Fahd Road, {city}',
+            star_rating=rng.randint(1, 5), description=f'Synthetic hotel {n} in {city}.',
+            amenities=', '.join(rng.sample(AMENITIES, rng.randint(2, 6))),
+            price_per_night_sar=price, price_per_night_usd=_usd(price),
+            available_rooms=rng.randrange(1, total + 1), total_rooms=total,
+            check_in_time=time(rng.choice((14, 15))), check_out_time=time(12),
+            cancellation_policy='Free cancellation up to 24 hours before check-in.',
+            created_at=anchor, updated_at=anchor,
+        )
+
+
+def events(count, seed, anchor):
+    rng = _rng(seed, 'event')
+    for n in range(count):
+        city = rng.choice(CITIES)
+        category = rng.choice(EVENT_CATEGORIES)
+        total = rng.randrange(100, 20000)
+        price = _money(rng, 50, 1500)
+        yield Event(
+            name=f'{city} {category} {n}', category=category, venue=f'{city} Arena', city=city,
+            description=f'Synthetic {category.lower()} event {n}.',
+            event_date=anchor + timedelta(minutes=rng.randrange(-30 * 1440, 365 * 1440)),
+            duration_hours=Decimal(rng.randrange(10, 100)) / 10, price_sar=price, price_usd=_usd(price),
+            available_tickets=rng.randrange(total + 1), total_tickets=total, age_restriction=rng.choice(('', 'All ages', '12+', '18+')),
+            created_at=anchor, updated_at=anchor,
+        )
+
+
+def deals(count, seed, anchor):
+    rng = _rng(seed, 'deal')
+    # Targets come from their own stream, so the other columns stay as they were
+    targets = _rng(seed, 'deal-target')
+    for n in range(count):
+        discount = Decimal(rng.randrange(5, 70))
+        original = _money(rng, 200, 6000)
+        discounted = (original * (100 - discount) / 100).quantize(Decimal('0.01'))
+        valid_from = anchor + timedelta(days=rng.randrange(-60, 30))
+        deal_type = rng.choice([choice for choice, _ in Deal.DEAL_TYPE_CHOICES])
+        scope = targets.random()
+        route = targets.sample(CITIES, 2) if deal_type in ('flight', 'package') and scope < 0.3 else ('', '')
+        city = targets.choice(CITIES) if not route[0] and scope < 0.7 else ''
+        yield Deal(
+            title=f'Deal {n}: {discount}% off', description=f'Synthetic deal {n}.',
+            deal_type=deal_type, origin=route[0], destination=route[1], city=city, discount_percentage=discount,
+            original_price_sar=original, discounted_price_sar=discounted,
+            original_price_usd=_usd(original), discounted_price_usd=_usd(discounted),
+            valid_from=valid_from, valid_until=valid_from + timedelta(days=rng.randrange(1, 90)),
+            terms_conditions='Subject to availability.', created_at=anchor, updated_at=anchor,
+        )
+
+
+def username(seed, n):
+    return f'load{seed}_{n}'
+
+
+def users(count, seed, anchor):
+    rng = _rng(seed, 'user')
+    # A salt derived from the seed keeps the hash, like every other column, reproducible
+    password = make_password(SEED_PASSWORD, salt=f'bookmeload{seed}')
+    for n in range(count):
+        name = username(seed, n)
+        yield User(
+            username=name, email=f'{name}@load.bookme.sa', password=password, first_name=f'User{n}', last_name='Load',
+            date_joined=anchor - timedelta(minutes=rng.randrange(730 * 1440)),
+        )
+
+
+def profiles(user_ids, seed, anchor):
+    rng = _rng(seed, 'profile')
+    for user_id in user_ids:
+        yield UserProfile(
+            user_id=user_id, role='customer', phone=f'+9665{rng.randrange(10 ** 8):08d}',
+            preferred_language=rng.choice(('en', 'ar')), created_at=anchor, updated_at=anchor,
+        )
+
+
+def bookings(count, seed, anchor, user_ids, item_ids):
+    """Bookings spread over the year before anchor. item_ids maps each
+    booking_type with rows to a list of (id, unit price in SAR)."""
+    rng = _rng(seed, 'booking')
+    types = sorted(item_ids)
+    for n in range(count):
+        booking_type = rng.choice(types)
+        item_id, unit_price = rng.choice(item_ids[booking_type])
+        quantity = rng.randint(1, 4)
+        created = anchor - timedelta(seconds=rng.randrange(365 * 86400))
+        booking = Booking(
+            booking_reference=booking_reference(seed, n), user_id=rng.choice(user_ids), booking_type=booking_type,
+            quantity=quantity, total_price_sar=unit_price * quantity, total_price_usd=_usd(unit_price * quantity),
+            payment_method=rng.choice(PAYMENT_METHODS), status=rng.choice(BOOKING_STATUSES),
+            customer_name='Load Test', customer_email='load@bookme.sa', customer_phone='+966500000000',
+            created_at=created, updated_at=created,
+        )
+        booking.payment_status = PAYMENT_STATUS[booking.status]
+        setattr(booking, f'{booking_type}_id', item_id)
+        if booking_type == 'hotel':
+            booking.check_in_date = (created + timedelta(days=rng.randrange(1, 60))).date()
+            booking.check_out_date = booking.check_in_date + timedelta(days=rng.randint(1, 7))
+        yield booking
+
+
+def booking_reference(seed, n):
+    return f'L{seed}-{n}'
+
+
+def already_loaded(seed):
+    """Whether a run with seed has loaded users or bookings here."""
+    return (User.objects.filter(username=username(seed, 0)).exists()
+            or Booking.objects.filter(booking_reference=booking_reference(seed, 0)).exists())
+
+
+def payments(booking_batch):
+    """One payment for every booking in the batch that got past pending."""
+    for booking in booking_batch:
+        if booking.status == 'pending':
+            continue
+        yield Payment(
+            booking_id=booking.pk, transaction_id=f'TXN-{booking.booking_reference}',
+            amount_sar=booking.total_price_sar, amount_usd=booking.total_price_usd, currency='SAR',
+            payment_method=booking.payment_method, status=PAYMENT_STATUS[booking.status],
+            created_at=booking.created_at, updated_at=booking.created_at,
+        )
+
@@ -1,9 +1,18 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import (
     UserProfile, Flight, Hotel, Event, Booking,
     Payment, Refund, Deal, SupportTicket
 )
+from . import deals, pricing
+
+# Relations touched by the nested *_details fields below; viewsets pass these to
+# select_related so list endpoints join them instead of querying once per row.
+BOOKING_RELATED = ('user', 'flight', 'hotel', 'event')
+PAYMENT_RELATED = tuple(f'booking__{f}' for f in BOOKING_RELATED)
+REFUND_RELATED = PAYMENT_RELATED + tuple(f'payment__{f}' for f in PAYMENT_RELATED) + ('processed_by',)
+SUPPORT_TICKET_RELATED = ('user', 'assigned_to') + PAYMENT_RELATED
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -51,25 +60,101 @@ class RegisterSerializer(serializers.ModelSerializer):
         
         return user
 
-class FlightSerializer(serializers.ModelSerializer):
+def _query_list(request, name):
+    return {value.strip() for value in request.query_params.get(name, '').split(',') if value.strip()}
+
+class SparseFieldsMixin:
+    """Trim the top-level serializer of a GET request with ?fields=a,b.
+
+    Fields named in expandable_fields (nested *_details objects) are left out
+    unless requested by field name or source in ?expand= (or ?expand=all),
+    or named in ?fields=. Unknown ?fields= names are a 400.
+    """
+    expandable_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        root = self.root
+        is_root = self is root or (self.parent is root and isinstance(root, serializers.ListSerializer))
+        if request is None or request.method != 'GET' or not is_root:
+            return fields
+        wanted = _query_list(request, 'fields')
+        expand = _query_list(request, 'expand')
+        unknown = wanted - set(fields)
+        if unknown:
+            raise serializers.ValidationError({'error': f'Unknown fields: {", ".join(sorted(unknown))}'})
+        for name, field in list(fields.items()):
+            if wanted and name not in wanted:
+                del fields[name]
+            elif name in self.expandable_fields and name not in wanted and not expand & {name, field.source, 'all'}:
+                del fields[name]
+        return fields
+
+class DerivedUsdPricesMixin:
+    """Fill USD price columns left out of a write from their SAR column and
+    the current exchange rate, so staff only have to maintain SAR prices."""
+    usd_prices = {}
+
+    def get_extra_kwargs(self):
+        extra_kwargs = super().get_extra_kwargs()
+        for usd_field in self.usd_prices:
+            extra_kwargs.setdefault(usd_field, {})['required'] = False
+        return extra_kwargs
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        for usd_field, sar_field in self.usd_prices.items():
+            if attrs.get(usd_field) is None and attrs.get(sar_field) is not None:
+                attrs[usd_field] = pricing.convert(attrs[sar_field], 'USD')
+        return attrs
+
+class FlightSerializer(SparseFieldsMixin, DerivedUsdPricesMixin, serializers.ModelSerializer):
+    usd_prices = {'price_usd': 'price_sar'}
+    
     class Meta:
         model = Flight
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class HotelSerializer(serializers.ModelSerializer):
+class HotelSerializer(SparseFieldsMixin, DerivedUsdPricesMixin, serializers.ModelSerializer):
+    usd_prices = {'price_per_night_usd': 'price_per_night_sar'}
+    
     class Meta:
         model = Hotel
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, DerivedUsdPricesMixin, serializers.ModelSerializer):
+    usd_prices = {'price_usd': 'price_sar'}
+    
     class Meta:
         model = Event
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class BookingSerializer(serializers.ModelSerializer):
+class LoadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField that looks ids up in context['related']
+    ({model: {pk: row}}, see pricing.related_objects) when the caller has
+    loaded them in bulk, rather than with one query per field and item."""
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        loaded = self.context.get('related', {}).get(queryset.model)
+        if loaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = queryset.model._meta.pk.to_python(data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in loaded:
+            self.fail('does_not_exist', pk_value=data)
+        return loaded[pk]
+
+class BookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    serializer_related_field = LoadedPrimaryKeyRelatedField
     user_details = UserSerializer(source='user', read_only=True)
     flight_details = FlightSerializer(source='flight', read_only=True)
     hotel_details = HotelSerializer(source='hotel', read_only=True)
@@ -78,7 +163,56 @@ class BookingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Booking
         fields = '__all__'
-        read_only_fields = ['id', 'booking_reference', 'created_at', 'updated_at', 'user']
+        # Totals are computed by api.pricing, never taken from the client
+        read_only_fields = ['id', 'booking_reference', 'created_at', 'updated_at', 'user', 'total_price_sar', 'total_price_usd',
+                            'holds_inventory']
+
+class BestDealField(serializers.Field):
+    """The item's best current deal (api.deals.best_deal), or null. Reads
+    only row_columns, so the fast list path can render it from .values()."""
+
+    def __init__(self, booking_type, **kwargs):
+        self.booking_type = booking_type
+        self.row_columns = deals.ROW_COLUMNS[booking_type]
+        super().__init__(source='*', read_only=True, **kwargs)
+
+    def to_representation(self, instance):
+        return self.row_representation(deals.item_row(self.booking_type, instance))
+
+    def row_representation(self, row):
+        return deals.best_deal(self.booking_type, row)
+
+# Compact list variants: no long text columns and no nested objects unless
+# expanded, so list pages only fetch and ship what a card/table row shows.
+
+class FlightListSerializer(FlightSerializer):
+    best_deal = BestDealField('flight')
+    
+    class Meta(FlightSerializer.Meta):
+        fields = ['id', 'airline', 'flight_number', 'origin', 'destination', 'departure_time', 'arrival_time',
+                  'price_sar', 'price_usd', 'available_seats', 'total_seats', 'aircraft_type', 'baggage_allowance', 'is_active',
+                  'best_deal']
+
+class HotelListSerializer(HotelSerializer):
+    best_deal = BestDealField('hotel')
+    # Long text: only sent when named in ?fields= or ?expand=
+    expandable_fields = ('description',)
+    
+    class Meta(HotelSerializer.Meta):
+        fields = ['id', 'name', 'city', 'star_rating', 'description', 'amenities', 'price_per_night_sar', 'price_per_night_usd',
+                  'available_rooms', 'total_rooms', 'check_in_time', 'check_out_time', 'is_active', 'best_deal']
+
+class EventListSerializer(EventSerializer):
+    best_deal = BestDealField('event')
+    # Long text: only sent when named in ?fields= or ?expand=
+    expandable_fields = ('description',)
+    
+    class Meta(EventSerializer.Meta):
+        fields = ['id', 'name', 'category', 'venue', 'city', 'event_date', 'duration_hours', 'description', 'price_sar', 'price_usd',
+                  'available_tickets', 'total_tickets', 'age_restriction', 'is_active', 'best_deal']
+
+class BookingListSerializer(BookingSerializer):
+    expandable_fields = ('user_details', 'flight_details', 'hotel_details', 'event_details')
 
 class PaymentSerializer(serializers.ModelSerializer):
     booking_details = BookingSerializer(source='booking', read_only=True)
@@ -98,11 +232,33 @@ class RefundSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class DealSerializer(serializers.ModelSerializer):
+class DealSerializer(DerivedUsdPricesMixin, serializers.ModelSerializer):
+    usd_prices = {'original_price_usd': 'original_price_sar', 'discounted_price_usd': 'discounted_price_sar'}
+    
     class Meta:
         model = Deal
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        
+        def value(name):
+            return attrs[name] if name in attrs else getattr(self.instance, name, None)
+        
+        deal_type = value('deal_type')
+        items = [booking_type for booking_type in deals.BOOKING_TYPES if value(booking_type)]
+        route = value('origin') or value('destination')
+        if len(items) + bool(route) + bool(value('city')) > 1:
+            raise serializers.ValidationError('A deal applies to one flight, hotel or event, one route or one city')
+        for booking_type in items:
+            if deal_type not in (booking_type, 'package'):
+                raise serializers.ValidationError(f'A {deal_type} deal cannot apply to a {booking_type}')
+        if route and deal_type not in ('flight', 'package'):
+            raise serializers.ValidationError('Only flight and package deals can apply to a route')
+        if value('valid_from') and value('valid_until') and value('valid_until') < value('valid_from'):
+            raise serializers.ValidationError('valid_until must not be before valid_from')
+        return attrs
 
 class SupportTicketSerializer(serializers.ModelSerializer):
     user_details = UserSerializer(source='user', read_only=True)
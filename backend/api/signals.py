@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+
+from . import catalog_cache, pricing
+from .authentication import invalidate_user
+from .models import Flight, Hotel, Event, Deal, ExchangeRate, UserProfile
+from .search import register_places
+from .stats import STAFF_STATS_MODELS, invalidate_staff_stats
+
+
+def staff_stats_changed(sender, **kwargs):
+    invalidate_staff_stats()
+
+
+for model in STAFF_STATS_MODELS:
+    post_save.connect(staff_stats_changed, sender=model, dispatch_uid=f'staff_stats_save_{model.__name__}')
+    post_delete.connect(staff_stats_changed, sender=model, dispatch_uid=f'staff_stats_delete_{model.__name__}')
+
+
+def flight_saved(sender, instance, **kwargs):
+    register_places([instance.origin, instance.destination])
+
+
+def city_saved(sender, instance, **kwargs):
+    register_places([instance.city])
+
+
+post_save.connect(flight_saved, sender=Flight, dispatch_uid='place_search_flight')
+post_save.connect(city_saved, sender=Hotel, dispatch_uid='place_search_hotel')
+post_save.connect(city_saved, sender=Event, dispatch_uid='place_search_event')
+
+
+def catalog_changed(sender, **kwargs):
+    catalog_cache.invalidate(sender)
+
+
+for model in (Flight, Hotel, Event, Deal):
+    post_save.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_cache_save_{model.__name__}')
+    post_delete.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_cache_delete_{model.__name__}')
+
+
+def exchange_rate_changed(sender, **kwargs):
+    pricing.invalidate_exchange_rates()
+
+
+post_save.connect(exchange_rate_changed, sender=ExchangeRate, dispatch_uid='exchange_rates_save')
+post_delete.connect(exchange_rate_changed, sender=ExchangeRate, dispatch_uid='exchange_rates_delete')
+
+
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+def profile_changed(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+post_save.connect(user_changed, sender=User, dispatch_uid='auth_user_save')
+post_delete.connect(user_changed, sender=User, dispatch_uid='auth_user_delete')
+post_save.connect(profile_changed, sender=UserProfile, dispatch_uid='auth_profile_save')
+post_delete.connect(profile_changed, sender=UserProfile, dispatch_uid='auth_profile_delete')
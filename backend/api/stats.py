@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from bookme import routers
+
+from .models import Flight, Hotel, Event, Booking, Payment, Deal, SupportTicket, ArchivedBooking
+from .serializers import BookingSerializer, BOOKING_RELATED
+
+STAFF_STATS_CACHE_KEY = 'dashboard_stats:staff'
+
+# Models whose rows feed the staff dashboard payload, plus Payment, which
+# changes together with the bookings' payment state; saving or deleting any of
+# them drops the cached copy (see api.signals).
+STAFF_STATS_MODELS = (Booking, Payment, Flight, Hotel, Event, User, SupportTicket, Deal)
+
+
+def booking_totals(bookings):
+    """Counts and confirmed revenue for a Booking queryset in one query."""
+    return bookings.aggregate(
+        total=Count('id'),
+        confirmed=Count('id', filter=Q(status='confirmed')),
+        pending=Count('id', filter=Q(status='pending')),
+        cancelled=Count('id', filter=Q(status='cancelled')),
+        revenue=Sum('total_price_sar', filter=Q(status='confirmed')),
+    )
+
+
+def all_booking_totals(**filters):
+    """booking_totals() over live and archived bookings together."""
+    live = booking_totals(Booking.objects.filter(**filters))
+    archived = booking_totals(ArchivedBooking.objects.filter(**filters))
+    return {key: (live[key] or 0) + (archived[key] or 0) for key in live}
+
+
+def customer_stats(user):
+    my_bookings = Booking.objects.filter(user=user)
+    totals = all_booking_totals(user=user)
+    return {
+        'totalBookings': totals['total'],
+        'confirmedBookings': totals['confirmed'],
+        'pendingBookings': totals['pending'],
+        'totalSpent': float(totals['revenue'] or 0),
+        'recentBookings': BookingSerializer(my_bookings.select_related(*BOOKING_RELATED).order_by('-created_at')[:5], many=True).data
+    }
+
+
+def compute_staff_stats():
+    totals = all_booking_totals()
+    return {
+        'totalBookings': totals['total'],
+        'confirmedBookings': totals['confirmed'],
+        'pendingBookings': totals['pending'],
+        'cancelledBookings': totals['cancelled'],
+        'totalRevenue': float(totals['revenue'] or 0),
+        'totalFlights': Flight.objects.filter(is_active=True).count(),
+        'totalHotels': Hotel.objects.filter(is_active=True).count(),
+        'totalEvents': Event.objects.filter(is_active=True).count(),
+        'totalUsers': User.objects.count(),
+        'openSupportTickets': SupportTicket.objects.filter(status='open').count(),
+        'activeDeals': Deal.objects.filter(is_active=True).count(),
+        'recentBookings': BookingSerializer(Booking.objects.select_related(*BOOKING_RELATED).order_by('-created_at')[:10], many=True).data
+    }
+
+
+def staff_stats():
+    """Staff dashboard payload, served from the cache until a source row changes."""
+    stats = cache.get(STAFF_STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_staff_stats()
+        cache.set(STAFF_STATS_CACHE_KEY, stats, settings.DASHBOARD_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_staff_stats():
+    cache.delete(STAFF_STATS_CACHE_KEY)
+    routers.pin(STAFF_STATS_CACHE_KEY)
@@ -0,0 +1,87 @@
+"""Helpers for the api tests (api/tests): query-count assertions and row factories."""
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import UserProfile, Flight, Hotel, Event
+
+
+@contextmanager
+def assert_num_queries(expected, using=connection):
+    """Fail if the wrapped block runs a different number of SQL queries."""
+    with CaptureQueriesContext(using) as context:
+        yield context
+    executed = len(context.captured_queries)
+    if executed != expected:
+        queries = '\n'.join(q['sql'] for q in context.captured_queries)
+        raise AssertionError(f'{executed} queries executed, {expected} expected:\n{queries}')
+
+
+def assert_constant_queries(request, page_sizes=(1, 10, 50), using=connection):
+    """Call request(page_size) for each page size and check they all run the
+    same number of queries, i.e. the endpoint has no per-row lookups.
+
+    Returns that query count.
+    """
+    counts = {}
+    for page_size in page_sizes:
+        with CaptureQueriesContext(using) as context:
+            request(page_size)
+        counts[page_size] = len(context.captured_queries)
+    if len(set(counts.values())) != 1:
+        raise AssertionError(f'Query count grows with page size: {counts}')
+    return counts[page_sizes[0]]
+
+
+def make_user(username, role='customer', **kwargs):
+    user = User.objects.create_user(username=username, email=f'{username}@example.com', password='password123', **kwargs)
+    UserProfile.objects.create(user=user, role=role)
+    return user
+
+
+def make_flight(**kwargs):
+    departure = kwargs.pop('departure_time', timezone.now() + timedelta(days=7))
+    values = dict(
+        airline='Saudia', flight_number='SV1020', origin='Riyadh', destination='Jeddah',
+        departure_time=departure, arrival_time=departure + timedelta(hours=2),
+        price_sar=450, price_usd=120, available_seats=10, total_seats=10,
+        aircraft_type='Airbus A320', baggage_allowance='23kg',
+    )
+    values.update(kwargs)
+    return Flight.objects.create(**values)
+
+
+def make_hotel(**kwargs):
+    values = dict(
+        name='Test Hotel', city='Jeddah', address='Corniche Road', star_rating=4, description='',
+        amenities='Free WiFi', price_per_night_sar=500, price_per_night_usd=133, available_rooms=5,
+        total_rooms=5, check_in_time='14:00', check_out_time='12:00', cancellation_policy='Free cancellation',
+    )
+    values.update(kwargs)
+    return Hotel.objects.create(**values)
+
+
+def make_event(**kwargs):
+    values = dict(
+        name='Test Event', category='Music', venue='Boulevard', city='Riyadh', description='',
+        event_date=timezone.now() + timedelta(days=14), duration_hours=3, price_sar=200, price_usd=53,
+        available_tickets=20, total_tickets=20,
+    )
+    values.update(kwargs)
+    return Event.objects.create(**values)
+
+
+def booking_data(item, quantity=1, **kwargs):
+    """POST body for a booking of a flight, hotel or event."""
+    booking_type = item._meta.model_name
+    data = {
+        'booking_type': booking_type, booking_type: item.pk, 'quantity': quantity,
+        'payment_method': 'card', 'customer_name': 'Test Customer',
+        'customer_email': 'customer@example.com', 'customer_phone': '0500000000',
+    }
+    data.update(kwargs)
+    return data
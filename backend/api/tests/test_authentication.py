@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.authentication import JWTProfileAuthentication
+from api.testing import assert_num_queries, make_user
+from api.views import IsAdminOrStaff
+
+
+class JWTProfileAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user('staff', role='staff')
+        self.bearer = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+
+    def authenticate(self):
+        request = Request(APIRequestFactory().get('/', HTTP_AUTHORIZATION=self.bearer),
+                          authenticators=[JWTProfileAuthentication()])
+        self.assertTrue(request.user.is_authenticated)
+        return request
+
+    def allowed(self, request):
+        return IsAdminOrStaff().has_permission(request, None)
+
+    def test_permission_check_runs_no_queries(self):
+        with assert_num_queries(1):
+            self.assertTrue(self.allowed(self.authenticate()))
+        with assert_num_queries(0):
+            self.assertTrue(self.allowed(self.authenticate()))
+
+    def test_role_change_applies_on_the_next_request(self):
+        self.assertTrue(self.allowed(self.authenticate()))
+        self.user.profile.role = 'customer'
+        self.user.profile.save()
+        self.assertFalse(self.allowed(self.authenticate()))
+
+    def test_deactivation_applies_on_the_next_request(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_is_rejected(self):
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
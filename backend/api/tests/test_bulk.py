@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import Booking, Flight, HotelNight
+from api.testing import assert_constant_queries, booking_data, make_event, make_flight, make_hotel, make_user
+
+
+class BulkBookingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('customer'))
+
+    def bulk(self, items):
+        return self.client.post('/api/bookings/bulk/', {'bookings': items}, format='json')
+
+    def test_query_count_does_not_grow_with_items(self):
+        flight = make_flight(available_seats=500, total_seats=500)
+        hotel = make_hotel(available_rooms=500)
+        event = make_event(available_tickets=500, total_tickets=500)
+        check_in = date.today() + timedelta(days=10)
+        stay = {'check_in_date': str(check_in), 'check_out_date': str(check_in + timedelta(days=2))}
+        mix = [booking_data(flight), booking_data(hotel, **stay), booking_data(event)]
+
+        def request(count):
+            response = self.bulk([mix[i % 3] for i in range(count)])
+            self.assertEqual(response.json()['created'], count)
+
+        request(3)  # fills the exchange rate cache
+        # 30 keeps the bookings INSERT within one SQLite batch
+        assert_constant_queries(request, (3, 12, 30))
+        self.assertEqual(Flight.objects.get(pk=flight.pk).available_seats, 500 - 16)
+        self.assertEqual(set(HotelNight.objects.values_list('rooms_booked', flat=True)), {16})
+
+    def test_items_past_the_last_seat_fail(self):
+        flight = make_flight(available_seats=3)
+        response = self.bulk([booking_data(flight)] * 5)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.json()['results']], ['created'] * 3 + ['failed'] * 2)
+        self.assertEqual(Flight.objects.get(pk=flight.pk).available_seats, 0)
+
+    def test_rooms_run_out_per_night(self):
+        hotel = make_hotel(available_rooms=2)
+        check_in = date.today() + timedelta(days=10)
+        night = lambda offset, nights: {'check_in_date': str(check_in + timedelta(days=offset)),
+                                        'check_out_date': str(check_in + timedelta(days=offset + nights))}
+        response = self.bulk([booking_data(hotel, **night(0, 2)), booking_data(hotel, **night(1, 2)),
+                              booking_data(hotel, **night(1, 1)), booking_data(hotel, **night(2, 1))])
+        self.assertEqual([result['status'] for result in response.json()['results']],
+                         ['created', 'created', 'failed', 'created'])
+        self.assertEqual(dict(HotelNight.objects.values_list('date', 'rooms_booked')),
+                         {check_in: 1, check_in + timedelta(days=1): 2, check_in + timedelta(days=2): 2})
+
+    def test_unknown_item_fails_validation(self):
+        flight = make_flight()
+        response = self.bulk([booking_data(flight), {**booking_data(flight), 'flight': 999999}])
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], ['created', 'failed'])
+        self.assertIn('flight', results[1]['details'])
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_client_state_is_overridden(self):
+        flight = make_flight()
+        item = booking_data(flight, status='cancelled', payment_status='failed', ticket_issued=False)
+        response = self.bulk([item])
+        self.assertEqual(response.status_code, 201)
+        booking = Booking.objects.get()
+        self.assertEqual((booking.status, booking.payment_status, booking.ticket_issued), ('confirmed', 'completed', True))
+        self.assertTrue(booking.holds_inventory)
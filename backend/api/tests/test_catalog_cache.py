@@ -0,0 +1,30 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import Flight
+from api.testing import make_flight
+
+
+class ConditionalCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.flight = make_flight()
+
+    def test_etag_match_is_not_modified(self):
+        response = self.client.get('/api/flights/')
+        self.assertEqual(response.status_code, 200)
+        again = self.client.get('/api/flights/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_write_in_the_same_second_is_not_hidden_by_if_modified_since(self):
+        response = self.client.get('/api/flights/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Flight.objects.filter(pk=self.flight.pk).update(price_sar=999)
+            self.flight.save(update_fields=['updated_at'])
+        again = self.client.get('/api/flights/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(again.status_code, 200)
+        self.assertNotEqual(again['ETag'], response['ETag'])
+        stale = self.client.get('/api/flights/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(stale.status_code, 200)
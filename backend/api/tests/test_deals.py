@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Deal
+from api.testing import booking_data, make_flight, make_hotel, make_user
+
+
+def make_deal(**kwargs):
+    now = timezone.now()
+    values = dict(
+        title='Deal', description='', discount_percentage=10, original_price_sar=100, discounted_price_sar=90,
+        original_price_usd=27, discounted_price_usd=24, valid_from=now - timedelta(days=1),
+        valid_until=now + timedelta(days=1), terms_conditions='',
+    )
+    values.update(kwargs)
+    return Deal.objects.create(**values)
+
+
+class DealTargetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.flight = make_flight(destination='Jeddah')
+        self.hotel = make_hotel(city='Jeddah')
+        self.untargeted = make_deal(deal_type='flight', discount_percentage=50)
+        self.city = make_deal(deal_type='hotel', city='jeddah ', discount_percentage=20)
+
+    def best_deal(self, endpoint):
+        return self.client.get(endpoint).json()['results'][0]['best_deal']
+
+    def test_untargeted_deals_are_not_an_items_best_deal(self):
+        self.assertIsNone(self.best_deal('/api/flights/'))
+        self.assertEqual(self.best_deal('/api/hotels/')['id'], self.city.pk)
+
+    def test_untargeted_deal_can_be_quoted_for_its_type_only(self):
+        self.client.force_authenticate(make_user('customer'))
+        check_in = date.today() + timedelta(days=3)
+        stay = {'check_in_date': str(check_in), 'check_out_date': str(check_in + timedelta(days=1))}
+        items = [booking_data(self.flight, deal=self.untargeted.pk),
+                 booking_data(self.hotel, deal=self.untargeted.pk, **stay)]
+        results = self.client.post('/api/pricing/quote/', {'items': items}, format='json').json()['items']
+        self.assertEqual(results[0]['discount_sar'], '225.00')
+        self.assertIn('error', results[1])
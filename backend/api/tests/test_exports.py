@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api import maintenance
+from api.models import ArchivedBooking, Booking
+from api.testing import booking_data, make_flight, make_user
+
+
+class BookingExportTests(TestCase):
+    def setUp(self):
+        customer = APIClient()
+        customer.force_authenticate(make_user('customer'))
+        flight = make_flight()
+        first = customer.post('/api/bookings/', booking_data(flight), format='json').json()['id']
+        customer.post(f'/api/bookings/{first}/cancel/')
+        Booking.objects.filter(pk=first).update(created_at=timezone.now() - timedelta(days=2))
+        self.archived = Booking.objects.get(pk=first).booking_reference
+        self.live = customer.post('/api/bookings/', booking_data(flight), format='json').json()['booking_reference']
+        maintenance.archive(timezone.now() - timedelta(days=1))
+        self.assertTrue(ArchivedBooking.objects.exists())
+
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('staff', role='staff'))
+
+    def export(self, **params):
+        response = self.client.get('/api/bookings/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_includes_archived_rows_oldest_first(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        self.assertEqual(
+            [(row['booking_reference'], row['archived']) for row in rows],
+            [(self.archived, True), (self.live, False)],
+        )
+
+    def test_csv_has_archived_column_and_filters_both_tables(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(output='csv', status='cancelled'))))
+        self.assertEqual([(row['booking_reference'], row['archived']) for row in rows], [(self.archived, 'True')])
+
+    def test_bad_status_is_rejected(self):
+        response = self.client.get('/api/bookings/export/', {'status': 'lost'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def test_csv_escapes_formulas_but_ndjson_keeps_raw_text(self):
+        Booking.objects.update(customer_name='=HYPERLINK("http://example.com")', customer_phone='+966500000000')
+        row = list(csv.DictReader(io.StringIO(self.export(output='csv', status='confirmed'))))[0]
+        self.assertEqual(row['customer_name'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row['customer_phone'], "'+966500000000")
+        self.assertEqual(row['total_price_sar'], '450.00')
+        raw = json.loads(self.export(status='confirmed'))
+        self.assertEqual(raw['customer_name'], '=HYPERLINK("http://example.com")')
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import fast_json
+from api.testing import make_event, make_flight, make_hotel
+
+
+class ClearedDict(dict):
+    """Emptied straight after every store, as by a concurrent request."""
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.clear()
+
+
+class FastListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for number in range(3):
+            make_flight(flight_number=f'SV10{number}')
+
+    def flights(self, **settings):
+        cache.clear()
+        with override_settings(**settings):
+            response = self.client.get('/api/flights/', {'fields': 'id,flight_number,price_sar,departure_time'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_matches_serializer_output(self):
+        self.assertEqual(self.flights(FAST_LIST_RENDERING=True), self.flights(FAST_LIST_RENDERING=False))
+
+    def test_plan_cleared_by_another_request(self):
+        expected = self.flights(FAST_LIST_RENDERING=False)
+        with mock.patch.object(fast_json, '_plans', ClearedDict()):
+            self.assertEqual(self.flights(FAST_LIST_RENDERING=True), expected)
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        make_hotel(description='Sea view rooms near the corniche.')
+        make_event(description='Season opener.')
+
+    def test_list_pages_can_ask_for_descriptions(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(FAST_LIST_RENDERING=fast):
+                cache.clear()
+                hotel = self.client.get('/api/hotels/', {'fields': 'id,name,description'}).json()['results'][0]
+                event = self.client.get('/api/events/', {'fields': 'id,description'}).json()['results'][0]
+                self.assertEqual(hotel['description'], 'Sea view rooms near the corniche.')
+                self.assertEqual(set(event), {'id', 'description'})
+                self.assertNotIn('description', self.client.get('/api/hotels/').json()['results'][0])
+
+    def test_unknown_field_is_rejected(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(FAST_LIST_RENDERING=fast):
+                cache.clear()
+                response = self.client.get('/api/hotels/', {'fields': 'id,nope'})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Unknown fields: nope'})
@@ -0,0 +1,29 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from api import ids
+
+
+class IdGeneratorTests(SimpleTestCase):
+    def setUp(self):
+        cache.delete(ids.NODE_COUNTER_KEY)
+
+    def test_processes_get_distinct_nodes_from_the_cache(self):
+        first, second = ids.IdGenerator(), ids.IdGenerator()
+        first.next_int()
+        second.next_int()
+        self.assertEqual(second.node, (first.node + 1) & ids.NODE_MASK)
+
+    def test_forked_child_allocates_a_new_node(self):
+        generator = ids.IdGenerator()
+        generator.next_int()
+        parent_node = generator.node
+        generator.reseed()
+        generator.next_int()
+        self.assertNotEqual(generator.node, parent_node)
+
+    def test_ids_are_unique_and_increasing(self):
+        generator = ids.IdGenerator(node=7)
+        values = [generator.next_int() for _ in range(10000)]
+        self.assertEqual(values, sorted(set(values)))
+        self.assertEqual({(value >> ids.SEQUENCE_BITS) & ids.NODE_MASK for value in values}, {7})
@@ -0,0 +1,159 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api import inventory
+from api.models import Booking, Flight, HotelNight
+from api.testing import booking_data, make_flight, make_hotel, make_user
+
+
+class BookingInventoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user('customer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def book(self, item, quantity=1, **kwargs):
+        return self.client.post('/api/bookings/', booking_data(item, quantity, **kwargs), format='json')
+
+    def seats(self, flight):
+        return Flight.objects.get(pk=flight.pk).available_seats
+
+    def test_booking_takes_seats_and_cancel_returns_them(self):
+        flight = make_flight(available_seats=5)
+        response = self.book(flight, 2)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.seats(flight), 3)
+
+        booking_id = response.json()['id']
+        self.assertEqual(self.client.post(f'/api/bookings/{booking_id}/cancel/').status_code, 200)
+        self.assertEqual(self.seats(flight), 5)
+        self.assertEqual(self.client.post(f'/api/bookings/{booking_id}/cancel/').status_code, 400)
+        self.assertEqual(self.seats(flight), 5)
+
+    def test_cannot_oversell(self):
+        flight = make_flight(available_seats=2)
+        self.assertEqual(self.book(flight, 3).status_code, 409)
+        self.assertEqual(self.seats(flight), 2)
+        self.assertFalse(Booking.objects.exists())
+
+    def test_bookings_cannot_be_edited_or_deleted(self):
+        flight = make_flight(available_seats=5)
+        booking_id = self.book(flight, 2).json()['id']
+        url = f'/api/bookings/{booking_id}/'
+        self.assertEqual(self.client.patch(url, {'quantity': 50}, format='json').status_code, 405)
+        self.assertEqual(self.client.patch(url, {'status': 'cancelled'}, format='json').status_code, 405)
+        self.assertEqual(self.client.put(url, booking_data(flight, 50), format='json').status_code, 405)
+        self.assertEqual(self.client.delete(url).status_code, 405)
+        booking = Booking.objects.get(pk=booking_id)
+        self.assertEqual((booking.quantity, booking.status), (2, 'confirmed'))
+        self.assertEqual(self.seats(flight), 3)
+
+    def test_booking_records_its_hold(self):
+        booking_id = self.book(make_flight(), 2).json()['id']
+        self.assertTrue(Booking.objects.get(pk=booking_id).holds_inventory)
+        self.client.post(f'/api/bookings/{booking_id}/cancel/')
+        self.assertFalse(Booking.objects.get(pk=booking_id).holds_inventory)
+
+    def test_hotel_rooms_are_held_per_night(self):
+        hotel = make_hotel(available_rooms=1)
+        check_in = date.today() + timedelta(days=10)
+        stay = {'check_in_date': str(check_in), 'check_out_date': str(check_in + timedelta(days=2))}
+        self.assertEqual(self.book(hotel, **stay).status_code, 201)
+        self.assertEqual(self.book(hotel, **stay).status_code, 409)
+        later = {'check_in_date': stay['check_out_date'], 'check_out_date': str(check_in + timedelta(days=3))}
+        self.assertEqual(self.book(hotel, **later).status_code, 201)
+        self.assertEqual(HotelNight.objects.filter(hotel=hotel, rooms_booked=1).count(), 3)
+
+
+class ReleaseBoundsTests(TestCase):
+    """Releases never push a counter past the item's capacity or a night below zero rooms."""
+
+    def setUp(self):
+        self.user = make_user('customer')
+
+    def booking(self, **kwargs):
+        return Booking.objects.create(
+            user=self.user, quantity=3, total_price_sar=100, total_price_usd=27, payment_method='card',
+            status='confirmed', customer_name='Test', customer_email='test@example.com',
+            customer_phone='0500000000', holds_inventory=True, **kwargs,
+        )
+
+    def test_counter_stops_at_capacity(self):
+        flight = make_flight(available_seats=9, total_seats=10)
+        inventory.release(self.booking(booking_type='flight', flight=flight), 'cancelled')
+        self.assertEqual(Flight.objects.get(pk=flight.pk).available_seats, 10)
+
+    def test_nights_stop_at_zero(self):
+        hotel = make_hotel()
+        check_in = date.today() + timedelta(days=5)
+        HotelNight.objects.create(hotel=hotel, date=check_in, rooms_booked=1)
+        booking = self.booking(booking_type='hotel', hotel=hotel, check_in_date=check_in, check_out_date=check_in + timedelta(days=1))
+        inventory.release(booking, 'cancelled')
+        self.assertEqual(HotelNight.objects.get(hotel=hotel).rooms_booked, 0)
+
+    def test_booking_without_hold_releases_nothing(self):
+        flight = make_flight(available_seats=5, total_seats=10)
+        booking = self.booking(booking_type='flight', flight=flight)
+        Booking.objects.filter(pk=booking.pk).update(holds_inventory=False)
+        booking.refresh_from_db()
+        self.assertTrue(inventory.release(booking, 'cancelled'))
+        self.assertEqual(Flight.objects.get(pk=flight.pk).available_seats, 5)
+        self.assertEqual(Booking.objects.get(pk=booking.pk).status, 'cancelled')
+
+
+class HotelAvailabilityFilterTests(TestCase):
+    """?check_in/?check_out/?rooms on the hotel list: a hotel is listed when
+    every night from check-in up to (not including) check-out has room."""
+
+    def setUp(self):
+        cache.clear()
+        self.night = date.today() + timedelta(days=10)
+        self.hotel = make_hotel(available_rooms=2, total_rooms=2)
+        # Two rooms, both taken on the one night self.night.
+        HotelNight.objects.create(hotel=self.hotel, date=self.night, rooms_booked=2)
+
+    def search(self, check_in, check_out, **params):
+        params.update(check_in=str(check_in), check_out=str(check_out))
+        return self.client.get('/api/hotels/', params)
+
+    def listed(self, check_in, check_out, **params):
+        response = self.search(check_in, check_out, **params)
+        self.assertEqual(response.status_code, 200)
+        return [hotel['id'] for hotel in response.json()['results']] == [self.hotel.pk]
+
+    def test_stays_overlapping_a_full_night_are_excluded(self):
+        day = timedelta(days=1)
+        self.assertFalse(self.listed(self.night, self.night + day))
+        self.assertFalse(self.listed(self.night - 2 * day, self.night + day))
+        self.assertFalse(self.listed(self.night, self.night + 3 * day))
+
+    def test_check_out_on_a_full_night_is_available(self):
+        self.assertTrue(self.listed(self.night - timedelta(days=2), self.night))
+        self.assertTrue(self.listed(self.night + timedelta(days=1), self.night + timedelta(days=3)))
+
+    def test_rooms_counts_against_the_free_rooms(self):
+        HotelNight.objects.filter(hotel=self.hotel).update(rooms_booked=1)
+        stay = (self.night, self.night + timedelta(days=1))
+        self.assertTrue(self.listed(*stay, rooms=1))
+        self.assertFalse(self.listed(*stay, rooms=2))
+        self.assertTrue(self.listed(self.night + timedelta(days=1), self.night + timedelta(days=2), rooms=2))
+        self.assertFalse(self.listed(self.night + timedelta(days=1), self.night + timedelta(days=2), rooms=3))
+
+    def test_bad_dates_are_rejected(self):
+        check_in = self.night + timedelta(days=5)
+        for check_out, params in [
+            ('not-a-date', {}),
+            (check_in - timedelta(days=1), {}),
+            (check_in, {}),
+            (check_in + timedelta(days=inventory.MAX_STAY_NIGHTS + 1), {}),
+            (check_in + timedelta(days=1), {'rooms': 0}),
+            (check_in + timedelta(days=1), {'rooms': 'two'}),
+        ]:
+            response = self.search(check_in, check_out, **params)
+            self.assertEqual(response.status_code, 400, (check_out, params))
+            self.assertIn('error', response.json())
+        self.assertEqual(self.client.get('/api/hotels/', {'check_in': str(check_in)}).status_code, 400)
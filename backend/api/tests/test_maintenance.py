@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api import maintenance
+from api.bookings import new_payment
+from api.models import ArchivedBooking, Booking, Flight
+from api.testing import make_flight, make_user
+
+
+class ExpirePendingTests(TestCase):
+    def setUp(self):
+        self.user = make_user('customer')
+        self.flight = make_flight(available_seats=6, total_seats=10)
+
+    def booking(self, **kwargs):
+        booking = Booking.objects.create(
+            user=self.user, booking_type='flight', flight=self.flight, quantity=2, total_price_sar=900,
+            total_price_usd=240, payment_method='card', customer_name='Test', customer_email='test@example.com',
+            customer_phone='0500000000', **kwargs,
+        )
+        payment = new_payment(booking)
+        payment.status = 'pending'
+        payment.save()
+        return booking
+
+    def seats(self):
+        return Flight.objects.get(pk=self.flight.pk).available_seats
+
+    def expire(self):
+        return maintenance.expire_pending(timezone.now() + timedelta(seconds=1))
+
+    def test_pending_booking_without_hold_releases_nothing(self):
+        booking = self.booking()
+        self.assertEqual(self.expire(), 1)
+        booking.refresh_from_db()
+        self.assertEqual((booking.status, booking.payment_status), ('expired', 'failed'))
+        self.assertEqual(booking.payments.get().status, 'failed')
+        self.assertEqual(self.seats(), 6)
+
+    def test_pending_booking_with_hold_releases_it_once(self):
+        booking = self.booking(holds_inventory=True)
+        self.assertEqual(self.expire(), 1)
+        self.assertEqual(self.seats(), 8)
+        booking.refresh_from_db()
+        self.assertFalse(booking.holds_inventory)
+        self.assertEqual(self.expire(), 0)
+        self.assertEqual(self.seats(), 8)
+
+    def test_recent_and_confirmed_bookings_are_kept(self):
+        self.booking(status='confirmed', holds_inventory=True)
+        self.booking()
+        self.assertEqual(maintenance.expire_pending(timezone.now() - timedelta(minutes=5)), 0)
+        self.assertEqual(self.expire(), 1)
+        self.assertEqual(Booking.objects.filter(status='confirmed').count(), 1)
+        self.assertEqual(self.seats(), 6)
+
+
+class ArchiveTests(TestCase):
+    def test_finished_bookings_move_with_their_payments(self):
+        user = make_user('customer')
+        flight = make_flight()
+        booking = Booking.objects.create(
+            user=user, booking_type='flight', flight=flight, quantity=1, total_price_sar=450,
+            total_price_usd=120, payment_method='card', status='cancelled', customer_name='Test',
+            customer_email='test@example.com', customer_phone='0500000000',
+        )
+        new_payment(booking).save()
+        self.assertEqual(maintenance.archive(timezone.now() + timedelta(seconds=1)), 1)
+        self.assertFalse(Booking.objects.exists())
+        archived = ArchivedBooking.objects.get(pk=booking.pk)
+        self.assertEqual((archived.status, archived.booking_reference), ('cancelled', booking.booking_reference))
+        self.assertEqual(archived.payments.count(), 1)
@@ -0,0 +1,28 @@
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.testing import make_user
+
+
+class MetricsAccessTests(TestCase):
+    def get(self, authorization=None):
+        headers = {'HTTP_AUTHORIZATION': authorization} if authorization else {}
+        return self.client.get('/api/metrics', **headers)
+
+    def bearer(self, user):
+        return f'Bearer {RefreshToken.for_user(user).access_token}'
+
+    @override_settings(METRICS_TOKEN='')
+    def test_without_token_only_staff_can_read(self):
+        self.assertEqual(self.get().status_code, 403)
+        self.assertEqual(self.get('Bearer not-a-jwt').status_code, 403)
+        self.assertEqual(self.get(self.bearer(make_user('customer'))).status_code, 403)
+        response = self.get(self.bearer(make_user('staff', role='staff')))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('bookme_requests_total', response.content.decode())
+
+    @override_settings(METRICS_TOKEN='scrape-me')
+    def test_token_is_required_when_set(self):
+        self.assertEqual(self.get().status_code, 401)
+        self.assertEqual(self.get(self.bearer(make_user('staff', role='staff'))).status_code, 401)
+        self.assertEqual(self.get('Bearer scrape-me').status_code, 200)
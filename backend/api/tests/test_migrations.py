@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+
+class HoldsInventoryBackfillTests(TransactionTestCase):
+    before = [('api', '0008_archive_and_expiry')]
+    after = [('api', '0009_booking_holds_inventory')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        self.latest = executor.loader.graph.leaf_nodes('api')
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.latest)
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        return executor.loader.project_state(self.after).apps
+
+    def test_only_live_hotel_bookings_hold_inventory(self):
+        User = self.apps.get_model('auth', 'User')
+        Flight = self.apps.get_model('api', 'Flight')
+        Hotel = self.apps.get_model('api', 'Hotel')
+        Booking = self.apps.get_model('api', 'Booking')
+        user = User.objects.create(username='legacy')
+        departure = timezone.now() + timedelta(days=7)
+        flight = Flight.objects.create(
+            airline='Saudia', flight_number='SV1020', origin='Riyadh', destination='Jeddah',
+            departure_time=departure, arrival_time=departure + timedelta(hours=2), price_sar=450,
+            price_usd=120, available_seats=10, total_seats=10, aircraft_type='A320', baggage_allowance='23kg',
+        )
+        hotel = Hotel.objects.create(
+            name='Test Hotel', city='Jeddah', address='Corniche Road', star_rating=4, description='',
+            amenities='', price_per_night_sar=500, price_per_night_usd=133, available_rooms=5,
+            total_rooms=5, check_in_time='14:00', check_out_time='12:00', cancellation_policy='',
+        )
+
+        def booking(reference, status, **kwargs):
+            return Booking.objects.create(
+                user=user, booking_reference=reference, status=status, quantity=1, total_price_sar=450,
+                total_price_usd=120, payment_method='card', customer_name='Test',
+                customer_email='test@example.com', customer_phone='0500000000', **kwargs,
+            ).pk
+
+        stay = dict(booking_type='hotel', hotel=hotel, check_in_date=date(2026, 12, 1),
+                    check_out_date=date(2026, 12, 3))
+        expected = {
+            booking('H1', 'confirmed', **stay): True,
+            booking('H2', 'pending', **stay): True,
+            booking('H3', 'cancelled', **stay): False,
+            booking('H4', 'refunded', **stay): False,
+            booking('F1', 'confirmed', booking_type='flight', flight=flight): False,
+            booking('F2', 'pending', booking_type='flight', flight=flight): False,
+        }
+
+        Booking = self.migrate().get_model('api', 'Booking')
+        self.assertEqual(dict(Booking.objects.values_list('pk', 'holds_inventory')), expected)
@@ -0,0 +1,88 @@
+import json
+from base64 import b64encode
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Booking
+from api.testing import assert_constant_queries, make_flight, make_hotel, make_user
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def pages(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.json()['results']]
+            url = response.json()['next']
+        return ids
+
+    def test_pages_through_long_runs_of_ties(self):
+        # Every hotel shares a star rating, so only id breaks the ties.
+        hotels = [make_hotel(name=f'Hotel {i}', star_rating=4) for i in range(25)]
+        ids = self.pages('/api/hotels/?page_size=4')
+        self.assertEqual(ids, sorted(hotel.pk for hotel in hotels))
+
+    def test_next_page_follows_the_full_ordering(self):
+        departure = timezone.now() + timedelta(days=3)
+        flights = [make_flight(flight_number=f'SV{i}', departure_time=departure + timedelta(hours=i % 3)) for i in range(9)]
+        ids = self.pages('/api/flights/?page_size=2')
+        expected = sorted(flights, key=lambda flight: (flight.departure_time, flight.pk))
+        self.assertEqual(ids, [flight.pk for flight in expected])
+
+    def test_rejects_tampered_cursor(self):
+        make_flight()
+        # A position with one value where the ordering has two
+        cursor = b64encode(urlencode({'p': json.dumps(['2030-01-01'])}).encode()).decode()
+        response = self.client.get('/api/flights/', {'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+
+    def test_rejects_cursor_values_of_the_wrong_type(self):
+        make_hotel()
+        make_flight()
+        positions = {
+            '/api/hotels/': [['abc', 'x'], ['2030-01-01', 'x'], ['4', None], [4, [1]], ['4', '1.5']],
+            '/api/flights/': [['not a date', '1'], ['2030-01-01T00:00:00+00:00', 'x'], [{}, 1]],
+        }
+        for url, cases in positions.items():
+            for position in cases:
+                with self.subTest(url=url, position=position):
+                    cursor = b64encode(urlencode({'p': json.dumps(position)}).encode()).decode()
+                    self.assertEqual(self.client.get(url, {'cursor': cursor}).status_code, 404)
+
+    def test_accepts_a_valid_cursor_position(self):
+        hotel = make_hotel(star_rating=4)
+        cursor = b64encode(urlencode({'p': json.dumps(['5', '1'])}).encode()).decode()
+        response = self.client.get('/api/hotels/', {'cursor': cursor})
+        self.assertEqual([row['id'] for row in response.json()['results']], [hotel.pk])
+
+
+class BookingListQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = make_user('staff', role='staff')
+        customer = make_user('customer')
+        flight = make_flight()
+        for i in range(50):
+            Booking.objects.create(
+                user=customer, booking_type='flight', flight=flight, quantity=1, total_price_sar=450,
+                total_price_usd=120, payment_method='card', status='confirmed', customer_name='Test',
+                customer_email='test@example.com', customer_phone='0500000000',
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_expanded_list_has_no_per_row_queries(self):
+        def request(page_size):
+            response = self.client.get(f'/api/bookings/?page_size={page_size}&expand=all')
+            self.assertEqual(len(response.json()['results']), page_size)
+        assert_constant_queries(request)
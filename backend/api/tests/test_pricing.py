@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Deal
+from api.testing import booking_data, make_flight, make_user
+
+
+class ServerPricingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('customer'))
+        self.flight = make_flight(price_sar=450)
+
+    def test_totals_come_from_the_catalog(self):
+        data = booking_data(self.flight, 2, total_price_sar='1.00', total_price_usd='1.00')
+        response = self.client.post('/api/bookings/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['total_price_sar'], '900.00')
+        self.assertEqual(response.json()['total_price_usd'], '240.00')
+
+    def test_deal_discount_and_validity(self):
+        now = timezone.now()
+        deal = Deal.objects.create(
+            title='Summer', description='', deal_type='flight', flight=self.flight, discount_percentage=10,
+            original_price_sar=450, discounted_price_sar=405, original_price_usd=120, discounted_price_usd=108,
+            valid_from=now - timedelta(days=1), valid_until=now + timedelta(days=1), terms_conditions='',
+        )
+        response = self.client.post('/api/bookings/', booking_data(self.flight, 2, deal=deal.pk), format='json')
+        self.assertEqual(response.json()['total_price_sar'], '810.00')
+
+        Deal.objects.filter(pk=deal.pk).update(valid_until=now - timedelta(hours=1))
+        response = self.client.post('/api/bookings/', booking_data(self.flight, 1, deal=deal.pk), format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_quote_endpoint_prices_several_items(self):
+        items = [booking_data(self.flight, 1), booking_data(self.flight, 3), {'booking_type': 'flight', 'flight': 0}]
+        response = self.client.post('/api/pricing/quote/', {'items': items}, format='json')
+        results = response.json()['items']
+        self.assertEqual([result.get('total_price_sar') for result in results[:2]], ['450.00', '1350.00'])
+        self.assertIn('error', results[2])
+        self.assertEqual(response.json()['total_price_sar'], '1800.00')
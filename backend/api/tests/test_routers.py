@@ -0,0 +1,95 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import RequestFactory, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Flight
+from api.testing import make_flight
+from bookme import routers
+
+REPLICA = 'replica1'
+
+
+class PrimaryReplicaRouterTests(TransactionTestCase):
+    """Routing with a second alias pointing at the test database, standing in
+    for a replica: queries are told apart by the connection that ran them."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Added once the test database exists, so the alias shares it.
+        # connections.settings is settings.DATABASES, so replicas() sees it.
+        connections.settings[REPLICA] = dict(connections['default'].settings_dict)
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        self.flight = make_flight()
+        # Forget the pins the signals set for the new flight.
+        cache.clear()
+
+    def request(self, view):
+        """Run view(request) through ReadYourWritesMiddleware, returning the
+        aliases it queried."""
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        middleware = routers.ReadYourWritesMiddleware(view)
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            middleware(request)
+        return {alias for alias, context in (('default', primary), (REPLICA, replica)) if context.captured_queries}
+
+    def read(self, request=None):
+        with routers.replica_reads(Flight._meta.label):
+            list(Flight.objects.all())
+
+    def test_reads_go_to_the_replica(self):
+        self.assertEqual(self.request(self.read), {REPLICA})
+
+    def test_catalog_list_reads_from_the_replica(self):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get('/api/flights/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertTrue(replica.captured_queries)
+        self.assertFalse([q for q in primary.captured_queries if 'api_flight' in q['sql']])
+
+    def test_writes_stay_on_the_primary(self):
+        def write(request):
+            with routers.replica_reads(Flight._meta.label):
+                Flight.objects.filter(pk=self.flight.pk).update(available_seats=9)
+
+        self.assertEqual(self.request(write), {'default'})
+
+    def test_reads_inside_atomic_stay_on_the_primary(self):
+        def read_in_transaction(request):
+            with transaction.atomic():
+                self.read()
+
+        self.assertEqual(self.request(read_in_transaction), {'default'})
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        def write_then_read(request):
+            Flight.objects.filter(pk=self.flight.pk).update(available_seats=9)
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                self.read()
+            self.assertFalse(replica.captured_queries)
+
+        self.assertEqual(self.request(write_then_read), {'default'})
+
+    def test_writes_are_forgotten_between_requests(self):
+        self.request(lambda request: Flight.objects.filter(pk=self.flight.pk).update(available_seats=9))
+        self.assertEqual(self.request(self.read), {REPLICA})
+
+    def test_pinned_keys_read_from_the_primary(self):
+        with transaction.atomic():
+            routers.pin(Flight._meta.label)
+        self.assertEqual(self.request(self.read), {'default'})
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.search import matching_places, normalize_place, register_places
+from api.testing import make_hotel
+
+
+class NormalizePlaceTests(TestCase):
+    def test_folds_arabic_letter_variants(self):
+        self.assertEqual(normalize_place('أبها'), normalize_place('ابها'))
+        self.assertEqual(normalize_place('إسطنبول'), normalize_place('اسطنبول'))
+        self.assertEqual(normalize_place('آ'), normalize_place('ا'))
+        self.assertEqual(normalize_place('جدة'), normalize_place('جده'))
+        self.assertEqual(normalize_place('دبى'), normalize_place('دبي'))
+        self.assertEqual(normalize_place('الريـــاض'), normalize_place('الرياض'))
+
+    def test_strips_a_leading_article(self):
+        for name in ['Al-Khobar', 'al khobar', 'AL_KHOBAR', 'El Khobar', 'Khobar']:
+            self.assertEqual(normalize_place(name), 'khobar', name)
+        self.assertEqual(normalize_place('الخبر'), 'خبر')
+        # Only a leading article, and never the whole value.
+        self.assertEqual(normalize_place('Al'), 'al')
+        self.assertEqual(normalize_place('Ras al Khair'), 'ras al khair')
+
+    def test_folds_case_and_diacritics(self):
+        self.assertEqual(normalize_place('  TA’IF '), normalize_place("ta'if"))
+        self.assertEqual(normalize_place('Café'), 'cafe')
+
+
+class MatchingPlacesTests(TestCase):
+    def setUp(self):
+        register_places(['Makkah', 'Riyadh', 'Abu Dhabi', 'Khobar', 'Unlisted Town'])
+
+    def places(self, query):
+        return set(matching_places(query).values_list('place', flat=True))
+
+    def test_known_aliases_and_codes(self):
+        self.assertEqual(self.places('Mecca'), {'Makkah'})
+        self.assertEqual(self.places('مكة المكرمة'), {'Makkah'})
+        self.assertEqual(self.places('RUH'), {'Riyadh'})
+        self.assertEqual(self.places('ruh'), {'Riyadh'})
+        self.assertEqual(self.places('الرياض'), {'Riyadh'})
+
+    def test_articles_and_prefixes(self):
+        self.assertEqual(self.places('Al-Khobar'), {'Khobar'})
+        self.assertEqual(self.places('الخبر'), {'Khobar'})
+        self.assertEqual(self.places('khob'), {'Khobar'})
+
+    def test_later_words(self):
+        self.assertEqual(self.places('dhabi'), {'Abu Dhabi'})
+        self.assertEqual(self.places('ظبي'), {'Abu Dhabi'})
+        self.assertEqual(self.places('town'), {'Unlisted Town'})
+
+    def test_no_match(self):
+        self.assertEqual(self.places('Berlin'), set())
+        self.assertEqual(self.places(' - '), set())
+
+
+class CitySearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_hotel_list_finds_cities_by_alias(self):
+        makkah = make_hotel(name='Haram View', city='Makkah')
+        make_hotel(name='Corniche', city='Jeddah')
+        for query in ['Mecca', 'مكة', 'makk']:
+            response = self.client.get('/api/hotels/', {'city': query})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([hotel['id'] for hotel in response.json()['results']], [makkah.pk], query)
@@ -0,0 +1,57 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import Booking, Deal, Event, Flight, Hotel, Payment, UserProfile
+
+COUNTS = dict(flights=20, hotels=5, events=5, deals=5, users=5, bookings=40)
+
+
+class PopulateDataTests(TestCase):
+    def populate(self, seed=1):
+        output = StringIO()
+        call_command('populate_data', seed=seed, anchor=date(2025, 1, 1), stdout=output, **COUNTS)
+        return output.getvalue()
+
+    def snapshot(self):
+        """The loaded rows, without ids, which depend on what was there before."""
+        return {
+            'flights': list(Flight.objects.order_by('id').values_list(
+                'flight_number', 'origin', 'destination', 'departure_time', 'price_sar', 'available_seats')),
+            'hotels': list(Hotel.objects.order_by('id').values_list('name', 'price_per_night_sar', 'available_rooms')),
+            'events': list(Event.objects.order_by('id').values_list('name', 'event_date', 'price_sar')),
+            'deals': list(Deal.objects.order_by('id').values_list('title', 'deal_type', 'city', 'valid_from')),
+            'users': list(User.objects.order_by('id').values_list('username', 'password', 'date_joined', 'profile__phone')),
+            'bookings': list(Booking.objects.order_by('id').values_list(
+                'booking_reference', 'user__username', 'booking_type', 'flight__flight_number', 'hotel__name',
+                'event__name', 'quantity', 'total_price_sar', 'status', 'check_in_date', 'created_at')),
+            'payments': list(Payment.objects.order_by('id').values_list('transaction_id', 'amount_sar', 'status')),
+        }
+
+    def clear(self):
+        for model in (Payment, Booking, UserProfile, User, Deal, Event, Hotel, Flight):
+            model.objects.all().delete()
+
+    def test_same_seed_gives_the_same_rows(self):
+        self.populate()
+        first = self.snapshot()
+        self.assertEqual(len(first['bookings']), COUNTS['bookings'])
+        self.clear()
+        self.populate()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_other_seed_gives_other_rows(self):
+        self.populate()
+        first = self.snapshot()
+        self.clear()
+        self.populate(seed=2)
+        self.assertNotEqual(self.snapshot()['flights'], first['flights'])
+
+    def test_second_run_changes_nothing(self):
+        self.populate()
+        first = self.snapshot()
+        self.assertIn('already loaded', self.populate())
+        self.assertEqual(self.snapshot(), first)
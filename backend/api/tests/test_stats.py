@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.bookings import new_payment
+from api.models import Booking
+from api.testing import assert_num_queries, make_flight, make_user
+
+
+class StaffStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(make_user('staff', role='staff'))
+        self.flight = make_flight()
+        self.booking = Booking.objects.create(
+            user=make_user('customer'), booking_type='flight', flight=self.flight, quantity=1,
+            total_price_sar=450, total_price_usd=120, payment_method='card', status='confirmed',
+            customer_name='Test', customer_email='test@example.com', customer_phone='0500000000',
+        )
+        self.payment = new_payment(self.booking)
+        self.payment.save()
+
+    def stats(self):
+        response = self.client.get('/api/dashboard-stats/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_payload_is_computed_in_a_fixed_number_of_queries_then_cached(self):
+        # Live and archived booking totals, six catalog/user/ticket/deal
+        # counts and the recent bookings.
+        with assert_num_queries(9):
+            stats = self.stats()
+        self.assertEqual((stats['totalBookings'], stats['totalRevenue'], stats['totalFlights']), (1, 450, 1))
+        with assert_num_queries(0):
+            self.assertEqual(self.stats(), stats)
+
+    def test_booking_save_drops_the_cached_payload(self):
+        self.stats()
+        self.booking.status = 'cancelled'
+        self.booking.save()
+        with assert_num_queries(9):
+            stats = self.stats()
+        self.assertEqual((stats['confirmedBookings'], stats['cancelledBookings'], stats['totalRevenue']), (0, 1, 0))
+
+    def test_payment_save_drops_the_cached_payload(self):
+        self.stats()
+        self.payment.status = 'completed'
+        self.payment.save()
+        with assert_num_queries(9):
+            self.stats()
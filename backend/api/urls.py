@@ -23,5 +23,7 @@ urlpatterns = [
     path('auth/debug/users', views.debug_users),
     path('dashboard-stats/', views.dashboard_stats, name='dashboard_stats'),
     path('dashboard-stats', views.dashboard_stats),
+    path('pricing/quote/', views.quote, name='quote'),
+    path('pricing/quote', views.quote),
     path('', include(router.urls)),
 ]
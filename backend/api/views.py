@@ -1,15 +1,22 @@
-from rest_framework import viewsets, status, permissions
+from rest_framework import mixins, viewsets, status, permissions, serializers
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.db.models import Sum, Count, Avg, Q
+from django.db.models import Q
 from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
 from django.utils.decorators import method_decorator
-import traceback
+import logging
+from datetime import date
+from decimal import Decimal
 
+from bookme import routers
+
+from . import bookings, deals, exports, inventory, pricing
 from .models import (
     UserProfile, Flight, Hotel, Event, Booking,
     Payment, Refund, Deal, SupportTicket
@@ -17,9 +24,83 @@ from .models import (
 from .serializers import (
     UserSerializer, UserProfileSerializer, RegisterSerializer,
     FlightSerializer, HotelSerializer, EventSerializer,
-    BookingSerializer, PaymentSerializer, RefundSerializer,
-    DealSerializer, SupportTicketSerializer
+    FlightListSerializer, HotelListSerializer, EventListSerializer,
+    BookingSerializer, BookingListSerializer, PaymentSerializer, RefundSerializer,
+    DealSerializer, SupportTicketSerializer,
+    BOOKING_RELATED, PAYMENT_RELATED, REFUND_RELATED, SUPPORT_TICKET_RELATED
+)
+from .pagination import (
+    FlightPagination, HotelPagination, EventPagination, BookingPagination,
+    PaymentPagination, RefundPagination, DealPagination, SupportTicketPagination
 )
+from .catalog_cache import CachedCatalogMixin
+from .fast_json import FastListMixin
+from .search import matching_places
+from .stats import STAFF_STATS_CACHE_KEY, customer_stats, staff_stats
+
+logger = logging.getLogger(__name__)
+
+class SparseListMixin:
+    """Render list actions with list_serializer_class and, on GETs, load only
+    the columns and relations the serializer (after ?fields=/?expand=) will
+    actually read."""
+    list_serializer_class = None
+    
+    def get_serializer_class(self):
+        if self.action == 'list' and self.list_serializer_class is not None:
+            return self.list_serializer_class
+        return super().get_serializer_class()
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != 'GET' or getattr(self, 'renders_values', False):
+            return queryset
+        
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = {queryset.model._meta.pk.name}
+        columns.update(name.lstrip('-') for name in getattr(self.pagination_class, 'ordering', ()))
+        relations = []
+        for field in self.get_serializer().fields.values():
+            if isinstance(field, serializers.BaseSerializer):
+                relations.append(field.source)
+            elif hasattr(field, 'row_columns'):
+                # Computed from these columns (BestDealField)
+                columns.update(field.row_columns)
+                continue
+            elif field.source not in concrete:
+                # Computed field: we can't tell which columns it reads
+                return queryset
+            columns.add(field.source)
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
+
+class ReplicaReadMixin:
+    """Run list/retrieve on a read replica unless the model changed within
+    the replication lag (see bookme.routers)."""
+    
+    def list(self, request, *args, **kwargs):
+        with routers.replica_reads(self.queryset.model._meta.label):
+            return super().list(request, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        with routers.replica_reads(self.queryset.model._meta.label):
+            return super().retrieve(request, *args, **kwargs)
+
+class BestDealMixin:
+    """Match list rows against the deal index (api.deals) and key cached
+    responses on when the deals on offer last changed."""
+    
+    deal_index = None
+    
+    def catalog_version(self):
+        self.deal_index = deals.current_index()
+        return max(super().catalog_version(), deals.stamp(self.deal_index))
+    
+    def list(self, request, *args, **kwargs):
+        with deals.annotating(self.deal_index):
+            return super().list(request, *args, **kwargs)
 
 class IsAdminOrStaff(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -31,6 +112,17 @@ class IsAdminOrStaff(permissions.BasePermission):
         except:
             return False
 
+class ExportMixin:
+    """Staff-only GET <endpoint>/export/ streaming every matching row as
+    NDJSON or CSV; see api.exports for the parameters."""
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminOrStaff])
+    def export(self, request):
+        try:
+            return exports.export_response(self.queryset.model, request.query_params)
+        except exports.ExportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def register(request):
@@ -55,7 +147,7 @@ def register(request):
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('Registration failed')
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
@@ -65,41 +157,24 @@ def login(request):
         username = request.data.get('username') or request.data.get('email')
         password = request.data.get('password')
         
-        print('=' * 60)
-        print(f'🔐 LOGIN ATTEMPT')
-        print(f'   Username/Email: {username}')
-        print(f'   Password length: {len(password) if password else 0}')
-        print('=' * 60)
-        
         if not username or not password:
-            print('❌ Missing credentials')
+            logger.info('Login rejected: missing credentials')
             return Response({'error': 'Username/email and password required'}, status=status.HTTP_400_BAD_REQUEST)
         
         user = authenticate(request, username=username, password=password)
-        print(f'   Auth with username "{username}": {"✅ SUCCESS" if user else "❌ FAILED"}')
         
-        if not user:
-            if '@' in username:
-                try:
-                    user_obj = User.objects.get(email=username)
-                    print(f'   Found user by email: {user_obj.username}')
-                    user = authenticate(request, username=user_obj.username, password=password)
-                    print(f'   Auth with found username "{user_obj.username}": {"✅ SUCCESS" if user else "❌ FAILED"}')
-                except User.DoesNotExist:
-                    print(f'❌ No user found with email: {username}')
-            else:
-                print(f'❌ No user found with username: {username}')
+        if not user and '@' in username:
+            try:
+                user_obj = User.objects.get(email=username)
+                user = authenticate(request, username=user_obj.username, password=password)
+            except User.DoesNotExist:
+                pass
         
         if not user:
-            print('❌ AUTHENTICATION FAILED')
-            print('=' * 60)
+            logger.warning('Login failed', extra={'username': username})
             return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        print(f'✅ LOGIN SUCCESSFUL')
-        print(f'   User ID: {user.id}')
-        print(f'   Username: {user.username}')
-        print(f'   Email: {user.email}')
-        print('=' * 60)
+        logger.info('Login succeeded', extra={'user_id': user.id})
         
         refresh = RefreshToken.for_user(user)
         
@@ -117,9 +192,7 @@ def login(request):
             }
         })
     except Exception as e:
-        print(f'❌ LOGIN ERROR: {str(e)}')
-        traceback.print_exc()
-        print('=' * 60)
+        logger.exception('Login error')
         return Response({'error': 'Login failed', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
@@ -183,7 +256,7 @@ def debug_users(request):
             } for u in users[:5]]
         })
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('Listing users failed')
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
@@ -194,38 +267,40 @@ def dashboard_stats(request):
         profile = user.profile
         
         if profile.role == 'customer':
-            my_bookings = Booking.objects.filter(user=user)
-            stats = {
-                'totalBookings': my_bookings.count(),
-                'confirmedBookings': my_bookings.filter(status='confirmed').count(),
-                'pendingBookings': my_bookings.filter(status='pending').count(),
-                'totalSpent': float(my_bookings.filter(status='confirmed').aggregate(Sum('total_price_sar'))['total_price_sar__sum'] or 0),
-                'recentBookings': BookingSerializer(my_bookings.order_by('-created_at')[:5], many=True).data
-            }
+            with routers.replica_reads(user=user):
+                stats = customer_stats(user)
         else:
-            stats = {
-                'totalBookings': Booking.objects.count(),
-                'confirmedBookings': Booking.objects.filter(status='confirmed').count(),
-                'pendingBookings': Booking.objects.filter(status='pending').count(),
-                'cancelledBookings': Booking.objects.filter(status='cancelled').count(),
-                'totalRevenue': float(Booking.objects.filter(status='confirmed').aggregate(Sum('total_price_sar'))['total_price_sar__sum'] or 0),
-                'totalFlights': Flight.objects.filter(is_active=True).count(),
-                'totalHotels': Hotel.objects.filter(is_active=True).count(),
-                'totalEvents': Event.objects.filter(is_active=True).count(),
-                'totalUsers': User.objects.count(),
-                'openSupportTickets': SupportTicket.objects.filter(status='open').count(),
-                'activeDeals': Deal.objects.filter(is_active=True).count(),
-                'recentBookings': BookingSerializer(Booking.objects.order_by('-created_at')[:10], many=True).data
-            }
+            with routers.replica_reads(STAFF_STATS_CACHE_KEY):
+                stats = staff_stats()
         
         return Response(stats)
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('Dashboard stats failed')
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class FlightViewSet(viewsets.ModelViewSet):
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def quote(request):
+    items = request.data.get('items') if isinstance(request.data, dict) else request.data
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'Expected a non-empty list of items'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > pricing.QUOTE_MAX_ITEMS:
+        return Response({'error': f'At most {pricing.QUOTE_MAX_ITEMS} items per quote'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    quotes = pricing.quote_many(items)
+    total_sar = sum((q['total_price_sar'] for q in quotes if 'error' not in q), Decimal('0'))
+    # Amounts as strings, like the DecimalFields of the model serializers
+    return Response({
+        'items': [{k: str(v) if isinstance(v, Decimal) else v for k, v in q.items()} for q in quotes],
+        'total_price_sar': str(total_sar),
+        'total_price_usd': str(pricing.convert(total_sar, 'USD')),
+    })
+
+class FlightViewSet(BestDealMixin, CachedCatalogMixin, ReplicaReadMixin, FastListMixin, SparseListMixin, viewsets.ModelViewSet):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
+    list_serializer_class = FlightListSerializer
+    pagination_class = FlightPagination
     permission_classes = [AllowAny]
     
     def get_permissions(self):
@@ -239,15 +314,17 @@ class FlightViewSet(viewsets.ModelViewSet):
         destination = self.request.query_params.get('destination')
         
         if origin:
-            queryset = queryset.filter(origin__icontains=origin)
+            queryset = queryset.filter(origin__in=matching_places(origin))
         if destination:
-            queryset = queryset.filter(destination__icontains=destination)
+            queryset = queryset.filter(destination__in=matching_places(destination))
         
-        return queryset.order_by('departure_time')
+        return queryset.order_by('departure_time', 'id')
 
-class HotelViewSet(viewsets.ModelViewSet):
+class HotelViewSet(BestDealMixin, CachedCatalogMixin, ReplicaReadMixin, FastListMixin, SparseListMixin, viewsets.ModelViewSet):
     queryset = Hotel.objects.all()
     serializer_class = HotelSerializer
+    list_serializer_class = HotelListSerializer
+    pagination_class = HotelPagination
     permission_classes = [AllowAny]
     
     def get_permissions(self):
@@ -258,15 +335,29 @@ class HotelViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = Hotel.objects.filter(is_active=True)
         city = self.request.query_params.get('city')
+        check_in = self.request.query_params.get('check_in')
+        check_out = self.request.query_params.get('check_out')
         
         if city:
-            queryset = queryset.filter(city__icontains=city)
+            queryset = queryset.filter(city__in=matching_places(city))
+        if check_in or check_out:
+            try:
+                check_in = date.fromisoformat(check_in or '')
+                check_out = date.fromisoformat(check_out or '')
+                rooms = int(self.request.query_params.get('rooms', 1))
+            except ValueError:
+                raise ValidationError({'error': 'check_in and check_out must be YYYY-MM-DD dates and rooms a number'})
+            if not 0 < (check_out - check_in).days <= inventory.MAX_STAY_NIGHTS or rooms < 1:
+                raise ValidationError({'error': f'Stay must be 1 to {inventory.MAX_STAY_NIGHTS} nights for at least one room'})
+            queryset = inventory.available_hotels(queryset, check_in, check_out, rooms)
         
-        return queryset.order_by('-star_rating')
+        return queryset.order_by('-star_rating', 'id')
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(BestDealMixin, CachedCatalogMixin, ReplicaReadMixin, FastListMixin, SparseListMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    list_serializer_class = EventListSerializer
+    pagination_class = EventPagination
     permission_classes = [AllowAny]
     
     def get_permissions(self):
@@ -280,22 +371,28 @@ class EventViewSet(viewsets.ModelViewSet):
         category = self.request.query_params.get('category')
         
         if city:
-            queryset = queryset.filter(city__icontains=city)
+            queryset = queryset.filter(city__in=matching_places(city))
         if category:
             queryset = queryset.filter(category__icontains=category)
         
-        return queryset.order_by('event_date')
+        return queryset.order_by('event_date', 'id')
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(ExportMixin, SparseListMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                     mixins.ListModelMixin, viewsets.GenericViewSet):
+    # No update or destroy: inventory, price and status only change through
+    # create, cancel and refunds, which keep the held seats/rooms in step.
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
+    list_serializer_class = BookingListSerializer
+    pagination_class = BookingPagination
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
+        queryset = Booking.objects.select_related(*BOOKING_RELATED)
         if hasattr(user, 'profile') and user.profile.role in ['admin', 'staff']:
-            return Booking.objects.all().order_by('-created_at')
-        return Booking.objects.filter(user=user).order_by('-created_at')
+            return queryset.order_by('-created_at', 'id')
+        return queryset.filter(user=user).order_by('-created_at', 'id')
     
     def create(self, request, *args, **kwargs):
         try:
@@ -306,74 +403,53 @@ class BookingViewSet(viewsets.ModelViewSet):
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Validate that at least one of flight, hotel, or event is provided
-            booking_type = request.data.get('booking_type')
-            flight_id = request.data.get('flight')
-            hotel_id = request.data.get('hotel')
-            event_id = request.data.get('event')
+            error = bookings.booking_errors(request.data, serializer.validated_data)
+            if error:
+                return Response(error, status=status.HTTP_400_BAD_REQUEST)
             
-            if booking_type == 'flight' and not flight_id:
-                return Response({
-                    'error': 'Flight ID is required for flight bookings'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if booking_type == 'hotel' and not hotel_id:
-                return Response({
-                    'error': 'Hotel ID is required for hotel bookings'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if booking_type == 'event' and not event_id:
-                return Response({
-                    'error': 'Event ID is required for event bookings'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate required fields
-            required_fields = ['customer_name', 'customer_email', 'customer_phone', 'quantity', 'total_price_sar', 'total_price_usd', 'payment_method']
-            missing_fields = [field for field in required_fields if not request.data.get(field)]
-            
-            if missing_fields:
-                return Response({
-                    'error': 'Missing required fields',
-                    'missing_fields': missing_fields
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Create booking
-            booking = serializer.save(user=request.user)
-            
-            # Create payment
             try:
-                payment = Payment.objects.create(
-                    booking=booking,
-                    amount_sar=booking.total_price_sar,
-                    amount_usd=booking.total_price_usd,
-                    currency=booking.currency,
-                    payment_method=booking.payment_method,
-                    status='completed'
-                )
-                
-                booking.payment_status = 'completed'
-                booking.status = 'confirmed'
-                booking.confirmation_sent = True
-                booking.ticket_issued = True
-                booking.save()
-            except Exception as e:
-                # If payment creation fails, delete the booking
-                booking.delete()
-                return Response({
-                    'error': 'Failed to create payment',
-                    'details': str(e)
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                bookings.create_one(serializer, request.user)
+            except pricing.PricingError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            except inventory.InsufficientInventory as e:
+                return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
             
             headers = self.get_success_headers(serializer.data)
             return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
             
         except Exception as e:
-            traceback.print_exc()
+            logger.exception('Booking creation failed')
             return Response({
                 'error': 'Failed to create booking',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        items = request.data.get('bookings') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'Expected a non-empty list of bookings'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > bookings.BULK_MAX_ITEMS:
+            return Response({'error': f'At most {bookings.BULK_MAX_ITEMS} bookings per request'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            results = bookings.create_many(request.user, items)
+        except Exception as e:
+            logger.exception('Bulk booking failed')
+            return Response({
+                'error': 'Failed to create bookings',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        created = sum(1 for result in results if result['status'] == 'created')
+        if created == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'created': created, 'failed': len(results) - created, 'results': results}, status=response_status)
+    
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         try:
@@ -390,35 +466,42 @@ class BookingViewSet(viewsets.ModelViewSet):
             if booking.status == 'refunded':
                 return Response({'error': 'Cannot cancel a refunded booking'}, status=status.HTTP_400_BAD_REQUEST)
             
-            booking.status = 'cancelled'
-            booking.save()
+            if booking.status == 'expired':
+                return Response({'error': 'Booking has expired'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            if not inventory.release(booking, 'cancelled'):
+                return Response({'error': 'Booking already cancelled'}, status=status.HTTP_400_BAD_REQUEST)
             
             return Response({'message': 'Booking cancelled successfully', 'booking': BookingSerializer(booking).data})
         except Exception as e:
-            traceback.print_exc()
+            logger.exception('Booking cancellation failed')
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    pagination_class = PaymentPagination
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
+        queryset = Payment.objects.select_related(*PAYMENT_RELATED)
         if hasattr(user, 'profile') and user.profile.role in ['admin', 'staff']:
-            return Payment.objects.all().order_by('-created_at')
-        return Payment.objects.filter(booking__user=user).order_by('-created_at')
+            return queryset.order_by('-created_at', 'id')
+        return queryset.filter(booking__user=user).order_by('-created_at', 'id')
 
-class RefundViewSet(viewsets.ModelViewSet):
+class RefundViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Refund.objects.all()
     serializer_class = RefundSerializer
+    pagination_class = RefundPagination
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
+        queryset = Refund.objects.select_related(*REFUND_RELATED)
         if hasattr(user, 'profile') and user.profile.role in ['admin', 'staff']:
-            return Refund.objects.all().order_by('-created_at')
-        return Refund.objects.filter(booking__user=user).order_by('-created_at')
+            return queryset.order_by('-created_at', 'id')
+        return queryset.filter(booking__user=user).order_by('-created_at', 'id')
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsAdminOrStaff])
     def process(self, request, pk=None):
@@ -431,8 +514,10 @@ class RefundViewSet(viewsets.ModelViewSet):
             refund.admin_notes = request.data.get('notes', '')
             refund.save()
             
-            refund.booking.status = 'refunded'
-            refund.booking.save()
+            if not inventory.release(refund.booking, 'refunded'):
+                # A cancelled booking has already given its inventory back
+                refund.booking.status = 'refunded'
+                refund.booking.save()
             
             refund.payment.status = 'refunded'
             refund.payment.save()
@@ -449,9 +534,10 @@ class RefundViewSet(viewsets.ModelViewSet):
         
         return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
 
-class DealViewSet(viewsets.ModelViewSet):
+class DealViewSet(CachedCatalogMixin, ReplicaReadMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Deal.objects.all()
     serializer_class = DealSerializer
+    pagination_class = DealPagination
     permission_classes = [AllowAny]
     
     def get_permissions(self):
@@ -459,19 +545,27 @@ class DealViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsAdminOrStaff()]
         return [AllowAny()]
     
+    def catalog_version(self):
+        return deals.stamp()
+    
     def get_queryset(self):
-        return Deal.objects.filter(is_active=True).order_by('-discount_percentage')
+        queryset = Deal.objects.filter(is_active=True)
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.filter(valid_until__gte=timezone.now())
+        return queryset.order_by('-discount_percentage', 'id')
 
 class SupportTicketViewSet(viewsets.ModelViewSet):
     queryset = SupportTicket.objects.all()
     serializer_class = SupportTicketSerializer
+    pagination_class = SupportTicketPagination
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
+        queryset = SupportTicket.objects.select_related(*SUPPORT_TICKET_RELATED)
         if hasattr(user, 'profile') and user.profile.role in ['admin', 'staff']:
-            return SupportTicket.objects.all().order_by('-created_at')
-        return SupportTicket.objects.filter(user=user).order_by('-created_at')
+            return queryset.order_by('-created_at', 'id')
+        return queryset.filter(user=user).order_by('-created_at', 'id')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+"""Benchmark the hot API endpoints against a seeded dataset and write the
+results to a JSON file that can be compared across commits.
+
+The database is filled by `manage.py populate_data` at --scale (1 = 10k
+flights, 1k hotels and events, 2k customers, 50k bookings) unless it was
+already seeded with the same --seed, so a --db file can be reused between
+runs (bookings_create and refund_process change it, so compare runs on
+fresh databases when those numbers matter). Each scenario then runs:
+
+    inprocess  --requests requests one after another through Django's test
+               client, counting SQL queries per request
+    http       --clients keep-alive clients for --duration seconds against
+               gunicorn (bookme.wsgi, --workers x --threads), taking query
+               counts from the Server-Timing header
+
+Scenarios: login, flights_search, hotels_city, bookings_list,
+bookings_create, dashboard_customer, dashboard_staff, refund_process.
+With --compare, changes in p95 or requests/s beyond --tolerance percent are
+reported and the script exits with status 1.
+
+    python benchmarks/api_suite.py --scale 1 --output before.json
+    python benchmarks/api_suite.py --scale 1 --output after.json --compare before.json
+    python benchmarks/api_suite.py --db /tmp/bench.sqlite3 --scale 10 --modes inprocess
+"""
+import argparse
+import collections
+import http.client
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from urllib.parse import urlencode
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ['login', 'flights_search', 'hotels_city', 'bookings_list', 'bookings_create',
+             'dashboard_customer', 'dashboard_staff', 'refund_process']
+# Per unit of --scale
+VOLUMES = {'flights': 10_000, 'hotels': 1000, 'events': 1000, 'deals': 200, 'users': 2000, 'bookings': 50_000}
+STAFF_PASSWORD = 'bench-staff-123'
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--scale', type=float, default=1)
+parser.add_argument('--seed', type=int, default=1)
+parser.add_argument('--anchor', default='2025-01-01', help='YYYY-MM-DD the seeded dates are relative to')
+parser.add_argument('--db', help='SQLite file to use and keep (default: a temp file)')
+parser.add_argument('--database-url', help='use this database instead of SQLite (it gets seeded)')
+parser.add_argument('--modes', nargs='+', default=['inprocess', 'http'], choices=['inprocess', 'http'])
+parser.add_argument('--scenarios', nargs='+', default=SCENARIOS, choices=SCENARIOS)
+parser.add_argument('--requests', type=int, default=200, help='requests per scenario in process')
+parser.add_argument('--clients', type=int, default=8)
+parser.add_argument('--duration', type=float, default=10)
+parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count() + 1)
+parser.add_argument('--threads', type=int, default=4)
+parser.add_argument('--port', type=int, default=8598)
+parser.add_argument('--output', default='benchmark-results.json')
+parser.add_argument('--compare', help='earlier result file to compare with')
+parser.add_argument('--tolerance', type=float, default=10, help='percent change reported as a regression')
+
+
+def configure(args):
+    """Point this process (and the gunicorn children) at the benchmark database."""
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        path = args.db or os.path.join(tempfile.mkdtemp(prefix='bookme-bench-'), 'bench.sqlite3')
+        os.environ['DATABASE_URL'] = f'sqlite:///{os.path.abspath(path)}'
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bookme.settings'
+    os.environ['DJANGO_DEBUG'] = '0'
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    sys.path.insert(0, BACKEND)
+    import django
+    django.setup()
+
+
+def seed(args):
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from api import seeding
+    from api.models import UserProfile
+
+    call_command('migrate', verbosity=0)
+    volumes = {name: max(1, int(count * args.scale)) for name, count in VOLUMES.items()}
+    if not User.objects.filter(username=seeding.username(args.seed, 0)).exists():
+        print(f'Seeding {volumes}', flush=True)
+        call_command('populate_data', seed=args.seed, anchor=date.fromisoformat(args.anchor),
+                     **{name: count for name, count in volumes.items()})
+    staff, created = User.objects.get_or_create(username='bench-staff', defaults={'email': 'staff@bench.bookme.sa'})
+    if created:
+        staff.set_password(STAFF_PASSWORD)
+        staff.save()
+        UserProfile.objects.create(user=staff, role='staff')
+    return volumes
+
+
+def build_scenarios(args):
+    """Requests per scenario as (method, path, body, headers) tuples, so the
+    same list drives the test client and the HTTP clients. Scenarios that
+    change state for good (refund approval) are not repeated."""
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from api import seeding
+    from api.models import Flight, Payment, Refund
+
+    def bearer(user):
+        return {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    customers = list(User.objects.filter(username__startswith=f'load{args.seed}_', bookings__isnull=False)
+                     .distinct().order_by('id')[:50])
+    customer_headers = [bearer(user) for user in customers]
+    staff_headers = bearer(User.objects.get(username='bench-staff'))
+    cities = seeding.CITIES[:8]
+    flights = list(Flight.objects.filter(is_active=True, available_seats__gt=100).order_by('id')
+                   .values_list('id', flat=True)[:200])
+
+    # One requested refund per approval the run can make
+    wanted = args.requests + 50 * args.clients * int(args.duration)
+    refunded = Refund.objects.values('payment_id')
+    payments = list(Payment.objects.filter(status='completed', booking__status='confirmed')
+                    .exclude(id__in=refunded).order_by('id').select_related('booking')[:wanted])
+    Refund.objects.bulk_create(Refund(
+        booking=payment.booking, payment=payment, refund_amount_sar=payment.amount_sar,
+        refund_amount_usd=payment.amount_usd, currency='SAR', reason='Benchmark',
+    ) for payment in payments)
+    refunds = list(Refund.objects.filter(status='requested', reason='Benchmark').order_by('id').values_list('id', flat=True))
+
+    def post(path, body, headers):
+        return 'POST', path, json.dumps(body), {**headers, 'Content-Type': 'application/json'}
+
+    return {
+        'login': ([post('/api/auth/login/', {'username': user.username, 'password': seeding.SEED_PASSWORD}, {})
+                   for user in customers], True),
+        'flights_search': ([('GET', '/api/flights/?' + urlencode({'origin': a, 'destination': b}), None, {})
+                            for a, b in itertools.permutations(cities, 2)], True),
+        'hotels_city': ([('GET', '/api/hotels/?' + urlencode({'city': city}), None, {}) for city in seeding.CITIES], True),
+        'bookings_list': ([('GET', '/api/bookings/', None, headers) for headers in customer_headers], True),
+        'bookings_create': ([post('/api/bookings/', {
+            'booking_type': 'flight', 'flight': flight, 'quantity': 1, 'total_price_sar': '450.00',
+            'total_price_usd': '120.00', 'payment_method': 'card', 'customer_name': 'Bench',
+            'customer_email': 'bench@bookme.sa', 'customer_phone': '+966500000000',
+        }, headers) for flight, headers in zip(flights, itertools.cycle(customer_headers))], True),
+        'dashboard_customer': ([('GET', '/api/dashboard-stats/', None, headers) for headers in customer_headers], True),
+        'dashboard_staff': ([('GET', '/api/dashboard-stats/', None, staff_headers)], True),
+        'refund_process': ([post(f'/api/refunds/{refund}/process/', {'action': 'approve'}, staff_headers)
+                            for refund in refunds], False),
+    }
+
+
+def summarize(latencies, errors, seconds, queries=None):
+    """errors counts failed requests by status code."""
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    result = {
+        'requests': len(latencies), 'errors': sum(errors.values()), 'error_statuses': dict(errors),
+        'rps': round(len(latencies) / seconds, 1) if seconds else 0,
+        'p50_ms': percentile(0.50), 'p95_ms': percentile(0.95), 'p99_ms': percentile(0.99),
+    }
+    if queries is not None:
+        result['queries_per_request'] = round(sum(queries) / len(queries), 2) if queries else None
+    return result
+
+
+def run_inprocess(requests, repeat, count):
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    executed = []
+
+    def count_queries(execute, sql, params, many, context):
+        executed[-1] += 1
+        return execute(sql, params, many, context)
+
+    client = APIClient()
+    source = itertools.cycle(requests) if repeat else iter(requests)
+    latencies, queries, errors = [], [], collections.Counter()
+    started = time.perf_counter()
+    with connection.execute_wrapper(count_queries):
+        for method, path, body, headers in itertools.islice(source, count):
+            extra = {'HTTP_' + name.upper().replace('-', '_'): value for name, value in headers.items()
+                     if name != 'Content-Type'}
+            executed.append(0)
+            began = time.perf_counter()
+            response = client.generic(method, path, body or '', content_type=headers.get('Content-Type'),
+                                      HTTP_ACCEPT='application/json', **extra)
+            latency = time.perf_counter() - began
+            if response.status_code >= 400:
+                errors[str(response.status_code)] += 1
+                continue
+            latencies.append(latency)
+            queries.append(executed[-1])
+    return summarize(latencies, errors, time.perf_counter() - started, queries)
+
+
+def http_client(port, requests, repeat, duration, results):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    source = itertools.cycle(requests) if repeat else iter(requests)
+    latencies, queries, errors = [], [], collections.Counter()
+    deadline = time.monotonic() + duration
+    for method, path, body, headers in source:
+        if time.monotonic() >= deadline:
+            break
+        began = time.perf_counter()
+        try:
+            connection.request(method, path, body, {**headers, 'Accept': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            errors[type(exc).__name__] += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            continue
+        if response.status >= 400:
+            errors[str(response.status)] += 1
+        else:
+            latencies.append(time.perf_counter() - began)
+            counted = SERVER_TIMING_QUERIES.search(response.getheader('Server-Timing', ''))
+            if counted:
+                queries.append(int(counted.group(1)))
+    results.put((latencies, queries, errors))
+
+
+def run_http(args, requests, repeat):
+    results = multiprocessing.Queue()
+    # Non-repeating requests are split between the clients
+    slices = [requests[i::args.clients] for i in range(args.clients)] if not repeat else [requests] * args.clients
+    clients = [multiprocessing.Process(target=http_client, args=(args.port, part, repeat, args.duration, results))
+               for part in slices]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    collected = [results.get() for _ in clients]
+    for client in clients:
+        client.join()
+    seconds = min(time.perf_counter() - started, args.duration)
+    return summarize([latency for batch, _, _ in collected for latency in batch],
+                     sum((errors for _, _, errors in collected), collections.Counter()), seconds,
+                     [count for _, batch, _ in collected for count in batch])
+
+
+def start_server(args):
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{args.port}', '--workers', str(args.workers),
+               '--threads', str(args.threads), '--worker-class', 'gthread', '--max-requests', '0', 'bookme.wsgi']
+    process = subprocess.Popen(command, cwd=BACKEND, env=os.environ.copy(),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f'gunicorn exited with {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', args.port, timeout=1)
+            connection.request('GET', '/api/deals/')
+            connection.getresponse().read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    sys.exit('gunicorn did not start')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current, tolerance):
+    print(f'\nCompared with {previous.get("commit")} ({previous.get("timestamp")}):')
+    regressions = 0
+    for mode, scenarios in current['results'].items():
+        for name, result in scenarios.items():
+            before = previous.get('results', {}).get(mode, {}).get(name)
+            if not before or not before.get('p95_ms') or not result.get('p95_ms') or not before.get('rps'):
+                continue
+            p95 = (result['p95_ms'] / before['p95_ms'] - 1) * 100
+            rps = (result['rps'] / before['rps'] - 1) * 100
+            worse = p95 > tolerance or rps < -tolerance
+            regressions += worse
+            print(f'  {mode:<10} {name:<20} p95 {p95:+6.1f}%  rps {rps:+6.1f}%{"  REGRESSION" if worse else ""}')
+    return regressions
+
+
+def main():
+    args = parser.parse_args()
+    configure(args)
+    from django.db import connection
+
+    volumes = seed(args)
+    scenarios = build_scenarios(args)
+    report = {
+        'commit': git_commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(), 'database': connection.vendor, 'seed': args.seed,
+        'volumes': volumes, 'settings': {k: getattr(args, k) for k in ('requests', 'clients', 'duration', 'workers', 'threads')},
+        'results': {},
+    }
+
+    header = f'{"mode":<10} {"scenario":<20} {"req":>6} {"err":>5} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"queries":>8}'
+    print(header)
+    for mode in args.modes:
+        server = start_server(args) if mode == 'http' else None
+        try:
+            for name in args.scenarios:
+                requests, repeat = scenarios[name]
+                if not requests:
+                    print(f'{mode:<10} {name:<20} skipped: no data')
+                    continue
+                if mode == 'inprocess':
+                    result = run_inprocess(requests, repeat, args.requests)
+                    if not repeat:
+                        scenarios[name] = (requests[args.requests:], repeat)
+                else:
+                    result = run_http(args, requests, repeat)
+                report['results'].setdefault(mode, {})[name] = result
+                fmt = lambda value, spec: format(value, spec) if value is not None else '-'
+                print(f'{mode:<10} {name:<20} {result["requests"]:>6} {result["errors"]:>5} {result["rps"]:>8.1f} '
+                      f'{fmt(result["p50_ms"], ">8.1f")} {fmt(result["p95_ms"], ">8.1f")} {fmt(result["p99_ms"], ">8.1f")} '
+                      f'{fmt(result.get("queries_per_request"), ">8.1f")}', flush=True)
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'\nWrote {args.output}')
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(json.load(f), report, args.tolerance):
+                return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Check that the staff booking export streams in constant memory: export
+--sizes bookings as NDJSON and CSV and report the Python heap peak
+(tracemalloc) while the response is consumed.
+
+Runs against a throwaway SQLite database (never the project's db.sqlite3).
+
+    python benchmarks/export_memory.py --sizes 10000 100000 500000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bookme.settings')
+
+import django
+from django.conf import settings
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+parser.add_argument('--batch-size', type=int, default=5000)
+parser.add_argument('--db', help='SQLite file to use (default: a temp file)')
+args = parser.parse_args()
+
+db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='bookme-bench-'), 'bench.sqlite3')
+settings.DATABASES['default']['NAME'] = db_path
+settings.DEBUG = False
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from api.models import Booking, UserProfile
+
+
+def seed(rows, user):
+    # Sizes run in ascending order, so only the missing rows are added.
+    for start in range(Booking.objects.count(), rows, args.batch_size):
+        Booking.objects.bulk_create(Booking(
+            booking_reference=f'BKM{i:010d}', user=user, booking_type='flight', quantity=1,
+            total_price_sar=Decimal('450.00'), total_price_usd=Decimal('120.00'), payment_method='card',
+            status='confirmed', customer_name='Bench', customer_email='bench@bookme.sa', customer_phone='-',
+        ) for i in range(start, min(start + args.batch_size, rows)))
+
+
+def export(client, output):
+    """Stream one export; return (rows, bytes, seconds, peak heap bytes)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(f'/api/bookings/export/?output={output}')
+    assert response.status_code == 200, response.content
+    lines = size = 0
+    for chunk in response.streaming_content:
+        lines += chunk.count(b'\n')
+        size += len(chunk)
+    response.close()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return lines - (output == 'csv'), size, seconds, peak
+
+
+def main():
+    print(f'Database: {db_path}')
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='bench', email='bench@bookme.sa', password='bench123')
+    UserProfile.objects.create(user=user, role='staff')
+    client = APIClient()
+    client.force_authenticate(user)
+
+    print(f'\n{"rows":>8} {"output":<7} {"MB out":>8} {"rows/s":>9} {"peak heap KB":>13}')
+    for rows in sorted(args.sizes):
+        seed(rows, user)
+        for output in ('ndjson', 'csv'):
+            exported, size, seconds, peak = export(client, output)
+            assert exported == rows, (exported, rows)
+            print(f'{rows:>8} {output:<7} {size / 1e6:>8.1f} {rows / seconds:>9.0f} {peak / 1024:>13.0f}', flush=True)
+
+
+if __name__ == '__main__':
+    main()
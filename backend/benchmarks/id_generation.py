@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Compare the old random booking references with api.ids: generation speed,
+duplicates, and insert throughput into a table with a unique index.
+
+Runs against a throwaway SQLite database (never the project's db.sqlite3).
+
+    python benchmarks/id_generation.py --rows 200000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import ids
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--rows', type=int, default=200_000)
+parser.add_argument('--batch-size', type=int, default=1000)
+args = parser.parse_args()
+
+
+def random_reference():
+    """The scheme Booking.save used before api.ids."""
+    return 'BKM' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
+
+
+def random_ticket_number():
+    """The scheme SupportTicket.save used before api.ids."""
+    return 'SUP' + ''.join(random.choices(string.digits, k=8))
+
+
+def generate(make):
+    started = time.perf_counter()
+    values = [make() for _ in range(args.rows)]
+    return values, time.perf_counter() - started
+
+
+def insert(values):
+    path = os.path.join(tempfile.mkdtemp(prefix='bookme-ids-'), 'ids.sqlite3')
+    db = sqlite3.connect(path)
+    db.execute('CREATE TABLE ref (id INTEGER PRIMARY KEY, reference VARCHAR(24) NOT NULL UNIQUE)')
+    started = time.perf_counter()
+    for start in range(0, len(values), args.batch_size):
+        db.executemany('INSERT OR IGNORE INTO ref (reference) VALUES (?)', ((v,) for v in values[start:start + args.batch_size]))
+        db.commit()
+    elapsed = time.perf_counter() - started
+    db.close()
+    return elapsed
+
+
+def report(name, make):
+    values, generated = generate(make)
+    duplicates = len(values) - len(set(values))
+    inserted = insert(values)
+    print(f'{name:<24} generate {args.rows / generated:>12,.0f}/s   '
+          f'insert {args.rows / inserted:>10,.0f} rows/s   duplicates {duplicates}')
+
+
+if __name__ == '__main__':
+    # A fixed node: no Django settings, and so no shared cache, here.
+    ids.generator = ids.IdGenerator(node=0)
+    print(f'{args.rows:,} ids, unique index, {args.batch_size}-row transactions\n')
+    report('random BKM (old)', random_reference)
+    report('random SUP (old)', random_ticket_number)
+    report('time-ordered BKM', ids.booking_reference)
+    report('time-ordered SUP', ids.ticket_number)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""Compare query plans and timings of the list endpoints without and with the
+indexes added by the 0002_catalog_and_booking_indexes migration.
+
+Builds a throwaway SQLite database (never the project's db.sqlite3) at the
+latest migration, seeds it with --rows rows per catalog table and per booking
+table, then prints EXPLAIN QUERY PLAN output and the time to fetch one page
+for each query with those indexes dropped and re-created. The rest of the
+schema stays as it is, so the seeded rows and the queries match the models.
+
+    python benchmarks/index_plans.py --rows 1000000
+"""
+import argparse
+import importlib
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bookme.settings')
+
+import django
+from django.apps import apps
+from django.conf import settings
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--rows', type=int, default=1_000_000)
+parser.add_argument('--users', type=int, default=1000)
+parser.add_argument('--batch-size', type=int, default=5000)
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--db', help='SQLite file to use (default: a temp file)')
+args = parser.parse_args()
+
+db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='bookme-bench-'), 'bench.sqlite3')
+settings.DATABASES['default']['NAME'] = db_path
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.operations import AddIndex
+from django.utils import timezone
+
+from api.models import Flight, Hotel, Event, Booking, Deal
+
+PAGE = 20
+INDEXED_MIGRATION = '0002_catalog_and_booking_indexes'
+INDEX_OPERATIONS = [
+    operation for operation in importlib.import_module(f'api.migrations.{INDEXED_MIGRATION}').Migration.operations
+    if isinstance(operation, AddIndex)
+]
+
+
+def batched(make, total):
+    for start in range(0, total, args.batch_size):
+        yield [make(i) for i in range(start, min(start + args.batch_size, total))]
+
+
+def seed():
+    rng = random.Random(args.seed)
+    now = timezone.now()
+    cities = ['Riyadh', 'Jeddah', 'Dammam', 'Dubai', 'Cairo', 'London', 'Makkah', 'Madinah']
+
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@bookme.sa', password='!') for i in range(args.users)
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+
+    for batch in batched(lambda i: Flight(
+        airline='Saudia', flight_number=f'SV{i}', origin=rng.choice(cities), destination=rng.choice(cities),
+        departure_time=now + timedelta(minutes=rng.randint(-50000, 500000)),
+        arrival_time=now + timedelta(minutes=rng.randint(500000, 510000)),
+        price_sar=Decimal('450.00'), price_usd=Decimal('120.00'), available_seats=50, total_seats=150,
+        aircraft_type='A320', baggage_allowance='23kg', is_active=rng.random() < 0.7,
+    ), args.rows):
+        Flight.objects.bulk_create(batch)
+
+    for batch in batched(lambda i: Hotel(
+        name=f'Hotel {i}', city=rng.choice(cities), address='-', star_rating=rng.randint(1, 5), description='-',
+        amenities='-', price_per_night_sar=Decimal('750.00'), price_per_night_usd=Decimal('200.00'),
+        available_rooms=10, total_rooms=100, check_in_time='14:00', check_out_time='12:00',
+        cancellation_policy='-', is_active=rng.random() < 0.7,
+    ), args.rows):
+        Hotel.objects.bulk_create(batch)
+
+    for batch in batched(lambda i: Event(
+        name=f'Event {i}', category='Sports', venue='-', city=rng.choice(cities), description='-',
+        event_date=now + timedelta(minutes=rng.randint(-50000, 500000)), duration_hours=Decimal('2.0'),
+        price_sar=Decimal('150.00'), price_usd=Decimal('40.00'), available_tickets=100, total_tickets=1000,
+        is_active=rng.random() < 0.7,
+    ), args.rows):
+        Event.objects.bulk_create(batch)
+
+    for batch in batched(lambda i: Deal(
+        title=f'Deal {i}', description='-', deal_type='hotel', discount_percentage=Decimal(rng.randint(0, 9000)) / 100,
+        original_price_sar=Decimal('100.00'), discounted_price_sar=Decimal('50.00'), original_price_usd=Decimal('27.00'),
+        discounted_price_usd=Decimal('13.00'), valid_from=now, valid_until=now + timedelta(days=30),
+        terms_conditions='-', is_active=rng.random() < 0.7,
+    ), args.rows):
+        Deal.objects.bulk_create(batch)
+
+    statuses = ['pending', 'confirmed', 'cancelled', 'refunded']
+    for batch in batched(lambda i: Booking(
+        booking_reference=f'BKM{i:010d}', user_id=rng.choice(user_ids), booking_type='flight', quantity=1,
+        total_price_sar=Decimal('450.00'), total_price_usd=Decimal('120.00'), payment_method='card',
+        status=rng.choice(statuses), customer_name='-', customer_email='bench@bookme.sa', customer_phone='-',
+    ), args.rows):
+        Booking.objects.bulk_create(batch)
+    # auto_now_add stamps every row with the same instant; spread them out so
+    # ordering by created_at is meaningful.
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE api_booking SET created_at = datetime('now', '-' || (id % 100000) || ' minutes')")
+
+
+def queries():
+    """(name, queryset, counted) for each list query; counted queries are
+    timed as COUNT(*) like the dashboard, the rest as one page of rows."""
+    user_id = User.objects.values_list('id', flat=True).first()
+    return [
+        ('flights list', Flight.objects.filter(is_active=True).order_by('departure_time', 'id'), False),
+        ('hotels list', Hotel.objects.filter(is_active=True).order_by('-star_rating', 'id'), False),
+        ('events list', Event.objects.filter(is_active=True).order_by('event_date', 'id'), False),
+        ('deals list', Deal.objects.filter(is_active=True).order_by('-discount_percentage', 'id'), False),
+        ('bookings (staff)', Booking.objects.order_by('-created_at', 'id'), False),
+        ('bookings (customer)', Booking.objects.filter(user_id=user_id).order_by('-created_at', 'id'), False),
+        ('bookings by status', Booking.objects.filter(status='pending'), True),
+    ]
+
+
+def set_indexes(present):
+    """Create or drop the INDEXED_MIGRATION indexes, skipping any already in
+    that state (e.g. after an interrupted run with --db)."""
+    with connection.schema_editor() as editor:
+        for operation in INDEX_OPERATIONS:
+            model = apps.get_model('api', operation.model_name)
+            with connection.cursor() as cursor:
+                existing = connection.introspection.get_constraints(cursor, model._meta.db_table)
+            if present and operation.index.name not in existing:
+                editor.add_index(model, operation.index)
+            elif not present and operation.index.name in existing:
+                editor.remove_index(model, operation.index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def report(label):
+    print(f'\n=== {label} ===')
+    for name, queryset, counted in queries():
+        started = time.perf_counter()
+        if counted:
+            queryset = queryset.values('id')
+            queryset.count()
+        else:
+            queryset = queryset[:PAGE]
+            list(queryset)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f'\n{name}: {elapsed:.1f} ms')
+        for line in queryset.explain().splitlines():
+            print(f'    {line}')
+
+
+if __name__ == '__main__':
+    print(f'Database: {db_path}')
+    call_command('migrate', verbosity=0)
+    if not Flight.objects.exists():
+        started = time.perf_counter()
+        seed()
+        print(f'Seeded {args.rows} rows per table in {time.perf_counter() - started:.0f}s')
+
+    set_indexes(False)
+    report('without indexes')
+
+    set_indexes(True)
+    report('with indexes')
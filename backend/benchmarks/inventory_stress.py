@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Hammer POST /api/bookings/ from many threads for the last few seats of one
+flight and check that it is never oversold.
+
+Runs against a throwaway SQLite database (never the project's db.sqlite3).
+
+    python benchmarks/inventory_stress.py --threads 300 --seats 5
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bookme.settings')
+
+import django
+from django.conf import settings
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--threads', type=int, default=300)
+parser.add_argument('--seats', type=int, default=5)
+parser.add_argument('--db', help='SQLite file to use (default: a temp file)')
+args = parser.parse_args()
+
+db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='bookme-stress-'), 'stress.sqlite3')
+settings.DATABASES['default']['NAME'] = db_path
+settings.DATABASES['default'].setdefault('OPTIONS', {})['timeout'] = 60
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Flight, Booking, UserProfile
+
+
+def main():
+    # Every losing request logs a 409 warning; keep the output readable.
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='stress', email='stress@bookme.sa', password='stress123')
+    UserProfile.objects.create(user=user, role='customer')
+    flight = Flight.objects.create(
+        airline='Saudia', flight_number='SV0001', origin='Riyadh', destination='Jeddah',
+        departure_time=timezone.now() + timedelta(days=1), arrival_time=timezone.now() + timedelta(days=1, hours=2),
+        price_sar=450, price_usd=120, available_seats=args.seats, total_seats=150,
+        aircraft_type='A320', baggage_allowance='23kg',
+    )
+    payload = {
+        'booking_type': 'flight', 'flight': flight.id, 'quantity': 1,
+        'total_price_sar': '450.00', 'total_price_usd': '120.00', 'payment_method': 'card',
+        'customer_name': 'Stress Test', 'customer_email': 'stress@bookme.sa', 'customer_phone': '+966500000000',
+    }
+    results = Counter()
+    lock = threading.Lock()
+    start = threading.Barrier(args.threads)
+
+    def book():
+        client = APIClient()
+        client.force_authenticate(user)
+        start.wait()
+        try:
+            code = client.post('/api/bookings/', payload, format='json').status_code
+        finally:
+            connection.close()
+        with lock:
+            results[code] += 1
+
+    threads = [threading.Thread(target=book) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    flight.refresh_from_db()
+    booked = Booking.objects.filter(flight=flight).exclude(status__in=['cancelled', 'refunded']).count()
+    print(f'{args.threads} concurrent bookings for {args.seats} seats in {elapsed:.2f}s')
+    print(f'  responses: {dict(sorted(results.items()))}')
+    print(f'  bookings holding seats: {booked}, seats left: {flight.available_seats}')
+    oversold = booked > args.seats or flight.available_seats < 0 or booked + flight.available_seats != args.seats
+    if oversold:
+        print('FAIL: inventory and bookings disagree')
+        return 1
+    print('OK: no oversell')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Compare requests/sec of the catalog list endpoints with the serializer path
+and the api.fast_json path, and check both return the same bytes.
+
+For each --sizes value the flight, hotel, event and deal tables are topped
+up to that many active rows, then every endpoint is walked page by page at its
+maximum page size, once per rendering path. The response cache is disabled
+so every request renders.
+
+Runs against a throwaway SQLite database (never the project's db.sqlite3).
+
+    python benchmarks/list_rendering.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bookme.settings')
+
+import django
+from django.conf import settings
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10_000, 100_000])
+parser.add_argument('--endpoints', nargs='+', default=['flights', 'hotels', 'events', 'deals'])
+parser.add_argument('--batch-size', type=int, default=5000)
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--db', help='SQLite file to use (default: a temp file)')
+args = parser.parse_args()
+
+db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='bookme-bench-'), 'bench.sqlite3')
+settings.DATABASES['default']['NAME'] = db_path
+settings.DEBUG = False
+# Keep version stamps (and the per-process deal index) as in production,
+# but store no responses.
+settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+settings.CATALOG_CACHE_TIMEOUT = 0
+django.setup()
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Flight, Hotel, Event, Deal
+from api.pagination import FlightPagination, HotelPagination, EventPagination, DealPagination
+
+PAGINATION = {
+    'flights': FlightPagination,
+    'hotels': HotelPagination,
+    'events': EventPagination,
+    'deals': DealPagination,
+}
+
+
+def seed(rows):
+    rng = random.Random(args.seed)
+    now = timezone.now()
+    cities = ['Riyadh', 'Jeddah', 'Dammam', 'Dubai', 'Cairo', 'London', 'Makkah', 'Madinah']
+
+    def bulk(model, make):
+        # Sizes run in ascending order, so only the missing rows are added.
+        for start in range(model.objects.count(), rows, args.batch_size):
+            model.objects.bulk_create(make(i) for i in range(start, min(start + args.batch_size, rows)))
+
+    bulk(Flight, lambda i: Flight(
+        airline='Saudia', flight_number=f'SV{i}', origin=rng.choice(cities), destination=rng.choice(cities),
+        departure_time=now + timedelta(minutes=rng.randint(0, 500000)),
+        arrival_time=now + timedelta(minutes=rng.randint(500000, 510000)),
+        price_sar=Decimal(rng.randint(20000, 300000)) / 100, price_usd=Decimal(rng.randint(5000, 80000)) / 100,
+        available_seats=50, total_seats=150, aircraft_type='A320', baggage_allowance='23kg',
+    ))
+    bulk(Hotel, lambda i: Hotel(
+        name=f'Hotel {i}', city=rng.choice(cities), address='-', star_rating=rng.randint(1, 5), description='-',
+        amenities=['WiFi', 'Pool', 'مسبح'], price_per_night_sar=Decimal(rng.randint(20000, 300000)) / 100,
+        price_per_night_usd=Decimal(rng.randint(5000, 80000)) / 100, available_rooms=10, total_rooms=100,
+        check_in_time='14:00', check_out_time='12:00', cancellation_policy='-',
+    ))
+    bulk(Event, lambda i: Event(
+        name=f'Event {i}', category='Sports', venue='-', city=rng.choice(cities), description='-',
+        event_date=now + timedelta(minutes=rng.randint(0, 500000)), duration_hours=Decimal('2.5'),
+        price_sar=Decimal(rng.randint(2000, 90000)) / 100, price_usd=Decimal(rng.randint(500, 24000)) / 100,
+        available_tickets=100, total_tickets=1000,
+    ))
+    bulk(Deal, lambda i: Deal(
+        title=f'Deal {i}', description='-', deal_type='hotel', discount_percentage=Decimal(rng.randint(0, 9000)) / 100,
+        original_price_sar=Decimal('100.00'), discounted_price_sar=Decimal('50.00'), original_price_usd=Decimal('26.67'),
+        discounted_price_usd=Decimal('13.33'), valid_from=now, valid_until=now + timedelta(days=30),
+        terms_conditions='-',
+    ))
+
+
+def walk(client, endpoint):
+    """GET every page of endpoint; return (bodies, seconds)."""
+    url = f'/api/{endpoint}/?page_size={PAGINATION[endpoint].max_page_size}'
+    bodies = []
+    started = time.perf_counter()
+    while url:
+        response = client.get(url, HTTP_ACCEPT='application/json')
+        assert response.status_code == 200, response.content
+        bodies.append(response.content)
+        url = response.json()['next']
+    return bodies, time.perf_counter() - started
+
+
+def main():
+    print(f'Database: {db_path}')
+    call_command('migrate', verbosity=0)
+    client = APIClient()
+
+    print(f'\n{"rows":>8} {"endpoint":<8} {"path":<11} {"requests":>8} {"req/s":>9} {"rows/s":>10} {"speedup":>8}')
+    for rows in sorted(args.sizes):
+        seed(rows)
+        for endpoint in args.endpoints:
+            results = {}
+            for fast in (False, True):
+                with override_settings(FAST_LIST_RENDERING=fast):
+                    results[fast] = walk(client, endpoint)
+            if results[False][0] != results[True][0]:
+                sys.exit(f'{endpoint}: fast path output differs from the serializers at {rows} rows')
+            for fast in (False, True):
+                bodies, seconds = results[fast]
+                speedup = f'{results[False][1] / seconds:.2f}x' if fast else ''
+                print(f'{rows:>8} {endpoint:<8} {"fast_json" if fast else "serializer":<11} {len(bodies):>8} '
+                      f'{len(bodies) / seconds:>9.1f} {rows / seconds:>10.0f} {speedup:>8}', flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""Load-test the API under the old and new serving setups and compare
+throughput: `runserver` with DEBUG on (what docker-compose used to run),
+gunicorn + WSGI with threaded workers, and gunicorn + uvicorn ASGI workers.
+
+Each mode gets a fresh server process on --port against a throwaway SQLite
+database (never the project's db.sqlite3) seeded with a few hundred catalog
+rows. --clients client processes then each keep one keep-alive connection
+busy for --duration seconds, cycling through --paths.
+
+    python benchmarks/serving_load.py --clients 16 --duration 15
+    python benchmarks/serving_load.py --modes runserver gunicorn --workers 4 --threads 8
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--modes', nargs='+', default=['runserver', 'gunicorn', 'uvicorn'],
+                    choices=['runserver', 'gunicorn', 'uvicorn'])
+parser.add_argument('--clients', type=int, default=16)
+parser.add_argument('--duration', type=float, default=15)
+parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count() + 1)
+parser.add_argument('--threads', type=int, default=4)
+parser.add_argument('--port', type=int, default=8599)
+parser.add_argument('--rows', type=int, default=500)
+parser.add_argument('--paths', nargs='+', default=[
+    '/api/flights/', '/api/hotels/?page_size=50', '/api/events/', '/api/deals/', '/api/flights/?origin=riyadh',
+])
+
+
+def write_settings(directory, db_path):
+    """A settings module pointing the project at db_path."""
+    with open(os.path.join(directory, 'load_settings.py'), 'w') as f:
+        f.write(textwrap.dedent(f'''\
+            from bookme.settings import *  # noqa
+            DATABASES['default']['NAME'] = {db_path!r}
+        '''))
+
+
+def seed(env, rows):
+    script = textwrap.dedent(f'''\
+        import django; django.setup()
+        from datetime import timedelta
+        from decimal import Decimal
+        from django.core.management import call_command
+        from django.utils import timezone
+        from api.models import Flight, Hotel, Event, Deal
+        call_command('migrate', verbosity=0)
+        now = timezone.now()
+        Flight.objects.bulk_create(Flight(
+            airline='Saudia', flight_number=f'SV{{i}}', origin='Riyadh', destination='Jeddah',
+            departure_time=now + timedelta(hours=i), arrival_time=now + timedelta(hours=i + 2),
+            price_sar=Decimal('450.00'), price_usd=Decimal('120.00'), available_seats=50, total_seats=150,
+            aircraft_type='A320', baggage_allowance='23kg') for i in range({rows}))
+        Hotel.objects.bulk_create(Hotel(
+            name=f'Hotel {{i}}', city='Riyadh', address='-', star_rating=i % 5 + 1, description='-',
+            amenities=['WiFi'], price_per_night_sar=Decimal('750.00'), price_per_night_usd=Decimal('200.00'),
+            available_rooms=10, total_rooms=100, check_in_time='14:00', check_out_time='12:00',
+            cancellation_policy='-') for i in range({rows}))
+        Event.objects.bulk_create(Event(
+            name=f'Event {{i}}', category='Sports', venue='-', city='Jeddah', description='-',
+            event_date=now + timedelta(hours=i), duration_hours=Decimal('2.0'), price_sar=Decimal('150.00'),
+            price_usd=Decimal('40.00'), available_tickets=100, total_tickets=1000) for i in range({rows}))
+        Deal.objects.bulk_create(Deal(
+            title=f'Deal {{i}}', description='-', deal_type='hotel', discount_percentage=Decimal(i % 90),
+            original_price_sar=Decimal('100.00'), discounted_price_sar=Decimal('50.00'),
+            original_price_usd=Decimal('27.00'), discounted_price_usd=Decimal('13.00'), valid_from=now,
+            valid_until=now + timedelta(days=30), terms_conditions='-') for i in range({rows}))
+    ''')
+    subprocess.run([sys.executable, '-c', script], env=env, cwd=BACKEND, check=True)
+
+
+def server_command(mode, args):
+    bind = f'127.0.0.1:{args.port}'
+    if mode == 'runserver':
+        return [sys.executable, 'manage.py', 'runserver', '--noreload', bind]
+    command = [sys.executable, '-m', 'gunicorn', '--bind', bind, '--workers', str(args.workers),
+               '--access-logfile', os.devnull, '--max-requests', '0']
+    if mode == 'gunicorn':
+        return command + ['--threads', str(args.threads), '--worker-class', 'gthread', 'bookme.wsgi']
+    return command + ['--worker-class', 'uvicorn.workers.UvicornWorker', 'bookme.asgi']
+
+
+def wait_for(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f'server exited with {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    sys.exit('server did not start')
+
+
+def client(port, paths, duration, results):
+    """Send requests over one keep-alive connection until duration is up."""
+    latencies, errors = [], 0
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    deadline = time.monotonic() + duration
+    i = 0
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers={'Accept': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    results.put((latencies, errors))
+
+
+def rss_mb(pid):
+    """Resident memory of pid and its children, from /proc (Linux only)."""
+    try:
+        children = subprocess.run(['pgrep', '-P', str(pid)], capture_output=True, text=True).stdout.split()
+        total = 0
+        for p in [str(pid)] + children:
+            with open(f'/proc/{p}/status') as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith('VmRSS'))
+        return total / 1024
+    except (OSError, StopIteration):
+        return float('nan')
+
+
+def run(mode, args, env):
+    process = subprocess.Popen(server_command(mode, args), cwd=BACKEND, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(args.port, process)
+        results = multiprocessing.Queue()
+        clients = [multiprocessing.Process(target=client, args=(args.port, args.paths, args.duration, results))
+                   for _ in range(args.clients)]
+        for c in clients:
+            c.start()
+        collected = [results.get() for _ in clients]
+        for c in clients:
+            c.join()
+        memory = rss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = sorted(latency for batch, errors in collected for latency in batch)
+    errors = sum(errors for batch, errors in collected)
+    if not latencies:
+        return mode, 0, errors, float('nan'), float('nan'), memory
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    return mode, len(latencies) / args.duration, errors, statistics.median(latencies) * 1000, p95 * 1000, memory
+
+
+def main():
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix='bookme-load-')
+    write_settings(directory, os.path.join(directory, 'load.sqlite3'))
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='load_settings', PYTHONPATH=os.pathsep.join([directory, BACKEND]))
+    seed(env, args.rows)
+    print(f'Database: {directory}  clients: {args.clients}  duration: {args.duration}s  '
+          f'workers: {args.workers}  threads: {args.threads}\n')
+
+    print(f'{"mode":<10} {"DEBUG":<6} {"req/s":>8} {"errors":>7} {"p50 ms":>8} {"p95 ms":>8} {"RSS MB":>8}')
+    for mode in args.modes:
+        # runserver is shown as docker-compose ran it, with DEBUG on.
+        debug = '1' if mode == 'runserver' else '0'
+        name, rps, errors, p50, p95, memory = run(mode, args, dict(env, DJANGO_DEBUG=debug))
+        print(f'{name:<10} {debug:<6} {rps:>8.1f} {errors:>7} {p50:>8.1f} {p95:>8.1f} {memory:>8.0f}', flush=True)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
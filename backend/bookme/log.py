@@ -0,0 +1,178 @@
+"""Logging plumbing: structured records written from a background thread,
+request IDs and a sampled per-request log line.
+
+Configured by LOGGING in settings.py. Application code just uses
+logging.getLogger(__name__); every record logged while a request is being
+handled carries that request's ID.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import time
+import uuid
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_finished
+
+_request_id = ContextVar('request_id', default='-')
+
+# Accept upstream IDs (load balancer, frontend) only if they look like IDs.
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# Attributes every LogRecord has; anything else was passed with extra=.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id', 'taskName'}
+
+request_logger = logging.getLogger('bookme.request')
+
+
+def request_id():
+    return _request_id.get()
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room, so records queued at shutdown are still written.
+        self.queue.put(self._sentinel, timeout=5)
+
+
+class QueueStreamHandler(logging.handlers.QueueHandler):
+    """Write records to stream from a background thread, so a log call costs
+    a queue put instead of a (possibly blocking) write. When the queue is
+    full, records are dropped rather than slowing requests down."""
+
+    def __init__(self, stream=None, maxsize=10000):
+        self.target = logging.StreamHandler(stream)
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.listener = None
+        super().__init__(None)
+        self._start()
+        # Threads don't survive fork: gunicorn workers forked from a master
+        # that loaded settings (preload_app) need their own writer.
+        os.register_at_fork(after_in_child=self._start)
+        atexit.register(self.close)
+
+    def _start(self):
+        self.queue = queue.Queue(self.maxsize)
+        self.listener = _Listener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Render the message now, since its arguments may change once the
+        # call returns; formatting (and any traceback) happens in the writer.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        # Write out what is still queued.
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.target.flush()
+        super().close()
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request_id,
+    the extra= fields and the traceback, if any."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for key, value in vars(record).items():
+            # django.request passes the HttpRequest itself
+            if key not in _RECORD_ATTRIBUTES and key != 'request':
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+    def formatTime(self, record, datefmt=None):
+        return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z'
+
+
+def sample_rate(path):
+    """REQUEST_LOG_SAMPLING rate for the longest matching path prefix."""
+    rates = settings.REQUEST_LOG_SAMPLING
+    prefix = max((prefix for prefix in rates if path.startswith(prefix)), key=len, default=None)
+    return rates[prefix] if prefix is not None else 1.0
+
+
+class RequestLogMiddleware:
+    """Give each request an ID (X-Request-ID, kept from the client when
+    valid) and log method, path, status, duration and query counts for a
+    sample of requests. Server errors, slow requests and requests over
+    their query threshold are always logged."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.headers.get('X-Request-ID', '')
+        # Kept until request_finished, so Django's own logging of the
+        # response, which runs outside the middleware, carries it too.
+        _request_id.set(incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+        response['X-Request-ID'] = _request_id.get()
+
+        # Set by bookme.metrics.RequestMetricsMiddleware
+        metrics = getattr(request, 'metrics', None)
+        over_threshold = metrics is not None and metrics.over_threshold
+
+        rate = sample_rate(request.path)
+        if response.status_code >= 500 or duration_ms >= settings.REQUEST_LOG_SLOW_MS or over_threshold:
+            rate = 1.0
+        if rate >= 1 or random.random() < rate:
+            if response.status_code >= 500:
+                level = logging.ERROR
+            elif over_threshold:
+                level = logging.WARNING
+            else:
+                level = logging.INFO
+            fields = {
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 1),
+                'sample_rate': rate,
+            }
+            if metrics is not None:
+                fields.update(metrics.log_fields())
+            request_logger.log(level, '%s %s %s', request.method, request.path, response.status_code, extra=fields)
+        return response
+
+
+def _clear_request_id(**kwargs):
+    _request_id.set('-')
+
+
+request_finished.connect(_clear_request_id, dispatch_uid='bookme_log_request_id')
@@ -0,0 +1,284 @@
+"""Per-request database and serialization costs.
+
+RequestMetricsMiddleware counts the SQL queries each request runs and the
+time spent in them (through a connection execute_wrapper), times turning
+the response into bytes and measures its size. The numbers are sent back
+in a Server-Timing header, added to the request log line (bookme.log) and
+summed per view for /api/metrics, which serves them in Prometheus text
+format. Requests running more queries than REQUEST_QUERY_THRESHOLDS allows
+for their path are logged as warnings and counted.
+
+Totals are kept per process. Each process copies its totals to the cache
+every METRICS_FLUSH_INTERVAL seconds and /api/metrics adds the copies up,
+so with a shared cache (Redis) a scrape covers every worker; with the
+local-memory cache it reports the worker that answered.
+"""
+import copy
+import hmac
+import os
+import socket
+import threading
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from api.authentication import JWTProfileAuthentication
+
+# Upper bounds, in seconds, of the request duration histogram buckets.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+PROCESSES_KEY = 'metrics:processes'
+PROCESS_ID = f'{socket.gethostname()}:{os.getpid()}'
+
+_current = ContextVar('request_metrics', default=None)
+_lock = threading.Lock()
+_totals = {}
+_flushed = 0.0
+
+
+def _process_key(process_id):
+    return f'metrics:process:{process_id}'
+
+
+def _reset_after_fork():
+    # A forked worker starts with its own, empty totals.
+    global PROCESS_ID, _lock, _flushed
+    PROCESS_ID = f'{socket.gethostname()}:{os.getpid()}'
+    _lock = threading.Lock()
+    _totals.clear()
+    _flushed = 0.0
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class RequestMetrics:
+    """Costs of one request; also the execute_wrapper that counts its queries."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.total_seconds = 0.0
+        self.response_bytes = None
+        self.query_threshold = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+    @contextmanager
+    def serializing(self):
+        # Queries run by lazy querysets and nested fields count as database time only.
+        started, db_seconds = time.perf_counter(), self.db_seconds
+        try:
+            yield
+        finally:
+            self.serialize_seconds += time.perf_counter() - started - (self.db_seconds - db_seconds)
+
+    @property
+    def over_threshold(self):
+        return self.query_threshold is not None and self.queries > self.query_threshold
+
+    def server_timing(self):
+        return (f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+                f'serialize;dur={self.serialize_seconds * 1000:.1f}, total;dur={self.total_seconds * 1000:.1f}')
+
+    def log_fields(self):
+        fields = {
+            'db_queries': self.queries,
+            'db_ms': round(self.db_seconds * 1000, 1),
+            'serialize_ms': round(self.serialize_seconds * 1000, 1),
+            'response_bytes': self.response_bytes,
+        }
+        if self.over_threshold:
+            fields['query_threshold'] = self.query_threshold
+        return fields
+
+
+def serializing():
+    """Time a block as serialization of the current request's response."""
+    metrics = _current.get()
+    return metrics.serializing() if metrics is not None else nullcontext()
+
+
+def query_threshold(path):
+    """REQUEST_QUERY_THRESHOLDS limit for the longest matching path prefix."""
+    thresholds = settings.REQUEST_QUERY_THRESHOLDS
+    prefix = max((prefix for prefix in thresholds if path.startswith(prefix)), key=len, default=None)
+    return thresholds[prefix] if prefix is not None else None
+
+
+def view_name(request):
+    match = request.resolver_match
+    return match.view_name if match is not None else 'unmatched'
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        metrics.total_seconds = time.perf_counter() - started
+        # Streamed responses (exports) run their queries after this returns.
+        if not response.streaming:
+            metrics.response_bytes = len(response.content)
+        metrics.query_threshold = query_threshold(request.path)
+        response['Server-Timing'] = metrics.server_timing()
+        record(view_name(request), request.method, response.status_code, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        # Render here, inside the timer; Django skips rendering it again.
+        with request.metrics.serializing():
+            response.render()
+        return response
+
+
+def _series():
+    return {
+        'statuses': {}, 'buckets': [0] * len(DURATION_BUCKETS), 'requests': 0, 'seconds': 0.0,
+        'queries': 0, 'db_seconds': 0.0, 'serialize_seconds': 0.0, 'response_bytes': 0, 'over_threshold': 0,
+    }
+
+
+def record(view, method, status, metrics):
+    with _lock:
+        series = _totals.get((view, method))
+        if series is None:
+            series = _totals[(view, method)] = _series()
+        series['statuses'][status] = series['statuses'].get(status, 0) + 1
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if metrics.total_seconds <= bound:
+                series['buckets'][i] += 1
+                break
+        series['requests'] += 1
+        series['seconds'] += metrics.total_seconds
+        series['queries'] += metrics.queries
+        series['db_seconds'] += metrics.db_seconds
+        series['serialize_seconds'] += metrics.serialize_seconds
+        series['response_bytes'] += metrics.response_bytes or 0
+        series['over_threshold'] += metrics.over_threshold
+    if time.monotonic() - _flushed >= settings.METRICS_FLUSH_INTERVAL:
+        flush()
+
+
+def flush():
+    """Copy this process's totals to the cache."""
+    global _flushed
+    _flushed = time.monotonic()
+    with _lock:
+        snapshot = copy.deepcopy(_totals)
+    cache.set(_process_key(PROCESS_ID), snapshot, settings.METRICS_RETENTION)
+    processes = cache.get(PROCESSES_KEY) or set()
+    if PROCESS_ID not in processes:
+        # A concurrent update can drop an ID; its process re-adds it next flush.
+        cache.set(PROCESSES_KEY, processes | {PROCESS_ID}, None)
+
+
+def collect():
+    """Totals of every process that flushed within METRICS_RETENTION."""
+    flush()
+    processes = cache.get(PROCESSES_KEY) or set()
+    snapshots = cache.get_many([_process_key(process_id) for process_id in processes])
+    if len(snapshots) < len(processes):
+        cache.set(PROCESSES_KEY, {process_id for process_id in processes if _process_key(process_id) in snapshots}, None)
+
+    totals = {}
+    for snapshot in snapshots.values():
+        for key, series in snapshot.items():
+            merged = totals.setdefault(key, _series())
+            for status, count in series['statuses'].items():
+                merged['statuses'][status] = merged['statuses'].get(status, 0) + count
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], series['buckets'])]
+            for name, value in series.items():
+                if name not in ('statuses', 'buckets'):
+                    merged[name] += value
+    return totals
+
+
+def _labels(**labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+def render_prometheus(totals):
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{sample_name}{labels} {value}' for sample_name, labels, value in samples)
+
+    series = sorted(totals.items())
+    metric('bookme_requests_total', 'counter', 'Requests handled.', [
+        ('bookme_requests_total', _labels(view=view, method=method, status=status), count)
+        for (view, method), values in series for status, count in sorted(values['statuses'].items())
+    ])
+
+    buckets = []
+    for (view, method), values in series:
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, values['buckets']):
+            cumulative += count
+            buckets.append(('bookme_request_duration_seconds_bucket', _labels(view=view, method=method, le=bound), cumulative))
+        buckets.append(('bookme_request_duration_seconds_bucket', _labels(view=view, method=method, le='+Inf'), values['requests']))
+        buckets.append(('bookme_request_duration_seconds_sum', _labels(view=view, method=method), round(values['seconds'], 6)))
+        buckets.append(('bookme_request_duration_seconds_count', _labels(view=view, method=method), values['requests']))
+    metric('bookme_request_duration_seconds', 'histogram', 'Time spent handling requests.', buckets)
+
+    for name, key, help_text in (
+        ('bookme_db_queries_total', 'queries', 'SQL queries run by requests.'),
+        ('bookme_db_duration_seconds_total', 'db_seconds', 'Time requests spent in SQL queries.'),
+        ('bookme_serialize_duration_seconds_total', 'serialize_seconds', 'Time spent serializing responses.'),
+        ('bookme_response_bytes_total', 'response_bytes', 'Size of non-streamed response bodies.'),
+        ('bookme_query_threshold_exceeded_total', 'over_threshold', 'Requests over their REQUEST_QUERY_THRESHOLDS limit.'),
+    ):
+        metric(name, 'counter', help_text, [
+            (name, _labels(view=view, method=method), round(values[key], 6)) for (view, method), values in series
+        ])
+    return '\n'.join(lines) + '\n'
+
+
+def _is_staff(request):
+    try:
+        authenticated = JWTProfileAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    user = authenticated[0] if authenticated else request.user
+    if not user.is_authenticated:
+        return False
+    profile = getattr(user, 'profile', None)
+    return user.is_superuser or (profile is not None and profile.role in ('admin', 'staff'))
+
+
+def metrics_view(request):
+    """Prometheus metrics, for METRICS_TOKEN bearers or, with no token
+    configured, for admin and staff users only."""
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), settings.METRICS_TOKEN.encode()):
+            return JsonResponse({'error': 'Invalid metrics token'}, status=401)
+    elif not _is_staff(request):
+        return JsonResponse({'error': 'Metrics are limited to staff; set METRICS_TOKEN for scrapers'}, status=403)
+    return HttpResponse(render_prometheus(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
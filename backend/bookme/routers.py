@@ -0,0 +1,99 @@
+"""Primary/replica database routing.
+
+Every database alias other than 'default' is treated as a read replica of
+it (see DATABASE_REPLICA_URLS in settings). Writes always go to the
+primary, and so do reads unless they run inside replica_reads(), which the
+catalog viewsets and the dashboard use for their GETs.
+
+Replicas lag behind the primary, so reads fall back to it when they could
+see stale data:
+
+- within a request, once anything has been written;
+- inside transaction.atomic(), whose reads must see its own writes;
+- for DB_REPLICA_LAG seconds after a pin() on one of the keys the reads
+  depend on. Catalog and dashboard invalidation pin their own keys, and
+  ReadYourWritesMiddleware pins a user who wrote, so their next requests
+  see their own bookings. Pins live in the cache shared by all workers.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# Replica alias the current reads go to, if any.
+_replica = ContextVar('replica', default=None)
+# Whether the current request has written to the primary.
+_wrote = ContextVar('wrote', default=False)
+
+
+def replicas():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def _pin_key(key):
+    return f'db:pin:{key}'
+
+
+def user_key(user):
+    return f'user:{user.pk}'
+
+
+def pin(*keys):
+    """Keep reads that depend on keys on the primary until the replicas
+    have caught up with the current transaction."""
+    if replicas():
+        transaction.on_commit(lambda: cache.set_many(
+            {_pin_key(key): True for key in keys}, settings.DB_REPLICA_LAG))
+
+
+@contextmanager
+def replica_reads(*keys, user=None):
+    """Send the reads of the block to a replica, unless one of keys (or the
+    user) was pinned recently or this request has already written."""
+    if user is not None and user.is_authenticated:
+        keys += (user_key(user),)
+    alias = None
+    choices = replicas()
+    if choices and not _wrote.get() and not cache.get_many([_pin_key(key) for key in keys]):
+        alias = random.choice(choices)
+    token = _replica.set(alias)
+    try:
+        yield alias
+    finally:
+        _replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _wrote.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return _replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+
+class ReadYourWritesMiddleware:
+    """Track writes per request and pin the user who made them."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            # DRF sets request.user once it has authenticated the token.
+            if _wrote.get() and replicas() and request.user.is_authenticated:
+                pin(user_key(request.user))
+            return response
+        finally:
+            _wrote.reset(token)
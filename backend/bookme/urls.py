@@ -4,6 +4,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 
+from bookme.metrics import metrics_view
+
 def root_view(request):
     return JsonResponse({
         'status': 'ok',
@@ -14,6 +16,8 @@ def root_view(request):
 urlpatterns = [
     path('', root_view, name='root'),
     path('admin/', admin.site.urls),
+    path('api/metrics', metrics_view, name='metrics'),
+    path('api/metrics/', metrics_view),
     path('api/', include('api.urls')),
 ]
 
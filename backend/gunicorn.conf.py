@@ -0,0 +1,58 @@
+"""Gunicorn settings for serving bookme in production.
+
+    gunicorn bookme.wsgi                                  # WSGI, threaded workers
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \\
+        gunicorn bookme.asgi                              # ASGI
+
+Every view here is synchronous, so the ASGI mode only adds a hop through
+Django's sync-to-async executor; prefer WSGI until views go async
+(benchmarks/serving_load.py compares the modes).
+
+Gunicorn reads this file from the working directory; every value can be
+overridden with the environment variables below or on the command line.
+
+Sizing: a request spends part of its time running Python (serializing,
+pricing) and part waiting on the database or cache. Python work only runs
+in parallel across processes, so start with one worker per core plus one
+(WEB_CONCURRENCY = 2 * cores + 1 is the usual upper bound) and cover the
+waiting with threads inside each worker. Each worker holds its own copy of
+the app and one database connection per thread, so workers cost memory
+(about 50 MB each here) and threads cost connections:
+workers * threads must stay below the database's connection limit, and with
+SQLite writes serialize whatever the sizing. Raise threads when CPU is idle
+under load, raise workers when CPU is saturated and memory allows.
+
+Cache invalidation (catalog pages, dashboard stats, cached users, exchange
+rates, deals) only reaches every worker through a shared cache, so more than
+one worker needs REDIS_URL. Without it the default is a single worker, and
+WEB_CONCURRENCY above 1 is refused rather than serving stale data (an
+explicit --workers on the command line, as the benchmarks use, is not).
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8585')
+shared_cache = bool(os.environ.get('REDIS_URL'))
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1 if shared_cache else 1))
+if workers > 1 and not shared_cache:
+    raise SystemExit(f'WEB_CONCURRENCY={workers} needs REDIS_URL: each worker would keep its own cache '
+                     'and miss the others\' invalidations')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+
+# Import the app once in the master so workers share its memory pages.
+preload_app = True
+
+# Recycle workers now and then so a slow leak can't grow without bound; the
+# jitter keeps them from all restarting at once.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# The app logs a sample of requests itself, with request IDs (bookme/log.py);
+# set GUNICORN_ACCESS_LOG=- to also get gunicorn's line for every request.
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+errorlog = '-'
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import logging
 import os
 import sys
 import django
@@ -9,19 +10,18 @@ sys.path.insert(0, os.path.dirname(__file__))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bookme.settings')
 django.setup()
 
+from api import seeding
 from api.models import Flight, Hotel, Event, Deal
 from django.utils import timezone
 
-print('=' * 60)
-print('🚀 BOOKME DATABASE INITIALIZATION')
-print('=' * 60)
+logger = logging.getLogger('init_db')
+logger.info('Initializing catalog data')
 
 Flight.objects.all().delete()
 Hotel.objects.all().delete()
 Event.objects.all().delete()
 Deal.objects.all().delete()
 
-print('\n✈️ Creating flights...')
 flights_data = [
     {
         'airline': 'Saudia',
@@ -100,11 +100,8 @@ flights_data = [
     }
 ]
 
-for flight_data in flights_data:
-    flight = Flight.objects.create(**flight_data)
-    print(f'   ✅ {flight.airline} {flight.flight_number}: {flight.origin} → {flight.destination} (SAR {flight.price_sar})')
+seeding.load(Flight, (Flight(**data) for data in flights_data))
 
-print('\n🏨 Creating hotels...')
 hotels_data = [
     {
         'name': 'Ritz-Carlton Riyadh',
@@ -188,11 +185,8 @@ hotels_data = [
     }
 ]
 
-for hotel_data in hotels_data:
-    hotel = Hotel.objects.create(**hotel_data)
-    print(f'   ✅ {hotel.name} ({hotel.star_rating}⭐): {hotel.city} - SAR {hotel.price_per_night_sar}/night')
+seeding.load(Hotel, (Hotel(**data) for data in hotels_data))
 
-print('\n🎭 Creating events...')
 events_data = [
     {
         'name': 'Riyadh Season 2024 - Grand Opening',
@@ -271,11 +265,8 @@ events_data = [
     }
 ]
 
-for event_data in events_data:
-    event = Event.objects.create(**event_data)
-    print(f'   ✅ {event.name}: {event.city} - {event.category} - SAR {event.price_sar}')
+seeding.load(Event, (Event(**data) for data in events_data))
 
-print('\n💰 Creating deals...')
 deals_data = [
     {
         'title': 'Early Bird Flight Special - 30% Off',
@@ -349,14 +340,9 @@ deals_data = [
     }
 ]
 
-for deal_data in deals_data:
-    deal = Deal.objects.create(**deal_data)
-    print(f'   ✅ {deal.title}: {deal.discount_percentage}% off - SAR {deal.discounted_price_sar}')
+seeding.load(Deal, (Deal(**data) for data in deals_data))
 
-print('\n✅ DATABASE INITIALIZATION COMPLETED!')
-print('=' * 60)
-print(f'   Flights: {Flight.objects.count()}')
-print(f'   Hotels: {Hotel.objects.count()}')
-print(f'   Events: {Event.objects.count()}')
-print(f'   Deals: {Deal.objects.count()}')
-print('=' * 60)
+seeding.after_bulk_load()
+
+logger.info('Catalog initialized: %s flights, %s hotels, %s events, %s deals',
+            Flight.objects.count(), Hotel.objects.count(), Event.objects.count(), Deal.objects.count())
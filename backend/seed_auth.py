@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import logging
 import os
 import sys
 import django
@@ -10,22 +11,12 @@ django.setup()
 from django.contrib.auth.models import User
 from api.models import UserProfile
 
-print('=' * 60)
-print('🔐 BOOKME AUTH SEED SCRIPT STARTING')
-print('=' * 60)
+logger = logging.getLogger('seed_auth')
 
 if User.objects.filter(username='testuser').exists():
     user = User.objects.get(username='testuser')
-    print('✅ Test user already exists')
-    print(f'📧 Email: {user.email}')
-    print(f'👤 Username: {user.username}')
-    print('🔑 Password: password123')
-    print(f'🔐 Password hash: {user.password[:30]}...')
-    print(f'👥 Role: {user.profile.role}')
-    print('=' * 60)
+    logger.info('Test user %s <%s> already exists (role %s)', user.username, user.email, user.profile.role)
     sys.exit(0)
-
-print('🔐 Creating test user...')
 user = User.objects.create_user(
     username='testuser',
     email='test@example.com',
@@ -44,25 +35,13 @@ UserProfile.objects.create(
     preferred_language='en'
 )
 
-print('✅ Test user created!')
-print(f'📧 Email: {user.email}')
-print(f'👤 Username: {user.username}')
-print('🔑 Password: password123')
-print(f'🔐 Password hash: {user.password[:30]}...')
-print(f'👥 Role: {user.profile.role}')
+logger.info('Created test user %s <%s> (role %s)', user.username, user.email, user.profile.role)
 
-print('🔍 Verifying authentication works...')
 from django.contrib.auth import authenticate
 test_auth = authenticate(username='testuser', password='password123')
-if test_auth and test_auth.id == user.id:
-    print('✅ VERIFICATION SUCCESS: Test user can be authenticated!')
-    print('🎯 Login will work with: testuser / password123')
-else:
-    print('❌ VERIFICATION FAILED: Test user created but authentication test FAILED!')
-    print('   This indicates a problem - user may not be able to login!')
+if not (test_auth and test_auth.id == user.id):
+    logger.error('Test user was created but cannot be authenticated; login will fail')
     sys.exit(1)
-
-print('\n🔐 Creating admin user...')
 admin_user = User.objects.create_user(
     username='admin',
     email='admin@bookme.sa',
@@ -81,13 +60,7 @@ UserProfile.objects.create(
     preferred_language='en'
 )
 
-print('✅ Admin user created!')
-print(f'📧 Email: {admin_user.email}')
-print(f'👤 Username: {admin_user.username}')
-print('🔑 Password: admin123')
-print(f'👥 Role: {admin_user.profile.role}')
-
-print('\n🔐 Creating staff user...')
+logger.info('Created admin user %s <%s> (role %s)', admin_user.username, admin_user.email, admin_user.profile.role)
 staff_user = User.objects.create_user(
     username='staff',
     email='staff@bookme.sa',
@@ -105,16 +78,5 @@ UserProfile.objects.create(
     preferred_language='en'
 )
 
-print('✅ Staff user created!')
-print(f'📧 Email: {staff_user.email}')
-print(f'👤 Username: {staff_user.username}')
-print('🔑 Password: staff123')
-print(f'👥 Role: {staff_user.profile.role}')
-
-print('\n✅ SEED SCRIPT COMPLETED SUCCESSFULLY!')
-print('=' * 60)
-print('\n📋 TEST CREDENTIALS:')
-print('   Customer: testuser / password123')
-print('   Admin: admin / admin123')
-print('   Staff: staff / staff123')
-print('=' * 60)
+logger.info('Created staff user %s <%s> (role %s)', staff_user.username, staff_user.email, staff_user.profile.role)
+logger.info('Test credentials: testuser / password123, admin / admin123, staff / staff123')
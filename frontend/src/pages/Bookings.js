@@ -1,20 +1,26 @@
 import React, { useState, useEffect } from 'react';
-import { getBookings, cancelBooking } from '../services/api';
+import { getBookings, cancelBooking, cursorOf } from '../services/api';
 import { FaPlane, FaHotel, FaTicketAlt, FaCalendarAlt, FaUser, FaEnvelope, FaPhone } from 'react-icons/fa';
 import './Bookings.css';
 
+// Only the columns this page renders; see ?fields= on the API
+const BOOKING_FIELDS = 'id,booking_reference,booking_type,status,check_in_date,check_out_date,created_at,customer_name,customer_email,customer_phone,payment_method,total_price_sar';
+
 function Bookings() {
   const [bookings, setBookings] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     loadBookings();
   }, []);
 
-  const loadBookings = async () => {
+  const loadBookings = async (cursor = null) => {
     try {
-      const response = await getBookings();
-      setBookings(response.data);
+      const response = await getBookings({ fields: BOOKING_FIELDS, cursor });
+      const page = response.data.results;
+      setBookings(cursor ? (loaded) => [...loaded, ...page] : page);
+      setNextCursor(cursorOf(response.data.next));
     } catch (err) {
       console.error('Failed to load bookings:', err);
     } finally {
@@ -125,6 +131,9 @@ function Bookings() {
           ))}
         </div>
       )}
+      {nextCursor && (
+        <button className="load-more" onClick={() => loadBookings(nextCursor)}>Load more</button>
+      )}
     </div>
   );
 }
@@ -1,20 +1,23 @@
 import React, { useState, useEffect } from 'react';
-import { getDeals } from '../services/api';
+import { getDeals, cursorOf } from '../services/api';
 import { FaPercent, FaCalendarAlt, FaTag } from 'react-icons/fa';
 import './Deals.css';
 
 function Deals() {
   const [deals, setDeals] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     loadDeals();
   }, []);
 
-  const loadDeals = async () => {
+  const loadDeals = async (cursor = null) => {
     try {
-      const response = await getDeals();
-      setDeals(response.data);
+      const response = await getDeals({ cursor });
+      const page = response.data.results;
+      setDeals(cursor ? (loaded) => [...loaded, ...page] : page);
+      setNextCursor(cursorOf(response.data.next));
     } catch (err) {
       console.error('Failed to load deals:', err);
     } finally {
@@ -79,6 +82,9 @@ function Deals() {
           </div>
         ))}
       </div>
+      {nextCursor && (
+        <button className="load-more" onClick={() => loadDeals(nextCursor)}>Load more</button>
+      )}
     </div>
   );
 }
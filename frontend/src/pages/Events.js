@@ -1,10 +1,14 @@
 import React, { useState, useEffect } from 'react';
-import { getEvents, createBooking } from '../services/api';
+import { getEvents, createBooking, cursorOf } from '../services/api';
 import { FaTicketAlt, FaMapMarkerAlt, FaCalendarAlt, FaClock } from 'react-icons/fa';
 import './Events.css';
 
+// Only the columns this page renders; see ?fields= on the API
+const EVENT_FIELDS = 'id,name,category,venue,city,event_date,duration_hours,description,price_sar,price_usd,available_tickets';
+
 function Events() {
   const [events, setEvents] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [filters, setFilters] = useState({ city: '', category: '' });
   const [bookingModal, setBookingModal] = useState(null);
@@ -20,10 +24,12 @@ function Events() {
     loadEvents();
   }, [filters]);
 
-  const loadEvents = async () => {
+  const loadEvents = async (cursor = null) => {
     try {
-      const response = await getEvents(filters);
-      setEvents(response.data);
+      const response = await getEvents({ ...filters, fields: EVENT_FIELDS, cursor });
+      const page = response.data.results;
+      setEvents(cursor ? (loaded) => [...loaded, ...page] : page);
+      setNextCursor(cursorOf(response.data.next));
     } catch (err) {
       console.error('Failed to load events:', err);
     } finally {
@@ -73,7 +79,7 @@ function Events() {
           value={filters.category}
           onChange={(e) => setFilters({ ...filters, category: e.target.value })}
         />
-        <button onClick={loadEvents}>Search</button>
+        <button onClick={() => loadEvents()}>Search</button>
       </div>
 
       <div className="events-grid">
@@ -106,6 +112,9 @@ function Events() {
           </div>
         ))}
       </div>
+      {nextCursor && (
+        <button className="load-more" onClick={() => loadEvents(nextCursor)}>Load more</button>
+      )}
 
       {bookingModal && (
         <div className="modal-overlay" onClick={() => setBookingModal(null)}>
@@ -1,10 +1,14 @@
 import React, { useState, useEffect } from 'react';
-import { getFlights, createBooking } from '../services/api';
+import { getFlights, createBooking, cursorOf } from '../services/api';
 import { FaPlane, FaCalendarAlt, FaClock, FaChair } from 'react-icons/fa';
 import './Flights.css';
 
+// Only the columns this page renders; see ?fields= on the API
+const FLIGHT_FIELDS = 'id,airline,flight_number,origin,destination,departure_time,arrival_time,price_sar,price_usd,available_seats';
+
 function Flights() {
   const [flights, setFlights] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [filters, setFilters] = useState({ origin: '', destination: '' });
@@ -21,10 +25,12 @@ function Flights() {
     loadFlights();
   }, [filters]);
 
-  const loadFlights = async () => {
+  const loadFlights = async (cursor = null) => {
     try {
-      const response = await getFlights(filters);
-      setFlights(response.data);
+      const response = await getFlights({ ...filters, fields: FLIGHT_FIELDS, cursor });
+      const page = response.data.results;
+      setFlights(cursor ? (loaded) => [...loaded, ...page] : page);
+      setNextCursor(cursorOf(response.data.next));
     } catch (err) {
       setError('Failed to load flights');
     } finally {
@@ -74,7 +80,7 @@ function Flights() {
           value={filters.destination}
           onChange={(e) => setFilters({ ...filters, destination: e.target.value })}
         />
-        <button onClick={loadFlights}>Search</button>
+        <button onClick={() => loadFlights()}>Search</button>
       </div>
 
       {error && <div className="error">{error}</div>}
@@ -127,6 +133,9 @@ function Flights() {
           </div>
         ))}
       </div>
+      {nextCursor && (
+        <button className="load-more" onClick={() => loadFlights(nextCursor)}>Load more</button>
+      )}
 
       {bookingModal && (
         <div className="modal-overlay" onClick={() => setBookingModal(null)}>
@@ -1,10 +1,14 @@
 import React, { useState, useEffect } from 'react';
-import { getHotels, createBooking } from '../services/api';
+import { getHotels, createBooking, cursorOf } from '../services/api';
 import { FaHotel, FaStar, FaMapMarkerAlt, FaBed } from 'react-icons/fa';
 import './Hotels.css';
 
+// Only the columns this page renders; see ?fields= on the API
+const HOTEL_FIELDS = 'id,name,city,star_rating,amenities,description,price_per_night_sar,price_per_night_usd,available_rooms';
+
 function Hotels() {
   const [hotels, setHotels] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [filters, setFilters] = useState({ city: '' });
   const [bookingModal, setBookingModal] = useState(null);
@@ -22,10 +26,12 @@ function Hotels() {
     loadHotels();
   }, [filters]);
 
-  const loadHotels = async () => {
+  const loadHotels = async (cursor = null) => {
     try {
-      const response = await getHotels(filters);
-      setHotels(response.data);
+      const response = await getHotels({ ...filters, fields: HOTEL_FIELDS, cursor });
+      const page = response.data.results;
+      setHotels(cursor ? (loaded) => [...loaded, ...page] : page);
+      setNextCursor(cursorOf(response.data.next));
     } catch (err) {
       console.error('Failed to load hotels:', err);
     } finally {
@@ -70,7 +76,7 @@ function Hotels() {
           value={filters.city}
           onChange={(e) => setFilters({ ...filters, city: e.target.value })}
         />
-        <button onClick={loadHotels}>Search</button>
+        <button onClick={() => loadHotels()}>Search</button>
       </div>
 
       <div className="hotels-grid">
@@ -105,6 +111,9 @@ function Hotels() {
           </div>
         ))}
       </div>
+      {nextCursor && (
+        <button className="load-more" onClick={() => loadHotels(nextCursor)}>Load more</button>
+      )}
 
       {bookingModal && (
         <div className="modal-overlay" onClick={() => setBookingModal(null)}>
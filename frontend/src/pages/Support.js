@@ -1,10 +1,11 @@
 import React, { useState, useEffect } from 'react';
-import { getSupportTickets, createSupportTicket } from '../services/api';
+import { getSupportTickets, createSupportTicket, cursorOf } from '../services/api';
 import { FaHeadset, FaTicketAlt, FaClock } from 'react-icons/fa';
 import './Support.css';
 
 function Support() {
   const [tickets, setTickets] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
   const [formData, setFormData] = useState({
@@ -17,10 +18,12 @@ function Support() {
     loadTickets();
   }, []);
 
-  const loadTickets = async () => {
+  const loadTickets = async (cursor = null) => {
     try {
-      const response = await getSupportTickets();
-      setTickets(response.data);
+      const response = await getSupportTickets({ cursor });
+      const page = response.data.results;
+      setTickets(cursor ? (loaded) => [...loaded, ...page] : page);
+      setNextCursor(cursorOf(response.data.next));
     } catch (err) {
       console.error('Failed to load tickets:', err);
     } finally {
@@ -134,6 +137,9 @@ function Support() {
             ))}
           </div>
         )}
+        {nextCursor && (
+          <button className="load-more" onClick={() => loadTickets(nextCursor)}>Load more</button>
+        )}
       </div>
     </div>
   );
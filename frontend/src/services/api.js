@@ -36,6 +36,10 @@ export const login = (data) => api.post('/auth/login/', data);
 export const getCurrentUser = () => api.get('/auth/me/');
 export const debugUsers = () => api.get('/auth/debug/users/');
 
+// List endpoints return a page of `results` with `next`/`previous` links;
+// pass the link's cursor back as ?cursor= to fetch that page.
+export const cursorOf = (url) => (url ? new URL(url, window.location.origin).searchParams.get('cursor') : null);
+
 export const getDashboardStats = () => api.get('/dashboard-stats/');
 
 export const getFlights = (params) => api.get('/flights/', { params });
@@ -56,19 +60,20 @@ export const createEvent = (data) => api.post('/events/', data);
 export const updateEvent = (id, data) => api.put(`/events/${id}/`, data);
 export const deleteEvent = (id) => api.delete(`/events/${id}/`);
 
-export const getBookings = () => api.get('/bookings/');
+export const getBookings = (params) => api.get('/bookings/', { params });
 export const getBookingById = (id) => api.get(`/bookings/${id}/`);
 export const createBooking = (data) => api.post('/bookings/', data);
-export const updateBooking = (id, data) => api.put(`/bookings/${id}/`, data);
 export const cancelBooking = (id) => api.post(`/bookings/${id}/cancel/`);
 
-export const getDeals = () => api.get('/deals/');
+export const getQuote = (items) => api.post('/pricing/quote/', { items });
+
+export const getDeals = (params) => api.get('/deals/', { params });
 export const getDealById = (id) => api.get(`/deals/${id}/`);
 export const createDeal = (data) => api.post('/deals/', data);
 export const updateDeal = (id, data) => api.put(`/deals/${id}/`, data);
 export const deleteDeal = (id) => api.delete(`/deals/${id}/`);
 
-export const getSupportTickets = () => api.get('/support-tickets/');
+export const getSupportTickets = (params) => api.get('/support-tickets/', { params });
 export const getSupportTicketById = (id) => api.get(`/support-tickets/${id}/`);
 export const createSupportTicket = (data) => api.post('/support-tickets/', data);
 export const resolveSupportTicket = (id, data) => api.post(`/support-tickets/${id}/resolve/`, data);